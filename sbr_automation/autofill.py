@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import asyncio
 import re
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Literal
 
 from playwright.async_api import Error as PlaywrightError, Page
 
@@ -13,10 +18,10 @@ from .loader import MATCH_BY_REQUIRED_COLUMNS, load_rows
 from .logbook import LogBook, LogEvent, update_run_index
 from .models import RowContext
 from .navigator import open_form_page
-from .playwright_helpers import attach_browser, ensure_cdp_ready, pick_active_page
+from .playwright_helpers import attach_browser, back_to_main, close_page, ensure_cdp_ready, pick_active_page
 from .resume import load_resume_entries, resolve_resume_log_path
 from .submitter import is_finalized_form, is_locked_page, submit_form
-from .table_actions import click_edit_by_index, click_edit_by_text
+from .table_actions import TABLE_SELECTOR, click_edit_by_index, click_edit_by_text
 from .utils import (
     ScreenshotResult,
     clear_attention_flag,
@@ -29,6 +34,10 @@ from .utils import (
 
 _ROW_DIVIDER = "=" * 72
 _ROW_SUBDIVIDER = "-" * 72
+_YA_EDIT_RE = re.compile(r"Ya,\s*edit!?$", re.I)
+
+RowOutcome = Literal["ok", "error", "skipped"]
+RECENT_ERRORS_LIMIT = 5
 
 
 @dataclass
@@ -37,46 +46,66 @@ class AutofillStats:
     success_count: int = 0
     error_count: int = 0
     skip_count: int = 0
-    recent_errors: list[str] = field(default_factory=list)
+    recent_errors: deque[str] = field(default_factory=lambda: deque(maxlen=RECENT_ERRORS_LIMIT))
+
+    @property
+    def total(self) -> int:
+        return self.success_count + self.error_count + self.skip_count
+
 
 
+_MATCH_VALUE_GETTERS: dict[str, Callable[[RowContext], str]] = {
+    "index": lambda ctx: "" if ctx.table_index is None else str(ctx.table_index),
+    "idsbr": lambda ctx: ctx.idsbr or "",
+    "name": lambda ctx: ctx.nama or "",
+}
 
-def _format_match_value(ctx: RowContext, match_by: str) -> str:
-    if match_by == "index":
-        return "" if ctx.table_index is None else str(ctx.table_index)
-    if match_by == "idsbr":
-        return ctx.idsbr or ""
-    if match_by == "name":
-        return ctx.nama or ""
-    return ""
+
+def _match_value_getter(match_by: str) -> Callable[[RowContext], str]:
+    return _MATCH_VALUE_GETTERS.get(match_by, lambda ctx: "")
 
 
 def _print_row_header(ctx: RowContext, match_by: str, match_value: str) -> None:
     name = ctx.nama or "(tanpa nama)"
     status_label = ctx.status or "-"
     target = match_value or "-"
+    print(
+        f"\n{_ROW_DIVIDER}\n"
+        f"Baris {ctx.display_index}: {name}\n"
+        f"Status : {status_label}\n"
+        f"Target : {target} (match_by={match_by})\n"
+        f"{_ROW_SUBDIVIDER}"
+    )
+
+
+def _print_resume_skip(skipped: list[RowContext]) -> None:
+    first = skipped[0].display_index
+    last = skipped[-1].display_index
     print(f"\n{_ROW_DIVIDER}")
-    print(f"Baris {ctx.display_index}: {name}")
-    print(f"Status : {status_label}")
-    print(f"Target : {target} (match_by={match_by})")
+    print(f"Dilewati {len(skipped)} baris (mode resume, baris {first}-{last} sudah tercatat di log sebelumnya).")
     print(_ROW_SUBDIVIDER)
 
 
-def _print_resume_skip(ctx: RowContext, prev_level: str, prev_stage: str, note_detail: str) -> None:
-    name = ctx.nama or "(tanpa nama)"
-    print(f"\n{_ROW_DIVIDER}")
-    print(f"Baris {ctx.display_index}: {name}")
-    print("Status : Dilewati (mode resume)")
-    extras = []
-    if prev_level:
-        extras.append(f"Status sebelumnya: {prev_level}")
+def _resume_skip_event(ctx: RowContext, prev: dict) -> LogEvent:
+    prev_level = prev.get("level", "OK")
+    prev_stage = prev.get("stage", "")
+    note_detail = prev.get("note", "")
+    extra = f"Status sebelumnya: {prev_level}"
     if prev_stage:
-        extras.append(f"Stage: {prev_stage}")
+        extra += f" | Stage: {prev_stage}"
     if note_detail:
-        extras.append(f"Catatan: {note_detail}")
-    if extras:
-        print("Info   : " + " | ".join(extras))
-    print(_ROW_SUBDIVIDER)
+        extra += f" | Catatan: {note_detail}"
+    return LogEvent(
+        ts=timestamp(),
+        row_index=ctx.display_index,
+        level="OK",
+        stage="RESUME_SKIP",
+        idsbr=ctx.idsbr,
+        nama=ctx.nama,
+        match_value=ctx.idsbr or ctx.nama,
+        note=f"Dilewati (resume). {extra}",
+        screenshot="",
+    )
 
 
 def _print_run_summary(
@@ -102,24 +131,27 @@ def _print_run_summary(
     print(_ROW_SUBDIVIDER)
 
 
-async def _log_screenshot(
-    page: Page,
-    label: str,
-    config: RuntimeConfig,
-    *,
-    for_cancel: bool = False,
-) -> ScreenshotResult:
-    directory = config.cancel_screenshot_dir if for_cancel else config.screenshot_dir
-    return await take_screenshot(page, directory, label)
+@asynccontextmanager
+async def _page_guard(form_page: Page, table_page: Page) -> AsyncIterator[Page]:
+    """Tutup tab form di semua jalur keluar (termasuk exception), lalu kembali ke tab tabel."""
+    try:
+        yield form_page
+    finally:
+        await back_to_main(form_page, table_page)
 
 
 async def process_autofill(options: AutofillOptions, config: RuntimeConfig) -> AutofillStats:
-    clear_attention_flag(getattr(config, "attention_flag", None))
+    attention_flag = getattr(config, "attention_flag", None)
+    clear_attention_flag(attention_flag)
+    max_wait_ms = config.max_wait_ms
+    dry_run = options.dry_run
+    stop_on_error = options.stop_on_error
+    match_by = options.match_by
     contexts, start_display, end_display = load_rows(options, config)
 
     resume_entries: Dict[int, dict] = {}
-    log_filename = f"log_sbr_autofill_{config.run_id}.csv" if config.run_id else "log_sbr_autofill.csv"
-    log_path = config.log_dir / log_filename
+    log_base = f"log_sbr_autofill_{config.run_id}" if config.run_id else "log_sbr_autofill"
+    log_path = config.log_dir / f"{log_base}.csv"
     resume_log_path = log_path
     if options.resume:
         resume_log_path = resolve_resume_log_path(log_path)
@@ -131,16 +163,26 @@ async def process_autofill(options: AutofillOptions, config: RuntimeConfig) -> A
             end_display=end_display,
         )
 
-    if options.dry_run:
+    if dry_run:
         print("Mode dry-run aktif: tombol Edit hanya diverifikasi, form tidak dibuka.")
 
-    report_filename = log_filename.replace(".csv", ".html")
     logbook = LogBook(
         log_path,
-        report_path=config.log_dir / report_filename,
-        attention_flag=getattr(config, "attention_flag", None),
+        report_path=config.log_dir / f"{log_base}.html",
+        attention_flag=attention_flag,
     )
 
+    to_process = contexts
+    skipped_rows = 0
+    if options.resume and resume_entries:
+        to_skip = [ctx for ctx in contexts if ctx.display_index in resume_entries]
+        if to_skip:
+            to_process = [ctx for ctx in contexts if ctx.display_index not in resume_entries]
+            # Event RESUME_SKIP tetap dicatat per baris agar resume berikutnya mengenali baris tersebut.
+            logbook.extend(_resume_skip_event(ctx, resume_entries[ctx.display_index]) for ctx in to_skip)
+            _print_resume_skip(to_skip)
+            skipped_rows = len(to_skip)
+
     print("Memeriksa koneksi Chrome (CDP)...")
     try:
         ensure_cdp_ready(config)
@@ -150,448 +192,344 @@ async def process_autofill(options: AutofillOptions, config: RuntimeConfig) -> A
     else:
         print("Chrome CDP siap digunakan.")
 
+    screenshot_dir = config.screenshot_dir
+    pending_shots: list[asyncio.Future] = []
+
+    def _shot(target: Page, label: str, *, full_page: bool = False) -> Awaitable[ScreenshotResult]:
+        return take_screenshot(target, screenshot_dir, label, full_page=full_page, pending_writes=pending_shots)
+
     ok_rows = 0
-    skipped_rows = 0
     error_rows = 0
-    recent_errors: list[str] = []  # Track recent errors for WhatsApp notification
-
-    async with attach_browser(config) as (_, context):
-        page = pick_active_page(context)
-
-        for ctx in contexts:
-            page_ids_before_click = {id(p) for p in context.pages}
-            if options.resume and ctx.display_index in resume_entries:
-                prev = resume_entries.pop(ctx.display_index)
-                prev_level = prev.get("level", "OK")
-                prev_stage = prev.get("stage", "")
-                note_detail = prev.get("note", "")
-                _print_resume_skip(ctx, prev_level, prev_stage, note_detail)
-                extra = f"Status sebelumnya: {prev_level}"
-                if prev_stage:
-                    extra += f" | Stage: {prev_stage}"
-                if note_detail:
-                    extra += f" | Catatan: {note_detail}"
-                logbook.append(
-                    LogEvent(
-                        ts=timestamp(),
-                        row_index=ctx.display_index,
-                        level="OK",
-                        stage="RESUME_SKIP",
-                        idsbr=ctx.idsbr,
-                        nama=ctx.nama,
-                        match_value=ctx.idsbr or ctx.nama,
-                        note=f"Dilewati (resume). {extra}",
-                        screenshot="",
-                    )
-                )
-                skipped_rows += 1
-                continue
-
-            match_value = _format_match_value(ctx, options.match_by)
-            _print_row_header(ctx, options.match_by, match_value)
-            clicked = False
-            try:
-                if options.match_by == "index":
-                    clicked = await click_edit_by_index(
-                        page,
-                        ctx.table_index,
-                        timeout=config.max_wait_ms,
-                        perform_click=not options.dry_run,
-                    )
-                elif options.match_by == "idsbr":
-                    clicked = await click_edit_by_text(
-                        page,
-                        match_value,
-                        timeout=config.max_wait_ms,
-                        perform_click=not options.dry_run,
-                    )
-                elif options.match_by == "name":
-                    clicked = await click_edit_by_text(
-                        page,
-                        match_value,
-                        timeout=config.max_wait_ms,
-                        perform_click=not options.dry_run,
+    stats = AutofillStats()  # Track recent errors for WhatsApp notification
+    recent_errors = stats.recent_errors
+
+    completed = False
+    try:
+        async with attach_browser(config) as (_, context):
+            page = pick_active_page(context)
+            match_value_of = _match_value_getter(match_by)
+
+            if match_by == "index":
+
+                async def _click_edit(ctx: RowContext, match_value: str) -> bool:
+                    return await click_edit_by_index(
+                        page, ctx.table_index, timeout=max_wait_ms, perform_click=not dry_run
                     )
-            except Exception as exc:  # noqa: BLE001
-                shot = await _log_screenshot(page, f"exception_click_edit_{ctx.display_index}", config)
-                note = note_with_reason(
-                    f"CODE:CLICK_EDIT_EXCEPTION (target {options.match_by}={match_value or '-'}) : {describe_exception(exc)}",
-                    shot,
-                )
-                logbook.append(
-                    LogEvent(
-                        ts=timestamp(),
-                        row_index=ctx.display_index,
-                        level="ERROR",
-                        stage="CLICK_EDIT",
-                        idsbr=ctx.idsbr,
-                        nama=ctx.nama,
-                        match_value=match_value,
-                        note=note,
-                        screenshot=shot.path or "",
+
+            else:
+
+                async def _click_edit(ctx: RowContext, match_value: str) -> bool:
+                    return await click_edit_by_text(
+                        page, match_value, timeout=max_wait_ms, perform_click=not dry_run
                     )
+
+            # Baris diproses berurutan: tab form dideteksi lewat event "page" pada context yang sama,
+            # dan context baru (browser.new_context) tidak membawa sesi login Chrome yang di-attach.
+
+            async def _process_row(ctx: RowContext) -> RowOutcome:
+                pages_before_click = set(context.pages)
+                match_value = match_value_of(ctx)
+                row_event = partial(
+                    LogEvent, row_index=ctx.display_index, idsbr=ctx.idsbr, nama=ctx.nama, match_value=match_value
                 )
-                error_rows += 1
-                # Track error for notification
-                error_msg = f"Baris {ctx.display_index}: CODE:CLICK_EDIT_EXCEPTION"
-                recent_errors.append(error_msg)
-                if options.stop_on_error:
-                    break
-                continue
-
-            if not clicked:
-                shot = await _log_screenshot(page, f"gagal_click_edit_{ctx.display_index}", config)
-                note = note_with_reason(
-                    f"CODE:CLICK_EDIT_TIMEOUT Tombol Edit tidak ditemukan atau tidak bisa diklik (target {options.match_by}={match_value or '-'})",
-                    shot,
-                )
-                logbook.append(
-                    LogEvent(
-                        ts=timestamp(),
-                        row_index=ctx.display_index,
-                        level="ERROR",
-                        stage="CLICK_EDIT",
-                        idsbr=ctx.idsbr,
-                        nama=ctx.nama,
-                        match_value=match_value,
-                        note=note,
-                        screenshot=shot.path or "",
+                target = f"{match_by}={match_value or '-'}"
+                _print_row_header(ctx, match_by, match_value)
+                clicked = False
+                try:
+                    clicked = await _click_edit(ctx, match_value)
+                except Exception as exc:  # noqa: BLE001
+                    shot = await _shot(page, f"exception_click_edit_{ctx.display_index}")
+                    note = note_with_reason(
+                        f"CODE:CLICK_EDIT_EXCEPTION (target {target}) : {describe_exception(exc)}",
+                        shot,
                     )
-                )
-                error_rows += 1
-                # Track error for notification
-                error_msg = f"Baris {ctx.display_index}: CODE:CLICK_EDIT_TIMEOUT"
-                recent_errors.append(error_msg)
-                if options.stop_on_error:
-                    break
-                continue
-
-            if options.dry_run:
-                logbook.append(
-                    LogEvent(
-                        ts=timestamp(),
-                        row_index=ctx.display_index,
-                        level="OK",
-                        stage="DRY_RUN",
-                        idsbr=ctx.idsbr,
-                        nama=ctx.nama,
-                        match_value=match_value,
-                        note="Tombol Edit ditemukan (dry-run, form tidak dibuka).",
-                        screenshot="",
+                    logbook.append(
+                        row_event(
+                            ts=timestamp(),
+                            level="ERROR",
+                            stage="CLICK_EDIT",
+                            note=note,
+                            screenshot=shot.path or "",
+                        )
                     )
-                )
-                ok_rows += 1
-                continue
-
-            try:
-                ya_edit = page.get_by_role("button", name=re.compile(r"Ya,\s*edit!?$", re.I))
-                if await ya_edit.count() > 0:
-                    await ya_edit.click()
-            except PlaywrightError:
-                pass
-
-            new_page, open_note, open_error = await open_form_page(
-                context,
-                page,
-                match_value=match_value,
-                fallback_text=match_value or ctx.idsbr or ctx.nama,
-                config=config,
-            )
-
-            # Tutup tab ekstra jika klik Edit sempat terpanggil lebih dari sekali
-            try:
-                extra_pages = [
-                    p for p in context.pages if id(p) not in page_ids_before_click and p is not new_page
-                ]
-                for extra in extra_pages:
-                    try:
-                        await extra.close()
-                        print("    [Info] Menutup tab ekstra hasil klik ganda.")
-                    except PlaywrightError:
-                        pass
-            except Exception:
-                pass
-
-            if not new_page:
-                shot = await _log_screenshot(page, f"no_new_tab_{ctx.display_index}", config)
-                detail = open_error or "CODE:OPEN_TAB_NO_PAGE Tidak ada tab form."
-                note = note_with_reason(detail, shot)
-                logbook.append(
-                    LogEvent(
-                        ts=timestamp(),
-                        row_index=ctx.display_index,
-                        level="ERROR",
-                        stage="OPEN_TAB",
-                        idsbr=ctx.idsbr,
-                        nama=ctx.nama,
-                        match_value=match_value,
-                        note=note,
-                        screenshot=shot.path or "",
+                    # Track error for notification
+                    error_msg = f"Baris {ctx.display_index}: CODE:CLICK_EDIT_EXCEPTION"
+                    recent_errors.append(error_msg)
+                    return "error"
+
+                if not clicked:
+                    shot = await _shot(page, f"gagal_click_edit_{ctx.display_index}")
+                    note = note_with_reason(
+                        f"CODE:CLICK_EDIT_TIMEOUT Tombol Edit tidak ditemukan atau tidak bisa diklik (target {target})",
+                        shot,
                     )
-                )
-                error_rows += 1
-                if options.stop_on_error:
-                    break
-                continue
-
-            await new_page.bring_to_front()
-            if open_note:
-                logbook.append(
-                    LogEvent(
-                        ts=timestamp(),
-                        row_index=ctx.display_index,
-                        level="OK",
-                        stage="OPEN_TAB",
-                        idsbr=ctx.idsbr,
-                        nama=ctx.nama,
-                        match_value=match_value,
-                        note=open_note,
-                        screenshot="",
+                    logbook.append(
+                        row_event(
+                            ts=timestamp(),
+                            level="ERROR",
+                            stage="CLICK_EDIT",
+                            note=note,
+                            screenshot=shot.path or "",
+                        )
                     )
-                )
+                    # Track error for notification
+                    error_msg = f"Baris {ctx.display_index}: CODE:CLICK_EDIT_TIMEOUT"
+                    recent_errors.append(error_msg)
+                    return "error"
 
-            try:
-                if await is_finalized_form(new_page):
-                    print("    [Lewati] Form sudah berstatus final (hanya ada Cancel Submit).")
+                if dry_run:
                     logbook.append(
-                        LogEvent(
+                        row_event(
                             ts=timestamp(),
-                            row_index=ctx.display_index,
                             level="OK",
-                            stage="FINAL_SKIP",
-                            idsbr=ctx.idsbr,
-                            nama=ctx.nama,
-                            match_value=match_value,
-                            note="CODE:FINAL_ALREADY_SUBMITTED Dilewati: form sudah final (tombol Cancel Submit terlihat).",
+                            stage="DRY_RUN",
+                            note="Tombol Edit ditemukan (dry-run, form tidak dibuka).",
                             screenshot="",
                         )
                     )
-                    try:
-                        await new_page.close()
-                    except PlaywrightError:
-                        pass
-                    await page.bring_to_front()
-                    skipped_rows += 1
-                    continue
-            except Exception as exc:  # noqa: BLE001
-                print(f"    [Cek] Gagal memeriksa status final: {describe_exception(exc)}")
-
-            if await is_locked_page(new_page):
-                shot = await _log_screenshot(new_page, f"locked_{ctx.display_index}", config)
-                note = note_with_reason(
-                    "CODE:FORM_LOCKED Usaha sedang diedit oleh pengguna lain. Tutup tab sebelum lanjut.", shot
-                )
-                print("    [Lewati] Lock terdeteksi: usaha sedang dibuka oleh pengguna lain.")
-                logbook.append(
-                    LogEvent(
-                        ts=timestamp(),
-                        row_index=ctx.display_index,
-                        level="WARN",
-                        stage="ACCESS",
-                        idsbr=ctx.idsbr,
-                        nama=ctx.nama,
-                        match_value=match_value,
-                        note=note,
-                        screenshot=shot.path or "",
-                    )
-                )
+                    return "ok"
+
                 try:
-                    await new_page.close()
+                    ya_edit = page.get_by_role("button", name=_YA_EDIT_RE)
+                    if await ya_edit.count() > 0:
+                        await ya_edit.click()
                 except PlaywrightError:
                     pass
-                await page.bring_to_front()
-                skipped_rows += 1
-                continue
-
-            try:
-                fill_summary = await fill_form(new_page, ctx, config)
-                updated = int(fill_summary.get("updated", 0))
-                skipped = int(fill_summary.get("skipped", 0))
-                errors = fill_summary.get("errors", [])
-                note_fill = f"Form terisi (update={updated}, skip={skipped})"
-                level = "OK"
-                screenshot_path = ""
-                if errors:
-                    level = "ERROR"
-                    note_fill += f" | Kendala: {', '.join(errors)}"
-                    shot = await _log_screenshot(new_page, f"fill_errors_{ctx.display_index}", config)
-                    screenshot_path = shot.path or ""
-                logbook.append(
-                    LogEvent(
-                        ts=timestamp(),
-                        row_index=ctx.display_index,
-                        level=level,
-                        stage="FILL",
-                        idsbr=ctx.idsbr,
-                        nama=ctx.nama,
-                        match_value=match_value,
-                        note=note_fill,
-                        screenshot=screenshot_path,
-                    )
-                )
-                if errors:
-                    error_rows += 1
-                    try:
-                        await new_page.close()
-                    except PlaywrightError:
-                        pass
-                    await page.bring_to_front()
-                    if options.stop_on_error:
-                        break
-                    continue
-            except Exception as exc:  # noqa: BLE001
-                shot = await _log_screenshot(new_page, f"exception_fill_form_{ctx.display_index}", config)
-                note = note_with_reason(f"Exception isi form: {describe_exception(exc)}", shot)
-                logbook.append(
-                    LogEvent(
-                        ts=timestamp(),
-                        row_index=ctx.display_index,
-                        level="ERROR",
-                        stage="FILL",
-                        idsbr=ctx.idsbr,
-                        nama=ctx.nama,
-                        match_value=match_value,
-                        note=note,
-                        screenshot=shot.path or "",
-                    )
+
+                new_page, open_note, open_error = await open_form_page(
+                    context,
+                    page,
+                    match_value=match_value,
+                    fallback_text=match_value or ctx.idsbr or ctx.nama,
+                    config=config,
                 )
-                error_rows += 1
+
+                # Tutup tab ekstra jika klik Edit sempat terpanggil lebih dari sekali
                 try:
-                    await new_page.close()
-                except PlaywrightError:
+                    extra_pages = [p for p in context.pages if p not in pages_before_click and p is not new_page]
+                    if extra_pages:
+                        await asyncio.gather(*(close_page(extra) for extra in extra_pages))
+                        print(f"    [Info] Menutup {len(extra_pages)} tab ekstra hasil klik ganda.")
+                except Exception:
                     pass
-                if options.stop_on_error:
-                    break
-                else:
-                    await page.bring_to_front()
-                    continue
-
-            try:
-                result = await submit_form(new_page, ctx, config)
-                if result.code != "OK":
-                    shot = await _log_screenshot(
-                        new_page, f"submit_issue_{ctx.display_index}_{result.code}", config
-                    )
-                    detail_note = result.code
-                    if result.detail:
-                        detail_note = f"{result.code} | {result.detail}"
-                    note = note_with_reason(detail_note, shot)
+
+                if not new_page:
+                    shot = await _shot(page, f"no_new_tab_{ctx.display_index}")
+                    detail = open_error or "CODE:OPEN_TAB_NO_PAGE Tidak ada tab form."
+                    note = note_with_reason(detail, shot)
                     logbook.append(
-                        LogEvent(
+                        row_event(
                             ts=timestamp(),
-                            row_index=ctx.display_index,
                             level="ERROR",
-                            stage="SUBMIT",
-                            idsbr=ctx.idsbr,
-                            nama=ctx.nama,
-                            match_value=match_value,
+                            stage="OPEN_TAB",
                             note=note,
                             screenshot=shot.path or "",
                         )
                     )
-                    error_rows += 1
-                    try:
-                        await new_page.close()
-                    except PlaywrightError:
-                        pass
-                    await page.bring_to_front()
-                    if options.stop_on_error:
-                        break
-                    continue
-                else:
-                    success_note = result.detail or "Submit final sukses"
-                    logbook.append(
-                        LogEvent(
-                            ts=timestamp(),
-                            row_index=ctx.display_index,
-                            level="OK",
-                            stage="SUBMIT",
-                            idsbr=ctx.idsbr,
-                            nama=ctx.nama,
-                            match_value=match_value,
-                            note=success_note,
-                            screenshot="",
+                    return "error"
+
+                async with _page_guard(new_page, page):
+                    await new_page.bring_to_front()
+                    if open_note:
+                        logbook.append(
+                            row_event(
+                                ts=timestamp(),
+                                level="OK",
+                                stage="OPEN_TAB",
+                                note=open_note,
+                                screenshot="",
+                            )
                         )
+
+                    finalized, locked = await asyncio.gather(
+                        is_finalized_form(new_page), is_locked_page(new_page), return_exceptions=True
                     )
-            except Exception as exc:  # noqa: BLE001
-                shot = await _log_screenshot(new_page, f"exception_submit_{ctx.display_index}", config)
-                note = note_with_reason(f"EXCEPTION: {describe_exception(exc)}", shot)
+                    if isinstance(locked, BaseException):
+                        raise locked
+                    if isinstance(finalized, BaseException):
+                        if not isinstance(finalized, Exception):
+                            raise finalized
+                        print(f"    [Cek] Gagal memeriksa status final: {describe_exception(finalized)}")
+                        finalized = False
+
+                    if finalized:
+                        print("    [Lewati] Form sudah berstatus final (hanya ada Cancel Submit).")
+                        logbook.append(
+                            row_event(
+                                ts=timestamp(),
+                                level="OK",
+                                stage="FINAL_SKIP",
+                                note="CODE:FINAL_ALREADY_SUBMITTED Dilewati: form sudah final (tombol Cancel Submit terlihat).",
+                                screenshot="",
+                            )
+                        )
+                        return "skipped"
+
+                    if locked:
+                        shot = await _shot(new_page, f"locked_{ctx.display_index}")
+                        note = note_with_reason(
+                            "CODE:FORM_LOCKED Usaha sedang diedit oleh pengguna lain. Tutup tab sebelum lanjut.", shot
+                        )
+                        print("    [Lewati] Lock terdeteksi: usaha sedang dibuka oleh pengguna lain.")
+                        logbook.append(
+                            row_event(
+                                ts=timestamp(),
+                                level="WARN",
+                                stage="ACCESS",
+                                note=note,
+                                screenshot=shot.path or "",
+                            )
+                        )
+                        return "skipped"
+
+                    try:
+                        fill_summary = await fill_form(new_page, ctx, config)
+                        updated = int(fill_summary.get("updated", 0))
+                        skipped = int(fill_summary.get("skipped", 0))
+                        unchanged = int(fill_summary.get("unchanged", 0))
+                        errors = fill_summary.get("errors", [])
+                        note_fill = f"Form terisi (update={updated}, tetap={unchanged}, skip={skipped})"
+                        level = "OK"
+                        screenshot_path = ""
+                        if errors:
+                            level = "ERROR"
+                            note_fill += f" | Kendala: {', '.join(errors)}"
+                            shot = await _shot(new_page, f"fill_errors_{ctx.display_index}", full_page=True)
+                            screenshot_path = shot.path or ""
+                        logbook.append(
+                            row_event(
+                                ts=timestamp(),
+                                level=level,
+                                stage="FILL",
+                                note=note_fill,
+                                screenshot=screenshot_path,
+                            )
+                        )
+                        if errors:
+                            return "error"
+                    except Exception as exc:  # noqa: BLE001
+                        shot = await _shot(new_page, f"exception_fill_form_{ctx.display_index}", full_page=True)
+                        note = note_with_reason(f"Exception isi form: {describe_exception(exc)}", shot)
+                        logbook.append(
+                            row_event(
+                                ts=timestamp(),
+                                level="ERROR",
+                                stage="FILL",
+                                note=note,
+                                screenshot=shot.path or "",
+                            )
+                        )
+                        return "error"
+
+                    try:
+                        result = await submit_form(new_page, ctx, config)
+                        if result.code != "OK":
+                            shot = await _shot(
+                                new_page, f"submit_issue_{ctx.display_index}_{result.code}", full_page=True
+                            )
+                            detail_note = result.code
+                            if result.detail:
+                                detail_note = f"{result.code} | {result.detail}"
+                            note = note_with_reason(detail_note, shot)
+                            logbook.append(
+                                row_event(
+                                    ts=timestamp(),
+                                    level="ERROR",
+                                    stage="SUBMIT",
+                                    note=note,
+                                    screenshot=shot.path or "",
+                                )
+                            )
+                            return "error"
+                        else:
+                            success_note = result.detail or "Submit final sukses"
+                            logbook.append(
+                                row_event(
+                                    ts=timestamp(),
+                                    level="OK",
+                                    stage="SUBMIT",
+                                    note=success_note,
+                                    screenshot="",
+                                )
+                            )
+                    except Exception as exc:  # noqa: BLE001
+                        shot = await _shot(new_page, f"exception_submit_{ctx.display_index}", full_page=True)
+                        note = note_with_reason(f"EXCEPTION: {describe_exception(exc)}", shot)
+                        logbook.append(
+                            row_event(
+                                ts=timestamp(),
+                                level="ERROR",
+                                stage="SUBMIT",
+                                note=note,
+                                screenshot=shot.path or "",
+                            )
+                        )
+                        return "error"
+
+                try:
+                    await page.wait_for_load_state("domcontentloaded", timeout=max_wait_ms)
+                    await page.locator(TABLE_SELECTOR).wait_for(state="visible", timeout=max_wait_ms)
+                except PlaywrightError:
+                    pass
+                if config.post_row_settle_ms > 0:
+                    await page.wait_for_timeout(config.post_row_settle_ms)
                 logbook.append(
-                    LogEvent(
+                    row_event(
                         ts=timestamp(),
-                        row_index=ctx.display_index,
-                        level="ERROR",
-                        stage="SUBMIT",
-                        idsbr=ctx.idsbr,
-                        nama=ctx.nama,
-                        match_value=match_value,
-                        note=note,
-                        screenshot=shot.path or "",
+                        level="OK",
+                        stage="ROW_DONE",
+                        note="Baris selesai diproses",
+                        screenshot="",
                     )
                 )
-                error_rows += 1
-                if options.stop_on_error:
-                    try:
-                        await new_page.close()
-                    except PlaywrightError:
-                        pass
-                    break
+                return "ok"
+
+            for ctx in to_process:
+                outcome = await _process_row(ctx)
+                if outcome == "ok":
+                    ok_rows += 1
+                elif outcome == "skipped":
+                    skipped_rows += 1
                 else:
-                    try:
-                        await new_page.close()
-                    except PlaywrightError:
-                        pass
-                    await page.bring_to_front()
-                    continue
-
-            try:
-                await new_page.close()
-            except PlaywrightError:
-                pass
-
-            await page.bring_to_front()
-            await page.wait_for_timeout(800)
-            logbook.append(
-                LogEvent(
-                    ts=timestamp(),
-                    row_index=ctx.display_index,
-                    level="OK",
-                    stage="ROW_DONE",
-                    idsbr=ctx.idsbr,
-                    nama=ctx.nama,
-                    match_value=match_value,
-                    note="Baris selesai diproses",
-                    screenshot="",
-                )
-            )
-            ok_rows += 1
-
-    logbook.save()
-    index_path = logbook.path.parent.parent / "index.csv"
-    update_run_index(
-        index_path,
-        {
-            "run_id": config.run_id,
-            "started_at": config.run_started_at,
-            "command": "autofill",
-            "resume": str(options.resume),
-            "dry_run": str(options.dry_run),
-            "skip_status": str(config.skip_status),
-            "ok_rows": str(ok_rows),
-            "error_rows": str(error_rows),
-            "skipped_rows": str(skipped_rows),
-            "log_csv": str(logbook.path),
-            "log_html": str(logbook.report_path or ""),
-            "profile": config.profile_path or "",
-        },
-    )
+                    error_rows += 1
+                    if stop_on_error:
+                        break
+        completed = True
+    finally:
+        if pending_shots:
+            results = await asyncio.gather(*pending_shots, return_exceptions=True)
+            failed = sum(1 for result in results if isinstance(result, BaseException))
+            if failed:
+                print(f"[Screenshot] {failed} file screenshot gagal ditulis ke disk.")
+        logbook.save()
+        index_path = logbook.path.parent.parent / "index.csv"
+        update_run_index(
+            index_path,
+            {
+                "run_id": config.run_id,
+                "started_at": config.run_started_at,
+                "command": "autofill",
+                "resume": str(options.resume),
+                "dry_run": str(dry_run),
+                "skip_status": str(config.skip_status),
+                "ok_rows": str(ok_rows),
+                "error_rows": str(error_rows),
+                "skipped_rows": str(skipped_rows),
+                "log_csv": str(logbook.path),
+                "log_html": str(logbook.report_path or ""),
+                "profile": config.profile_path or "",
+            },
+        )
+        if not completed:
+            print(f"\nProses terhenti sebelum selesai; log parsial disimpan di {logbook.path}")
+
     _print_run_summary(
         ok_rows,
         error_rows,
         skipped_rows,
         logbook,
         config,
-        dry_run=options.dry_run,
+        dry_run=dry_run,
     )
 
     issues = logbook.recent_issues()
@@ -606,9 +544,7 @@ async def process_autofill(options: AutofillOptions, config: RuntimeConfig) -> A
             )
     
     # Return statistics for WhatsApp notification
-    return AutofillStats(
-        success_count=ok_rows,
-        error_count=error_rows,
-        skip_count=skipped_rows,
-        recent_errors=recent_errors[-5:],  # Keep last 5 errors
-    )
+    stats.success_count = ok_rows
+    stats.error_count = error_rows
+    stats.skip_count = skipped_rows
+    return stats
@@ -1,21 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 import re
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 
+import pandas as pd
 from playwright.async_api import Error as PlaywrightError, Page
 
 from .config import CancelOptions, RuntimeConfig
-from .excel_loader import ensure_required_columns, load_dataframe, slice_rows
+from .excel_loader import COLUMN_ALIASES, ensure_required_with_aliases, has_column, load_dataframe_window
 from .logbook import LogBook, LogEvent, update_run_index
-from .playwright_helpers import attach_browser, ensure_cdp_ready, pick_active_page
-from .table_actions import click_edit_by_index, click_edit_by_text
+from .playwright_helpers import attach_browser, back_to_main, close_page, ensure_cdp_ready, pick_active_page
+from .table_actions import click_edit_by_index, click_edit_by_text, find_edit_href_by_text
 from .utils import (
     ScreenshotResult,
     clear_attention_flag,
     describe_exception,
     note_with_reason,
-    norm_space,
     take_screenshot,
     timestamp,
 )
@@ -23,12 +25,15 @@ from .utils import (
 
 BASE_REQUIRED_COLUMNS_CANCEL = ()
 MATCH_BY_REQUIRED_COLUMNS_CANCEL = {
-    "idsbr": ("IDSBR",),
-    "name": ("Nama",),
+    "idsbr": ("idsbr",),
+    "name": ("nama",),
 }
+# Cancel hanya mencocokkan kolom idsbr apa adanya; idsbr_master adalah ID usaha induk, bukan pengganti.
+CANCEL_COLUMN_ALIASES = {**COLUMN_ALIASES, "idsbr": ("idsbr",)}
 
 _ROW_DIVIDER = "=" * 72
 _ROW_SUBDIVIDER = "-" * 72
+_KONFIRMASI_RE = re.compile("Konfirmasi", re.I)
 
 
 @dataclass(slots=True)
@@ -39,26 +44,38 @@ class CancelRowContext:
     nama: str
 
 
-async def _log_screenshot(page: Page, label: str, config: RuntimeConfig) -> ScreenshotResult:
-    return await take_screenshot(page, config.cancel_screenshot_dir, label)
+def _column_values(df: pd.DataFrame, name: str) -> list:
+    """Ambil nilai kolom kanonik sebagai list string yang sudah dirapikan loader."""
+    if name in df.columns:
+        return df[name].to_numpy(dtype=object).tolist()
+    return [""] * len(df)
 
 
-def _format_match_value(ctx: CancelRowContext, match_by: str) -> str:
-    if match_by == "index":
-        return "" if ctx.table_index is None else str(ctx.table_index)
-    if match_by == "idsbr":
-        return ctx.idsbr or ""
-    if match_by == "name":
-        return ctx.nama or ""
-    return ""
+def _row_contexts(df: pd.DataFrame, start_idx: int) -> list[CancelRowContext]:
+    """Bangun konteks per baris dari kolom idsbr/nama; idsbr kosong tetap kosong (tanpa idsbr_master)."""
+    return [
+        CancelRowContext(table_index=i, display_index=i + 1, idsbr=idsbr, nama=nama)
+        for i, (idsbr, nama) in enumerate(
+            zip(_column_values(df, "idsbr"), _column_values(df, "nama"), strict=True), start=start_idx
+        )
+    ]
+
+
+_MATCH_VALUE_FNS: dict[str, Callable[[CancelRowContext], str]] = {
+    "index": lambda ctx: "" if ctx.table_index is None else str(ctx.table_index),
+    "idsbr": lambda ctx: ctx.idsbr or "",
+    "name": lambda ctx: ctx.nama or "",
+}
 
 
 def _print_row_header(ctx: CancelRowContext, match_by: str, match_value: str) -> None:
     title = ctx.idsbr or ctx.nama or "(tanpa nama)"
-    print(f"\n{_ROW_DIVIDER}")
-    print(f"Baris {ctx.display_index}: {title}")
-    print(f"Target : {match_value or '-'} (match_by={match_by})")
-    print(_ROW_SUBDIVIDER)
+    print(
+        f"\n{_ROW_DIVIDER}\n"
+        f"Baris {ctx.display_index}: {title}\n"
+        f"Target : {match_value or '-'} (match_by={match_by})\n"
+        f"{_ROW_SUBDIVIDER}"
+    )
 
 
 def _print_run_summary(ok_rows: int, error_rows: int, logbook: LogBook, config: RuntimeConfig) -> None:
@@ -74,25 +91,112 @@ def _print_run_summary(ok_rows: int, error_rows: int, logbook: LogBook, config:
     print(_ROW_SUBDIVIDER)
 
 
+# Satu langkah alur cancel per evaluate ('cancel' / 'confirm' / 'ok'), sehingga Python selalu tahu langkah
+# mana yang sudah terjadi. Klik "Ya, batalkan!" dijadwalkan setelah hasil evaluate terkirim: bila halaman
+# langsung reload, evaluate tetap mengembalikan CLICKED alih-alih error "execution context destroyed".
+_CANCEL_FLOW_JS = """
+async ({ step, timeout }) => {
+  const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+  const visible = (el) => !!el && !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+  const byText = (selector, text, root = document) =>
+    Array.from(root.querySelectorAll(selector)).find((el) => visible(el) && el.textContent.includes(text));
+  const waitFor = async (find, ms) => {
+    const deadline = Date.now() + ms;
+    while (Date.now() < deadline) {
+      const el = find();
+      if (el) return el;
+      await sleep(100);
+    }
+    return null;
+  };
+
+  if (step === 'cancel') {
+    const cancelBtn = await waitFor(() => {
+      const el = document.querySelector('#cancel-submit-final > span');
+      return visible(el) ? el : byText('button, a', 'Cancel Submit');
+    }, timeout);
+    if (!cancelBtn) return 'NO_CANCEL';
+    cancelBtn.scrollIntoView({ block: 'center' });
+    cancelBtn.click();
+    return 'CLICKED';
+  }
+
+  if (step === 'confirm') {
+    const yaBtn = await waitFor(() => {
+      const modals = Array.from(document.querySelectorAll('div.modal.show, div[role="dialog"]'));
+      const target = modals.find((modal) => /konfirmasi/i.test(modal.textContent)) || modals[0];
+      return target ? byText('button, a', 'Ya, batalkan!', target) : null;
+    }, timeout);
+    if (!yaBtn) return 'NO_CONFIRM';
+    setTimeout(() => yaBtn.click(), 0);
+    return 'CLICKED';
+  }
+
+  const okBtn = await waitFor(() => byText('button', 'OK'), timeout);
+  if (!okBtn) return 'OK_ASSUMED';
+  okBtn.click();
+  return 'OK';
+}
+"""
+
+
 async def _do_cancel(new_page: Page, config: RuntimeConfig) -> str:
+    """Jalankan Cancel Submit -> Ya, batalkan! -> OK lewat evaluate per langkah; fallback ke langkah Playwright."""
     print("    [Form] Membuka tab form...")
 
     try:
-        btn = new_page.locator("xpath=//*[@id='cancel-submit-final']/span")
-        if await btn.count() == 0:
-            btn = new_page.locator("button:has-text('Cancel Submit'), a:has-text('Cancel Submit')").first
-        await btn.wait_for(state="visible", timeout=config.max_wait_ms)
-        await btn.scroll_into_view_if_needed(timeout=config.max_wait_ms)
-        await btn.click()
-        print("    [Klik] Cancel Submit")
-    except Exception as exc:  # noqa: BLE001
-        detail = f"ERROR: Gagal klik Cancel Submit ({describe_exception(exc)})"
+        outcome = await new_page.evaluate(_CANCEL_FLOW_JS, {"step": "cancel", "timeout": config.max_wait_ms})
+    except PlaywrightError as exc:
+        print(f"    [Info] Klik Cancel Submit via evaluate gagal ({describe_exception(exc)}); coba per langkah.")
+        return await _do_cancel_stepwise(new_page, config)
+    if outcome == "NO_CANCEL":
+        detail = "ERROR: Gagal klik Cancel Submit (tombol tidak ditemukan)"
+        print(f"    [Gagal] {detail}")
+        return detail
+    print("    [Klik] Cancel Submit")
+
+    try:
+        outcome = await new_page.evaluate(_CANCEL_FLOW_JS, {"step": "confirm", "timeout": 4000})
+    except PlaywrightError as exc:
+        # "Ya, batalkan!" belum diklik: lanjutkan per langkah dari dialog konfirmasi, tanpa klik Cancel Submit lagi.
+        print(f"    [Info] Konfirmasi via evaluate gagal ({describe_exception(exc)}); coba per langkah.")
+        return await _do_cancel_stepwise(new_page, config, cancel_clicked=True)
+    if outcome == "NO_CONFIRM":
+        detail = "ERROR: Gagal klik 'Ya, batalkan!' (dialog konfirmasi tidak muncul)"
         print(f"    [Gagal] {detail}")
         return detail
+    print("    [Konfirmasi] Ya, batalkan!")
+
+    try:
+        outcome = await new_page.evaluate(_CANCEL_FLOW_JS, {"step": "ok", "timeout": 5000})
+    except PlaywrightError:
+        # Pembatalan sudah dikonfirmasi; error di sini biasanya karena halaman reload (context hilang).
+        outcome = "OK_ASSUMED"
+    if outcome == "OK_ASSUMED":
+        print("    [Info] Tidak menemukan dialog Success; diasumsikan OK")
+    else:
+        print("    [Sukses] OK ditekan")
+    return "OK"
+
+
+async def _do_cancel_stepwise(new_page: Page, config: RuntimeConfig, *, cancel_clicked: bool = False) -> str:
+    if not cancel_clicked:
+        try:
+            btn = new_page.locator("xpath=//*[@id='cancel-submit-final']/span")
+            if await btn.count() == 0:
+                btn = new_page.locator("button:has-text('Cancel Submit'), a:has-text('Cancel Submit')").first
+            await btn.wait_for(state="visible", timeout=config.max_wait_ms)
+            await btn.scroll_into_view_if_needed(timeout=config.max_wait_ms)
+            await btn.click()
+            print("    [Klik] Cancel Submit")
+        except Exception as exc:  # noqa: BLE001
+            detail = f"ERROR: Gagal klik Cancel Submit ({describe_exception(exc)})"
+            print(f"    [Gagal] {detail}")
+            return detail
 
     try:
         modal = new_page.locator("div.modal.show, div[role='dialog']")
-        with_text = modal.filter(has_text=re.compile("Konfirmasi", re.I)).first
+        with_text = modal.filter(has_text=_KONFIRMASI_RE).first
         target = with_text if await with_text.count() > 0 else modal.first
         await target.wait_for(timeout=4000)
         ya_btn = target.locator("button:has-text('Ya, batalkan!'), a:has-text('Ya, batalkan!')").first
@@ -103,33 +207,47 @@ async def _do_cancel(new_page: Page, config: RuntimeConfig) -> str:
         print(f"    [Gagal] {detail}")
         return detail
 
+    ok_btn = new_page.locator("button:has-text('OK')").first
     try:
-        for _ in range(20):
-            ok_btn = new_page.locator("button:has-text('OK')").first
-            if await ok_btn.count() > 0 and await ok_btn.is_visible():
-                await ok_btn.click(force=True)
-                print("    [Sukses] OK ditekan")
-                return "OK"
-            await new_page.wait_for_timeout(250)
+        await ok_btn.wait_for(state="visible", timeout=5000)
+    except PlaywrightError:
         print("    [Info] Tidak menemukan dialog Success; diasumsikan OK")
         return "OK"
+    try:
+        await ok_btn.click(force=True)
+        print("    [Sukses] OK ditekan")
+        return "OK"
     except Exception as exc:  # noqa: BLE001
         detail = f"ERROR: Gagal menutup dialog success ({describe_exception(exc)})"
         print(f"    [Gagal] {detail}")
         return detail
 
 
+async def _reuse_form_tab(form_page: Page, href: str, config: RuntimeConfig) -> Page | None:
+    """Arahkan tab form yang masih terbuka ke link Edit baris berikutnya; None bila gagal."""
+    try:
+        await form_page.goto(href, wait_until="domcontentloaded", timeout=config.max_wait_ms)
+    except PlaywrightError as exc:
+        print(f"    [Info] Gagal memakai ulang tab form ({describe_exception(exc)}); buka tab baru.")
+        return None
+    print("    [Form] Memakai ulang tab form sebelumnya.")
+    return form_page
+
+
 async def process_cancel(options: CancelOptions, config: RuntimeConfig) -> None:
-    clear_attention_flag(getattr(config, "attention_flag", None))
-    df = load_dataframe(options.excel)
+    attention_flag = getattr(config, "attention_flag", None)
+    clear_attention_flag(attention_flag)
+    df, start_idx = load_dataframe_window(options.excel, options.start_row, options.end_row)
     required_columns = tuple(BASE_REQUIRED_COLUMNS_CANCEL) + MATCH_BY_REQUIRED_COLUMNS_CANCEL.get(
         options.match_by, ()
     )
     try:
-        ensure_required_columns(df, required_columns)
+        ensure_required_with_aliases(df, required_columns, CANCEL_COLUMN_ALIASES)
     except RuntimeError as exc:
         missing_match = [
-            col for col in MATCH_BY_REQUIRED_COLUMNS_CANCEL.get(options.match_by, ()) if col not in df.columns
+            col
+            for col in MATCH_BY_REQUIRED_COLUMNS_CANCEL.get(options.match_by, ())
+            if not has_column(df, col, aliases=CANCEL_COLUMN_ALIASES)
         ]
         if missing_match:
             raise RuntimeError(
@@ -137,13 +255,17 @@ async def process_cancel(options: CancelOptions, config: RuntimeConfig) -> None:
             ) from exc
         raise
 
-    start_idx, end_idx = slice_rows(df, options.start_row, options.end_row)
-    log_filename = f"log_sbr_cancel_{config.run_id}.csv" if config.run_id else "log_sbr_cancel.csv"
-    log_path = config.log_dir / log_filename
+    match_value_of = _MATCH_VALUE_FNS.get(options.match_by, lambda ctx: "")
+    contexts = _row_contexts(df, start_idx)
+    match_values = [match_value_of(ctx) for ctx in contexts]
+    log_base = f"log_sbr_cancel_{config.run_id}" if config.run_id else "log_sbr_cancel"
+    log_path = config.log_dir / f"{log_base}.csv"
     logbook = LogBook(
         log_path,
-        report_path=config.log_dir / log_filename.replace(".csv", ".html"),
-        attention_flag=getattr(config, "attention_flag", None),
+        report_path=config.log_dir / f"{log_base}.html",
+        attention_flag=attention_flag,
+        flush_every=16,
+        flush_interval=30.0,
     )
 
     print("Memeriksa koneksi Chrome (CDP)...")
@@ -155,164 +277,191 @@ async def process_cancel(options: CancelOptions, config: RuntimeConfig) -> None:
     else:
         print("Chrome CDP siap digunakan.")
 
+    screenshot_dir = config.cancel_screenshot_dir
+    pending_shots: list[asyncio.Future] = []
+
+    def _shot(target: Page, label: str, *, full_page: bool = False) -> Awaitable[ScreenshotResult]:
+        return take_screenshot(target, screenshot_dir, label, full_page=full_page, pending_writes=pending_shots)
+
+    # Pakai ulang tab form hanya bila link Edit bisa dicari lewat teks (idsbr/name).
+    reuse_form_tab = options.reuse_form_tab and options.match_by != "index"
+    form_page: Page | None = None
     ok_rows = 0
     error_rows = 0
 
-    async with attach_browser(config) as (_, context):
-        page = pick_active_page(context)
-
-        for i in range(start_idx, end_idx):
-            row = df.iloc[i]
-            ctx = CancelRowContext(
-                table_index=i,
-                display_index=i + 1,
-                idsbr=norm_space(row.get("IDSBR")),
-                nama=norm_space(row.get("Nama")),
-            )
-
-            match_value = _format_match_value(ctx, options.match_by)
-            _print_row_header(ctx, options.match_by, match_value)
-            clicked = False
-            try:
-                if options.match_by == "index":
-                    clicked = await click_edit_by_index(page, ctx.table_index, timeout=config.max_wait_ms)
-                elif options.match_by == "idsbr":
-                    clicked = await click_edit_by_text(page, match_value, timeout=config.max_wait_ms)
-                elif options.match_by == "name":
-                    clicked = await click_edit_by_text(page, match_value, timeout=config.max_wait_ms)
-            except Exception as exc:  # noqa: BLE001
-                shot = await _log_screenshot(page, f"exception_click_edit_{ctx.display_index}", config)
-                note = note_with_reason(
-                    f"Exception klik Edit (target {options.match_by}={match_value or '-'}) : {describe_exception(exc)}",
-                    shot,
-                )
-                logbook.append(
-                    LogEvent(
-                        ts=timestamp(),
-                        row_index=ctx.display_index,
-                        level="ERROR",
-                        stage="CLICK_EDIT",
-                        idsbr=ctx.idsbr,
-                        nama=ctx.nama,
-                        match_value=match_value,
-                        note=note,
-                        screenshot=shot.path or "",
+    try:
+        async with attach_browser(config) as (_, context):
+            page = pick_active_page(context)
+
+            # Sengaja berurutan: tombol Edit diklik di satu tabel direktori yang sama, tab form
+            # dideteksi lewat event "page" pada context ini, dan context baru tidak membawa login Chrome.
+            for ctx, match_value in zip(contexts, match_values, strict=True):
+                _print_row_header(ctx, options.match_by, match_value)
+                reuse_now = reuse_form_tab and form_page is not None and not form_page.is_closed()
+                clicked = False
+                edit_href = ""
+                try:
+                    if options.match_by == "index":
+                        clicked = await click_edit_by_index(page, ctx.table_index, timeout=config.max_wait_ms)
+                    else:
+                        if reuse_now:
+                            edit_href = await find_edit_href_by_text(page, match_value, timeout=config.max_wait_ms)
+                            if not edit_href:
+                                # Tidak ada baris yang cocok persis: tutup tab lama lalu buka form lewat klik biasa.
+                                await close_page(form_page)
+                                form_page = None
+                        clicked = bool(edit_href) or await click_edit_by_text(
+                            page, match_value, timeout=config.max_wait_ms
+                        )
+                except Exception as exc:  # noqa: BLE001
+                    shot = await _shot(page, f"exception_click_edit_{ctx.display_index}")
+                    note = note_with_reason(
+                        f"Exception klik Edit (target {options.match_by}={match_value or '-'}) : {describe_exception(exc)}",
+                        shot,
                     )
-                )
-                error_rows += 1
-                if options.stop_on_error:
-                    break
-                continue
-
-            if not clicked:
-                shot = await _log_screenshot(page, f"gagal_click_edit_{ctx.display_index}", config)
-                note = note_with_reason(
-                    f"Tombol Edit tidak ditemukan (target {options.match_by}={match_value or '-'})", shot
-                )
-                logbook.append(
-                    LogEvent(
-                        ts=timestamp(),
-                        row_index=ctx.display_index,
-                        level="ERROR",
-                        stage="CLICK_EDIT",
-                        idsbr=ctx.idsbr,
-                        nama=ctx.nama,
-                        match_value=match_value,
-                        note=note,
-                        screenshot=shot.path or "",
+                    logbook.append(
+                        LogEvent(
+                            ts=timestamp(),
+                            row_index=ctx.display_index,
+                            level="ERROR",
+                            stage="CLICK_EDIT",
+                            idsbr=ctx.idsbr,
+                            nama=ctx.nama,
+                            match_value=match_value,
+                            note=note,
+                            screenshot=shot.path or "",
+                        )
                     )
-                )
-                error_rows += 1
-                if options.stop_on_error:
-                    break
-                continue
-
-            try:
-                ya_edit = page.get_by_role("button", name="Ya, edit!")
-                if await ya_edit.count() > 0:
-                    await ya_edit.click()
-            except PlaywrightError:
-                pass
-
-            await page.wait_for_timeout(config.pause_after_edit_ms)
-
-            try:
-                new_page = await context.wait_for_event("page", timeout=config.max_wait_ms)
-            except PlaywrightError as exc:
-                shot = await _log_screenshot(page, f"no_new_tab_{ctx.display_index}", config)
-                note = note_with_reason(f"Tidak ada tab form: {describe_exception(exc)}", shot)
+                    error_rows += 1
+                    if options.stop_on_error:
+                        break
+                    continue
+
+                if not clicked:
+                    shot = await _shot(page, f"gagal_click_edit_{ctx.display_index}")
+                    note = note_with_reason(
+                        f"Tombol Edit tidak ditemukan (target {options.match_by}={match_value or '-'})", shot
+                    )
+                    logbook.append(
+                        LogEvent(
+                            ts=timestamp(),
+                            row_index=ctx.display_index,
+                            level="ERROR",
+                            stage="CLICK_EDIT",
+                            idsbr=ctx.idsbr,
+                            nama=ctx.nama,
+                            match_value=match_value,
+                            note=note,
+                            screenshot=shot.path or "",
+                        )
+                    )
+                    error_rows += 1
+                    if options.stop_on_error:
+                        break
+                    continue
+
+                new_page = None
+                if edit_href:
+                    new_page = await _reuse_form_tab(form_page, edit_href, config)
+                    if new_page is None:
+                        # Link Edit tidak bisa dipakai: tutup tab lama lalu buka form lewat klik biasa.
+                        await close_page(form_page)
+                        form_page = None
+                        clicked = await click_edit_by_text(page, match_value, timeout=config.max_wait_ms)
+
+                try:
+                    if new_page is None:
+                        if not clicked:
+                            raise PlaywrightError("Tombol Edit tidak bisa diklik ulang")
+                        try:
+                            ya_edit = page.get_by_role("button", name="Ya, edit!")
+                            if await ya_edit.count() > 0:
+                                await ya_edit.click()
+                        except PlaywrightError:
+                            pass
+
+                        await page.wait_for_timeout(config.pause_after_edit_ms)
+                        new_page = await context.wait_for_event("page", timeout=config.max_wait_ms)
+                except PlaywrightError as exc:
+                    shot = await _shot(page, f"no_new_tab_{ctx.display_index}")
+                    note = note_with_reason(f"Tidak ada tab form: {describe_exception(exc)}", shot)
+                    logbook.append(
+                        LogEvent(
+                            ts=timestamp(),
+                            row_index=ctx.display_index,
+                            level="ERROR",
+                            stage="OPEN_TAB",
+                            idsbr=ctx.idsbr,
+                            nama=ctx.nama,
+                            match_value=match_value,
+                            note=note,
+                            screenshot=shot.path or "",
+                        )
+                    )
+                    error_rows += 1
+                    if options.stop_on_error:
+                        break
+                    continue
+
+                await new_page.bring_to_front()
+                raw_result = await _do_cancel(new_page, config)
+                result_note = raw_result
+                shot_path = ""
+                if raw_result != "OK":
+                    shot = await _shot(new_page, f"cancel_issue_{ctx.display_index}", full_page=True)
+                    result_note = note_with_reason(raw_result, shot)
+                    shot_path = shot.path or ""
+
+                if reuse_form_tab and raw_result == "OK" and new_page is not page:
+                    form_page = new_page
+                    await page.bring_to_front()
+                else:
+                    form_page = None
+                    await back_to_main(new_page, page)
+
                 logbook.append(
                     LogEvent(
                         ts=timestamp(),
                         row_index=ctx.display_index,
-                        level="ERROR",
-                        stage="OPEN_TAB",
+                        level="OK" if raw_result == "OK" else "ERROR",
+                        stage="CANCEL",
                         idsbr=ctx.idsbr,
                         nama=ctx.nama,
                         match_value=match_value,
-                        note=note,
-                        screenshot=shot.path or "",
+                        note=result_note,
+                        screenshot=shot_path,
                     )
                 )
-                error_rows += 1
-                if options.stop_on_error:
-                    break
-                continue
-
-            await new_page.bring_to_front()
-            raw_result = await _do_cancel(new_page, config)
-            result_note = raw_result
-            shot_path = ""
-            if raw_result != "OK":
-                shot = await _log_screenshot(new_page, f"cancel_issue_{ctx.display_index}", config)
-                result_note = note_with_reason(raw_result, shot)
-                shot_path = shot.path or ""
-
-            try:
-                await new_page.close()
-            except PlaywrightError:
-                pass
-
-            await page.bring_to_front()
-
-            logbook.append(
-                LogEvent(
-                    ts=timestamp(),
-                    row_index=ctx.display_index,
-                    level="OK" if raw_result == "OK" else "ERROR",
-                    stage="CANCEL",
-                    idsbr=ctx.idsbr,
-                    nama=ctx.nama,
-                    match_value=match_value,
-                    note=result_note,
-                    screenshot=shot_path,
-                )
-            )
-            if raw_result == "OK":
-                ok_rows += 1
-            else:
-                error_rows += 1
-                if options.stop_on_error:
-                    break
-
-    logbook.save()
-    update_run_index(
-        logbook.path.parent.parent / "index.csv",
-        {
-            "run_id": config.run_id,
-            "started_at": config.run_started_at,
-            "command": "cancel",
-            "resume": "False",
-            "dry_run": "False",
-            "skip_status": str(config.skip_status),
-            "ok_rows": str(ok_rows),
-            "error_rows": str(error_rows),
-            "skipped_rows": "0",
-            "log_csv": str(logbook.path),
-            "log_html": str(logbook.report_path or ""),
-            "profile": config.profile_path or "",
-        },
-    )
+                if raw_result == "OK":
+                    ok_rows += 1
+                else:
+                    error_rows += 1
+                    if options.stop_on_error:
+                        break
+    finally:
+        if form_page is not None:
+            await close_page(form_page)
+        if pending_shots:
+            await asyncio.gather(*pending_shots, return_exceptions=True)
+        logbook.save()
+        update_run_index(
+            logbook.path.parent.parent / "index.csv",
+            {
+                "run_id": config.run_id,
+                "started_at": config.run_started_at,
+                "command": "cancel",
+                "resume": "False",
+                "dry_run": "False",
+                "skip_status": str(config.skip_status),
+                "ok_rows": str(ok_rows),
+                "error_rows": str(error_rows),
+                "skipped_rows": "0",
+                "log_csv": str(logbook.path),
+                "log_html": str(logbook.report_path or ""),
+                "profile": config.profile_path or "",
+            },
+        )
+
     _print_run_summary(ok_rows, error_rows, logbook, config)
 
     issues = logbook.recent_issues()
@@ -1,16 +1,25 @@
 from __future__ import annotations
 
 import json
+import os
 import re
 import shutil
+from collections.abc import Collection, Mapping, Sequence
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Literal, Mapping, Optional, Set
+from types import MappingProxyType
+from typing import Any, Dict, Literal, Optional, Set
 
 from .field_selectors import DEFAULT_PROFILE_FIELD_SELECTORS, DEFAULT_SELECT2_FIELD_SELECTORS
 from .utils import ensure_directory
 
+try:  # orjson lebih cepat untuk parsing; opsional (JSONDecodeError-nya turunan json.JSONDecodeError).
+    import orjson
+except ImportError:
+    orjson = None
+
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 ARTIFACTS_DIR = ensure_directory(BASE_DIR / "artifacts")
@@ -42,12 +51,14 @@ class RuntimeConfig:
     sheet_index: int = 0
     pause_after_edit_ms: int = 1000
     pause_after_submit_ms: int = 300
+    post_row_settle_ms: int = 0
     max_wait_ms: int = 6000
     slow_mode: bool = True
     step_delay_ms: int = 700
     verbose: bool = True
     close_browser_on_exit: bool = False
     skip_status: bool = False
+    force_scroll: bool = False
     status_id_map: Mapping[str, str] = field(default_factory=lambda: dict(DEFAULT_STATUS_ID_MAP))
     profile_field_selectors: Mapping[str, str] = field(default_factory=lambda: dict(DEFAULT_PROFILE_FIELD_SELECTORS))
     select2_field_selectors: Mapping[str, str] = field(default_factory=lambda: dict(DEFAULT_SELECT2_FIELD_SELECTORS))
@@ -89,6 +100,12 @@ class CancelOptions:
     start_row: Optional[int] = None
     end_row: Optional[int] = None
     stop_on_error: bool = False
+    reuse_form_tab: bool = False
+
+
+def _read_json(file_path: Path) -> Any:
+    data = file_path.read_bytes()
+    return orjson.loads(data) if orjson is not None else json.loads(data.decode("utf-8"))
 
 
 def load_status_map(path: str | Path | None) -> Dict[str, str]:
@@ -103,7 +120,7 @@ def load_status_map(path: str | Path | None) -> Dict[str, str]:
         raise FileNotFoundError(f"File status map tidak ditemukan: {file_path}")
 
     try:
-        raw = json.loads(file_path.read_text(encoding="utf-8"))
+        raw = _read_json(file_path)
     except json.JSONDecodeError as exc:
         raise RuntimeError(f"File status map tidak valid (JSON error): {exc}") from exc
 
@@ -119,7 +136,20 @@ def load_status_map(path: str | Path | None) -> Dict[str, str]:
     return merged
 
 
-def load_profile_defaults(path: str | None, allowed_keys: set[str]) -> Dict[str, Any]:
+def peek_profile_arg(argv: Sequence[str]) -> str | None:
+    """Ambil nilai ``--profile X``/``--profile=X`` dari argv tanpa membangun parser kedua (yang terakhir menang)."""
+    profile: str | None = None
+    for idx, arg in enumerate(argv):
+        if arg == "--":
+            break
+        if arg == "--profile" and idx + 1 < len(argv):
+            profile = argv[idx + 1]
+        elif arg.startswith("--profile="):
+            profile = arg.split("=", 1)[1]
+    return profile
+
+
+def load_profile_defaults(path: str | None, allowed_keys: Collection[str]) -> Dict[str, Any]:
     if not path:
         return {}
 
@@ -130,13 +160,7 @@ def load_profile_defaults(path: str | None, allowed_keys: set[str]) -> Dict[str,
     if not file_path.is_file():
         raise FileNotFoundError(f"File profil tidak ditemukan: {file_path}")
 
-    try:
-        raw = json.loads(file_path.read_text(encoding="utf-8"))
-    except json.JSONDecodeError as exc:
-        raise RuntimeError(f"File profil tidak valid (JSON error): {exc}") from exc
-
-    if not isinstance(raw, dict):
-        raise RuntimeError("File profil harus berupa objek/dictionary JSON.")
+    raw = _read_profile_file(str(file_path), file_path.stat().st_mtime_ns)
 
     unknown = [key for key in raw if key not in allowed_keys]
     if unknown:
@@ -146,6 +170,19 @@ def load_profile_defaults(path: str | None, allowed_keys: set[str]) -> Dict[str,
     return dict(raw)
 
 
+@lru_cache(maxsize=8)
+def _read_profile_file(file_path: str, mtime_ns: int) -> Mapping[str, Any]:
+    """Parse file profil sekali per (path, mtime); hasil berupa view read-only agar aman di-cache."""
+    try:
+        raw = _read_json(Path(file_path))
+    except json.JSONDecodeError as exc:
+        raise RuntimeError(f"File profil tidak valid (JSON error): {exc}") from exc
+
+    if not isinstance(raw, dict):
+        raise RuntimeError("File profil harus berupa objek/dictionary JSON.")
+    return MappingProxyType(raw)
+
+
 def _sanitize_run_id(candidate: str | None, fallback: str) -> str:
     if not candidate:
         return fallback
@@ -154,18 +191,24 @@ def _sanitize_run_id(candidate: str | None, fallback: str) -> str:
 
 
 def _prune_old_runs(base_dir: Path, keep: int, reserved: Set[str]) -> None:
-    if keep <= 0 or not base_dir.exists():
+    if keep <= 0:
+        return
+    # scandir: is_dir() memakai tipe dari listing dan stat() entry di-cache (di Windows tanpa syscall tambahan).
+    try:
+        with os.scandir(base_dir) as entries:
+            dirs = [entry for entry in entries if entry.is_dir()]
+    except OSError:
         return
-    dirs = [p for p in base_dir.iterdir() if p.is_dir()]
     if len(dirs) <= keep:
         return
-    dirs.sort(key=lambda p: p.stat().st_mtime)
+    dirs.sort(key=lambda entry: entry.stat().st_mtime)
     remaining = len(dirs)
-    for path in dirs:
+    for entry in dirs:
         if remaining <= keep:
             break
-        if path.name in reserved:
+        if entry.name in reserved:
             continue
+        path = Path(entry.path)
         try:
             shutil.rmtree(path, ignore_errors=True)
         except Exception:
@@ -1,13 +1,28 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import os
 import re
 from pathlib import Path
 from typing import Iterable, Sequence
 
 import pandas as pd
 
+try:  # orjson lebih cepat untuk (de)serialisasi cache; opsional.
+    import orjson
+except ImportError:
+    orjson = None
+
+try:  # python-calamine (Rust) jauh lebih cepat dari openpyxl; opsional.
+    import python_calamine  # noqa: F401
+except ImportError:
+    _CALAMINE_AVAILABLE = False
+else:
+    _CALAMINE_AVAILABLE = tuple(int(part) for part in pd.__version__.split(".")[:2]) >= (2, 2)
+
 from .config import ExcelSelection
-from .utils import format_candidates, norm_space
+from .utils import format_candidates, nonempty, norm_space, norm_space_series
 
 REQUIRED_COLUMNS_AUTOFILL = ("status", "email", "sumber", "catatan")
 REQUIRED_COLUMN_ALIASES: dict[str, tuple[str, ...]] = {
@@ -43,6 +58,24 @@ PROFILE_FIELD_KEYS = (
     "sumber_profiling",
     "catatan_profiling",
 )
+_WS_RE = re.compile(r"\s+")
+_KEY_COLUMNS = ("idsbr", "nama", "keberadaan_usaha", "status")
+# Kolom kanonik yang dirapikan spasinya sekali saat load (setara norm_space per sel).
+_TEXT_COLUMNS = tuple(COLUMN_ALIASES)
+# Alias yang boleh mengisi kolom kanonik per baris. idsbr_master (ID usaha induk) hanya dipakai untuk
+# deteksi kolom: idsbr yang kosong tetap kosong agar cancel --match-by idsbr tidak menyasar usaha induk.
+_FILL_ALIASES: dict[str, tuple[str, ...]] = {**COLUMN_ALIASES, "idsbr": ("idsbr",)}
+# Naikkan jika bentuk DataFrame hasil load_dataframe atau format cache berubah agar cache lama diabaikan.
+_CACHE_VERSION = 4
+
+
+def _default_cache_dir() -> Path:
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "sbr_automation" / "excel"
+
+
+# Cache hasil load_dataframe disimpan di folder cache aplikasi, bukan di samping file Excel pengguna.
+CACHE_DIR = _default_cache_dir()
 
 
 def resolve_excel(path_arg: str | None, search_dir: Path, sheet_index: int) -> ExcelSelection:
@@ -77,27 +110,180 @@ def resolve_excel(path_arg: str | None, search_dir: Path, sheet_index: int) -> E
     return ExcelSelection(path=candidates[0], sheet_index=sheet_index)
 
 
-def load_dataframe(selection: ExcelSelection, dtype: str | Sequence[str] | dict | None = str) -> pd.DataFrame:
-    """Load Excel with header cleaning and fallback for multi-row headers."""
-    def _clean_columns(df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
-        df.columns = [_clean_column_name(col) for col in df.columns]
+_slow_engine_warned = False
+
+
+def _read_excel(selection: ExcelSelection, dtype, **kwargs) -> pd.DataFrame:
+    global _slow_engine_warned
+    if _CALAMINE_AVAILABLE:
+        return pd.read_excel(
+            selection.path, sheet_name=selection.sheet_index, dtype=dtype, engine="calamine", **kwargs
+        )
+    if not _slow_engine_warned:
+        _slow_engine_warned = True
+        print("[Excel] python-calamine tidak tersedia; membaca Excel dengan openpyxl (lebih lambat).")
+    return pd.read_excel(selection.path, sheet_name=selection.sheet_index, dtype=dtype, **kwargs)
+
+
+def _digest(*parts: object) -> str:
+    return hashlib.blake2b("\0".join(map(str, parts)).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _cache_path(selection: ExcelSelection) -> Path | None:
+    """Lokasi cache untuk (file, sheet); kunci berisi ukuran + mtime_ns file sehingga file yang diganti
+    (termasuk salinan dengan mtime lebih lama) selalu dianggap berubah. None bila file tidak bisa di-stat."""
+    path = selection.path
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    prefix = f"{path.stem}-{_digest(path.resolve(), selection.sheet_index)}"
+    return CACHE_DIR / f"{prefix}-{_digest(stat.st_size, stat.st_mtime_ns, _CACHE_VERSION)}.json"
+
+
+def _read_cache(cache_path: Path | None) -> pd.DataFrame | None:
+    # JSON biasa (bukan pickle): isi cache tidak pernah dieksekusi, hanya kolom, dtype, dan nilai string.
+    if cache_path is None:
+        return None
+    try:
+        data = cache_path.read_bytes()
+        raw = orjson.loads(data) if orjson is not None else json.loads(data)
+        columns = zip(raw["dtypes"], raw["data"], strict=True)
+        df = pd.DataFrame(
+            {idx: pd.Series(values, dtype=dtype) for idx, (dtype, values) in enumerate(columns)},
+            index=pd.RangeIndex(raw["length"]),
+        )
+        df.columns = raw["columns"]
         return df
+    except Exception:  # noqa: BLE001 - cache hilang/rusak cukup dibaca ulang dari Excel
+        return None
+
+
+def _column_values(values: pd.Series) -> list:
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+def _write_cache(df: pd.DataFrame, cache_path: Path | None) -> None:
+    if cache_path is None:
+        return
+    payload = {
+        "columns": [str(col) for col in df.columns],
+        "dtypes": [str(dtype) for dtype in df.dtypes],
+        "length": len(df),
+        "data": [_column_values(df.iloc[:, idx]) for idx in range(df.shape[1])],
+    }
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        tmp_path.write_bytes(orjson.dumps(payload) if orjson is not None else json.dumps(payload).encode("utf-8"))
+        os.replace(tmp_path, cache_path)
+        # Versi lama untuk (file, sheet) yang sama tidak akan terpakai lagi.
+        prefix = cache_path.name.rsplit("-", 1)[0]
+        for stale in cache_path.parent.glob(f"{prefix}-*.json"):
+            if stale != cache_path:
+                stale.unlink(missing_ok=True)
+    except Exception:  # noqa: BLE001 - folder read-only dsb. tidak boleh menggagalkan run
+        pass
+
+
+def load_dataframe(selection: ExcelSelection, dtype: str | Sequence[str] | dict | None = str) -> pd.DataFrame:
+    """Load Excel with header cleaning and fallback for multi-row headers.
+
+    Hasil untuk dtype bawaan di-cache sebagai JSON di ``CACHE_DIR`` dan dipakai ulang selama file Excel
+    belum berubah (ukuran + mtime_ns), sehingga run berikutnya tidak mem-parsing XML lagi.
+    """
+    use_cache = dtype is str
+    cache_path = _cache_path(selection) if use_cache else None
+    if use_cache:
+        cached = _read_cache(cache_path)
+        if cached is not None:
+            return cached
 
-    df = pd.read_excel(selection.path, sheet_name=selection.sheet_index, dtype=dtype)
+    df = _read_excel(selection, dtype)
     df = _clean_columns(df)
 
     # If no key columns found (multi-row header), retry with header=1
-    key_candidates = ("idsbr", "nama", "keberadaan_usaha", "status")
-    if not any(has_column(df, key, aliases=COLUMN_ALIASES) for key in key_candidates):
-        alt = pd.read_excel(selection.path, sheet_name=selection.sheet_index, dtype=dtype, header=1)
+    if not _has_key_columns(df):
+        alt = _read_excel(selection, dtype, header=1)
         df = _clean_columns(alt)
 
+    df = _normalize_text_columns(_canonicalize_columns(df))
+    if use_cache:
+        _write_cache(df, cache_path)
+    return df
+
+
+def load_dataframe_window(
+    selection: ExcelSelection,
+    start: int | None,
+    end: int | None,
+    dtype: str | Sequence[str] | dict | None = str,
+) -> tuple[pd.DataFrame, int]:
+    """Baca hanya baris ``start``..``end`` (1-based, inklusif) tanpa mem-parsing seluruh sheet.
+
+    Kembalikan ``(df, start_idx)``; baris pertama ``df`` adalah baris ke-``start_idx`` (0-based)
+    pada sheet penuh, sama seperti hasil ``slice_rows``.
+    """
+    start_idx = 0 if start is None else max(start - 1, 0)
+    if start_idx == 0 and end is None:
+        return load_dataframe(selection, dtype), 0
+    if dtype is str:
+        cached = _read_cache(_cache_path(selection))
+        if cached is not None:
+            start_idx, end_idx = slice_rows(cached, start, end)
+            return cached.iloc[start_idx:end_idx].reset_index(drop=True), start_idx
+
+    header_row = 0 if _has_key_columns(_clean_columns(_read_excel(selection, dtype, nrows=0))) else 1
+    df = _read_excel(
+        selection,
+        dtype,
+        header=header_row,
+        skiprows=range(header_row + 1, header_row + 1 + start_idx),
+        nrows=None if end is None else max(end - start_idx, 0),
+    )
+    return _normalize_text_columns(_canonicalize_columns(_clean_columns(df))), start_idx
+
+
+def _clean_columns(df: pd.DataFrame) -> pd.DataFrame:
+    # DataFrame baru dari read_excel milik pemanggil sendiri, jadi cukup ganti nama kolom tanpa copy.
+    df.columns = [_clean_column_name(col) for col in df.columns]
+    return df
+
+
+def _has_key_columns(df: pd.DataFrame) -> bool:
+    return any(has_column(df, key, aliases=COLUMN_ALIASES) for key in _KEY_COLUMNS)
+
+
+def _canonicalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Isi kolom kanonik (nama, status, ...) dari alias pertama yang tidak kosong per baris.
+
+    Kolom alias tetap dipertahankan karena sebagian juga dipakai sebagai field Profiling.
+    Kolom ``idsbr`` tidak pernah diisi dari ``idsbr_master`` (lihat ``_FILL_ALIASES``).
+    """
+    for canonical, aliases in _FILL_ALIASES.items():
+        sources = [col for col in dict.fromkeys((canonical, *aliases)) if col in df.columns]
+        if not sources or sources == [canonical]:
+            continue
+        merged = df[sources[0]]
+        for col in sources[1:]:
+            merged = merged.where(merged.map(nonempty), df[col])
+        df[canonical] = merged
+    return df
+
+
+def _normalize_text_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Rapikan spasi dan ubah NaN menjadi "" untuk kolom kanonik secara tervektor."""
+    for col in _TEXT_COLUMNS:
+        if col in df.columns:
+            df[col] = (
+                df[col].astype("string").str.replace(_WS_RE, " ", regex=True).str.strip().fillna("").astype(object)
+            )
     return df
 
 
 def ensure_required_columns(df: pd.DataFrame, required: Iterable[str]) -> None:
-    missing = [col for col in required if col not in df.columns]
+    columns = frozenset(df.columns)
+    missing = [col for col in required if col not in columns]
     if missing:
         raise RuntimeError(f"Kolom wajib belum ada di Excel: {', '.join(missing)}")
 
@@ -112,6 +298,15 @@ def extract_profile_payload(df_row) -> dict[str, str]:
     return {key: norm_space(df_row.get(key)) for key in PROFILE_FIELD_KEYS}
 
 
+def extract_profile_payloads(df: pd.DataFrame) -> list[dict[str, str]]:
+    """Payload Profiling untuk semua baris sekaligus (normalisasi per kolom, bukan per baris)."""
+    normalized = pd.DataFrame(
+        {key: norm_space_series(df[key]) for key in PROFILE_FIELD_KEYS},
+        index=df.index,
+    )
+    return normalized.to_dict(orient="records")
+
+
 def slice_rows(df: pd.DataFrame, start: int | None, end: int | None) -> tuple[int, int]:
     start_idx = 0 if start is None else max(start - 1, 0)
     end_idx = len(df) if end is None else min(end, len(df))
@@ -125,10 +320,9 @@ def load_profile_payloads(
     end: int | None = None,
 ) -> list[dict[str, str]]:
     """Membaca Excel lalu mengembalikan list payload Profiling SBR per baris."""
-    df = load_dataframe(selection)
+    df, _ = load_dataframe_window(selection, start, end)
     ensure_profile_fields(df)
-    start_idx, end_idx = slice_rows(df, start, end)
-    return [extract_profile_payload(df.iloc[i]) for i in range(start_idx, end_idx)]
+    return extract_profile_payloads(df)
 
 
 def _clean_column_name(raw: object) -> str:
@@ -140,7 +334,7 @@ def _clean_column_name(raw: object) -> str:
     # Ambil baris pertama sebelum newline/penjelasan
     text = text.splitlines()[0]
     text = text.strip()
-    text = re.sub(r"\s+", "_", text)
+    text = _WS_RE.sub("_", text)
     text = text.strip("_")
     return text.lower()
 
@@ -156,9 +350,9 @@ def has_column(df: pd.DataFrame, name: str, *, aliases: dict[str, tuple[str, ...
 
 
 def ensure_required_with_aliases(df: pd.DataFrame, required: Iterable[str], aliases: dict[str, tuple[str, ...]]) -> None:
-    missing: list[str] = []
-    for base in required:
-        if not has_column(df, base, aliases=aliases):
-            missing.append(base)
+    columns = frozenset(df.columns)
+    missing = [
+        base for base in required if not any(cand in columns for cand in (base, *aliases.get(base, ())))
+    ]
     if missing:
         raise RuntimeError(f"Kolom wajib belum ada di Excel: {', '.join(missing)}")
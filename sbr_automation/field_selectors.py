@@ -1,9 +1,17 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Mapping
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict
 
+try:  # orjson lebih cepat untuk parsing; opsional.
+    import orjson
+except ImportError:
+    orjson = None
+
 
 DEFAULT_PROFILE_FIELD_SELECTORS: Dict[str, str] = {
     "nama_usaha_pembetulan": (
@@ -57,6 +65,9 @@ DEFAULT_PROFILE_FIELD_SELECTORS: Dict[str, str] = {
     "catatan_profiling": "#catatan_profiling, textarea#catatan_profiling, textarea[name='catatan_profiling']",
 }
 
+# Field yang berupa <select> biasa (bukan select2) pada markup bawaan.
+NATIVE_SELECT_KEYS = frozenset({"keberadaan_usaha", "jenis_kepemilikan_usaha", "bentuk_badan_hukum_usaha"})
+
 # select2-backed fields (klik span, ketik, Enter)
 DEFAULT_SELECT2_FIELD_SELECTORS: Dict[str, str] = {
     "kdprov_pindah": "#provinsi_pindah",
@@ -70,13 +81,41 @@ DEFAULT_SELECT2_FIELD_SELECTORS: Dict[str, str] = {
 }
 
 
-def load_field_selectors(path: str | Path | None) -> tuple[Dict[str, str], Dict[str, str]]:
-    """Load selector map (CSS/select2) from JSON; merge dengan default."""
-    profile = dict(DEFAULT_PROFILE_FIELD_SELECTORS)
-    select2 = dict(DEFAULT_SELECT2_FIELD_SELECTORS)
+@lru_cache(maxsize=256)
+def split_selectors(selector: str) -> tuple[str, ...]:
+    """Pecah selector CSS berkoma menjadi tuple; koma di dalam (), [] atau kutip diabaikan."""
+    stripped = selector.strip()
+    if stripped.startswith(("xpath=", "//", "text=")) or ">>" in stripped:
+        return (stripped,)
+    parts: list[str] = []
+    depth = 0
+    quote = ""
+    start = 0
+    for idx, ch in enumerate(selector):
+        if quote:
+            if ch == quote:
+                quote = ""
+        elif ch in "'\"":
+            quote = ch
+        elif ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(selector[start:idx].strip())
+            start = idx + 1
+    parts.append(selector[start:].strip())
+    return tuple(part for part in parts if part)
+
+
+_DEFAULT_PROFILE_VIEW: Mapping[str, str] = MappingProxyType(DEFAULT_PROFILE_FIELD_SELECTORS)
+_DEFAULT_SELECT2_VIEW: Mapping[str, str] = MappingProxyType(DEFAULT_SELECT2_FIELD_SELECTORS)
 
+
+def load_field_selectors(path: str | Path | None) -> tuple[Mapping[str, str], Mapping[str, str]]:
+    """Load selector map (CSS/select2) from JSON; merge dengan default. Hasil berupa view read-only."""
     if not path:
-        return profile, select2
+        return _DEFAULT_PROFILE_VIEW, _DEFAULT_SELECT2_VIEW
 
     file_path = Path(path).expanduser()
     if not file_path.is_absolute():
@@ -84,8 +123,20 @@ def load_field_selectors(path: str | Path | None) -> tuple[Dict[str, str], Dict[
     if not file_path.is_file():
         raise FileNotFoundError(f"File selector tidak ditemukan: {file_path}")
 
+    fields, select2_fields = _read_selector_file(str(file_path), file_path.stat().st_mtime_ns)
+    profile = {**DEFAULT_PROFILE_FIELD_SELECTORS, **dict(fields)}
+    select2 = {**DEFAULT_SELECT2_FIELD_SELECTORS, **dict(select2_fields)}
+    return MappingProxyType(profile), MappingProxyType(select2)
+
+
+@lru_cache(maxsize=8)
+def _read_selector_file(
+    file_path: str, mtime_ns: int
+) -> tuple[tuple[tuple[str, str], ...], tuple[tuple[str, str], ...]]:
+    """Parse file selector sekali per (path, mtime); hasil beku agar aman di-cache."""
+    data = Path(file_path).read_bytes()
     try:
-        raw = json.loads(file_path.read_text(encoding="utf-8"))
+        raw = orjson.loads(data) if orjson is not None else json.loads(data.decode("utf-8"))
     except json.JSONDecodeError as exc:
         raise RuntimeError(f"File selector tidak valid (JSON error): {exc}") from exc
 
@@ -95,6 +146,9 @@ def load_field_selectors(path: str | Path | None) -> tuple[Dict[str, str], Dict[
     raw_fields = raw.get("fields", {})
     raw_select2 = raw.get("select2", {})
 
+    profile: Dict[str, str] = {}
+    select2: Dict[str, str] = {}
+
     def _merge(source, target: Dict[str, str], label: str) -> None:
         if not source:
             return
@@ -108,4 +162,4 @@ def load_field_selectors(path: str | Path | None) -> tuple[Dict[str, str], Dict[
     _merge(raw_fields, profile, "fields")
     _merge(raw_select2, select2, "select2")
 
-    return profile, select2
+    return tuple(profile.items()), tuple(select2.items())
@@ -1,21 +1,161 @@
 from __future__ import annotations
 
+import asyncio
 import re
-from typing import Dict
+from collections.abc import Callable, Mapping
+from functools import lru_cache
+from typing import Literal
+from weakref import WeakKeyDictionary
 
-from playwright.async_api import Page
+from playwright.async_api import Locator, Page
 
 from .config import RuntimeConfig
 from .excel_loader import PROFILE_FIELD_KEYS
+from .field_selectors import NATIVE_SELECT_KEYS, split_selectors
 from .models import RowContext
 from .playwright_helpers import slow_pause
 from .utils import describe_exception, nonempty, norm_space, with_retry
 
+_RE_TEL = re.compile(r"^Nomor\s*Telepon$", re.I)
+_RE_WA = re.compile(r"Whatsapp", re.I)
+_RE_WEB = re.compile(r"Website", re.I)
+_RE_EMAIL = re.compile(r"^email$", re.I)
+_RE_LAT = re.compile(r"^latitude", re.I)
+_RE_LON = re.compile(r"^longitude", re.I)
+_RE_SUMBER = re.compile("Sumber Profiling", re.I)
+_RE_CHECK_BTN = re.compile("^check$", re.I)
+
+# Hapus semua karakter non-digit Latin-1 dalam satu pass str.translate.
+_NONDIGIT_DEL = str.maketrans("", "", "".join(chr(c) for c in range(256) if not chr(c).isdecimal()))
+
+
+def _xpath_literal(text: str) -> str:
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    parts = text.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
+
+
+@lru_cache(maxsize=64)
+def _status_label_xpath(status: str) -> str:
+    """XPath label yang memuat teks status (case-insensitive ASCII), tanpa regex."""
+    lowered = _xpath_literal(" ".join(status.split()).lower())
+    return (
+        "xpath=//label[contains(translate(normalize-space(.), "
+        f"'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), {lowered})]"
+    )
+
+
+# Locator Playwright bersifat lazy; cukup dibangun sekali per halaman lalu dipakai ulang.
+# Locator menyimpan referensi kuat ke Page-nya, jadi entri WeakKeyDictionary tidak akan pernah
+# terlepas sendiri; entri dibuang eksplisit saat halaman ditutup (tab form dibuka baru tiap baris).
+_LOC_CACHE: WeakKeyDictionary[Page, dict[str, Locator]] = WeakKeyDictionary()
+
+
+def _forget_page(page: Page) -> None:
+    _LOC_CACHE.pop(page, None)
+
+
+def _cached_locator(page: Page, key: str, build: Callable[[], Locator]) -> Locator:
+    cache = _LOC_CACHE.get(page)
+    if cache is None:
+        cache = _LOC_CACHE[page] = {}
+        once = getattr(page, "once", None)
+        if once is not None:
+            once("close", _forget_page)
+    loc = cache.get(key)
+    if loc is None:
+        loc = cache[key] = build()
+    return loc
+
+
+def _build_loc(page: Page, selector: str) -> Locator:
+    parts = split_selectors(selector) or (selector,)
+    target = page.locator(parts[0])
+    for part in parts[1:]:
+        target = target.or_(page.locator(part))
+    return target.first
+
+
+def _loc(page: Page, selector: str) -> Locator:
+    """`page.locator(selector).first` yang di-cache per halaman (selector berkoma dipecah jadi rantai `or_`)."""
+    return _cached_locator(page, selector, lambda: _build_loc(page, selector))
+
+
+def _normalize_wa(raw: str) -> tuple[str, str]:
+    """Return (+62-prefixed, subscriber-only)."""
+    subscriber = (raw or "").translate(_NONDIGIT_DEL)
+    if subscriber and not subscriber.isdecimal():
+        # Sisa karakter di luar Latin-1 (jarang); saring manual.
+        subscriber = "".join(ch for ch in subscriber if ch.isdecimal())
+    if not subscriber:
+        return "", ""
+    if subscriber.startswith("62"):
+        subscriber = subscriber[2:]
+    elif subscriber.startswith("0"):
+        subscriber = subscriber[1:]
+    formatted = f"+62-{subscriber}" if subscriber else ""
+    return formatted, subscriber
+
 
 def _form_log(message: str) -> None:
     print(f"    [Form] {message}")
 
 
+# Cek tag + set value + dispatch event dalam satu round-trip. "unchanged" berarti nilai sudah sama;
+# hasil selain itu dan "select"/"input"/"textarea" (missing/hidden/nomatch/error) berarti jalur
+# lambat berbasis Locator yang dipakai.
+_FAST_SET_JS = """
+([sel, v]) => {
+    let el;
+    try { el = document.querySelector(sel); } catch (e) { return 'error'; }
+    if (!el) return 'missing';
+    if (!(el.offsetParent || el.getClientRects().length)) return 'hidden';
+    const tag = (el.tagName || '').toLowerCase();
+    if (tag !== 'select' && tag !== 'input' && tag !== 'textarea') return 'error';
+    if (el.disabled || el.readOnly) return 'error';
+    if ((el.value || '').trim() === v.trim()) return 'unchanged';
+    if (tag === 'select' && !Array.from(el.options).some((o) => o.value === v)) return 'nomatch';
+    el.scrollIntoView({ block: 'center' });
+    el.focus();
+    el.value = v;
+    el.dispatchEvent(new Event('input', { bubbles: true }));
+    el.dispatchEvent(new Event('change', { bubbles: true }));
+    return tag;
+}
+"""
+
+
+_DISPATCH_INPUT_CHANGE_JS = """
+(sel) => {
+    const el = document.querySelector(sel);
+    if (el) {
+        el.dispatchEvent(new Event('input', { bubbles: true }));
+        el.dispatchEvent(new Event('change', { bubbles: true }));
+    }
+}
+"""
+
+_EMAIL_READ_JS = """
+() => {
+    const inp = document.querySelector('input#email, input[name="email"], input[type="email"]');
+    return inp ? (inp.value || '').trim() : '';
+}
+"""
+
+_FAST_SET_OK = frozenset({"select", "input", "textarea"})
+_TAG_AND_VALUE_JS = "(el) => ({ tag: (el.tagName || '').toLowerCase(), cur: el.value || '' })"
+
+
+async def _fast_set(page: Page, selector: str, value: str) -> str:
+    try:
+        return str(await page.evaluate(_FAST_SET_JS, [selector, value]))
+    except Exception:
+        return "error"
+
+
 async def update_field(
     page: Page,
     selector: str,
@@ -24,8 +164,15 @@ async def update_field(
     logger=None,
     *,
     timeout: int = 4000,
+    force_scroll: bool = False,
+    locator: Locator | None = None,
+    kind: Literal["input", "select"] | None = None,
+    fast_result: str | None = None,
 ) -> tuple[bool, str]:
-    """Isi field hanya jika Excel memiliki nilai."""
+    """Isi field hanya jika Excel memiliki nilai.
+
+    `fast_result` berisi hasil `_fast_set` yang sudah dijalankan sebelumnya (mis. secara paralel).
+    """
     if not nonempty(value):
         msg = f"Skip {field_name} (Excel kosong)"
         if logger:
@@ -34,20 +181,40 @@ async def update_field(
             _form_log(f"{msg}.")
         return False, "skip"
 
+    text = str(value)
     try:
-        target = page.locator(selector).first
-        await target.wait_for(state="visible", timeout=timeout)
-        await target.scroll_into_view_if_needed()
-        tag_name = ""
-        try:
-            tag_name = (await target.evaluate("(el) => (el.tagName || '').toLowerCase()")) or ""
-        except Exception:
-            tag_name = ""
-
-        if tag_name == "select":
-            await target.select_option(str(value))
-        else:
-            await target.fill(str(value))
+        fast = fast_result if fast_result is not None else await _fast_set(page, selector, text)
+        if fast not in _FAST_SET_OK and fast != "unchanged":
+            target = locator if locator is not None else _loc(page, selector)
+            await target.wait_for(state="visible", timeout=timeout)
+            if force_scroll:
+                # fill()/select_option() sudah auto-scroll; scroll eksplisit hanya untuk halaman bermasalah.
+                await target.scroll_into_view_if_needed()
+            # Jenis elemen yang sudah diketahui (dari konfigurasi atau hasil "nomatch") tidak perlu diprobe.
+            tag_name = "select" if fast == "nomatch" else (kind or "")
+            if not tag_name:
+                state: dict = {}
+                try:
+                    state = (await target.evaluate(_TAG_AND_VALUE_JS)) or {}
+                except Exception:
+                    state = {}
+                if str(state.get("cur", "")).strip() == text.strip():
+                    fast = "unchanged"
+                tag_name = str(state.get("tag", ""))
+
+            if fast == "unchanged":
+                pass
+            elif tag_name == "select":
+                await target.select_option(text)
+            else:
+                await target.fill(text)
+        if fast == "unchanged":
+            msg = f"Tetap {field_name} (nilai sama): {value}"
+            if logger:
+                logger.info(msg)
+            else:
+                _form_log(msg)
+            return True, "unchanged"
         msg = f"Update {field_name}: {value}"
         if logger:
             logger.info(msg)
@@ -70,6 +237,7 @@ async def update_select2_field(
     field_name: str,
     *,
     timeout: int = 5000,
+    locator: Locator | None = None,
 ) -> tuple[bool, str]:
     """Isi select2 (single) dengan cara klik selection, ketik nilai, Enter."""
     if not nonempty(value):
@@ -77,7 +245,7 @@ async def update_select2_field(
         return False, "skip"
 
     try:
-        select_loc = page.locator(select_selector).first
+        select_loc = locator if locator is not None else _loc(page, select_selector)
         await select_loc.wait_for(state="attached", timeout=timeout)
 
         # Coba select_option langsung jika select bukan select2 tersembunyi
@@ -99,13 +267,17 @@ async def update_select2_field(
 
         async def _do_select2():
             await selection.click()
-            search = page.locator("input.select2-search__field").first
+            search = _loc(page, "input.select2-search__field")
             await search.wait_for(state="visible", timeout=timeout)
             await search.fill("")
             await search.type(val_text)
             await page.keyboard.press("Enter")
 
         await with_retry(_do_select2, attempts=3, delay_ms=120, backoff=1.4)
+        try:
+            await page.wait_for_function("() => !document.querySelector('.select2-container--open')", timeout=1500)
+        except Exception:
+            pass
         _form_log(f"Update {field_name} (select2): {val_text}")
         return True, "updated"
     except Exception as exc:  # noqa: BLE001
@@ -130,9 +302,10 @@ async def _apply_status(page: Page, ctx: RowContext, config: RuntimeConfig) -> N
         except Exception as exc:  # noqa: BLE001
             _form_log(f"Gagal set status '{ctx.status}': {describe_exception(exc)}")
     else:
-        lbl = page.locator("label").filter(has_text=re.compile(re.escape(ctx.status), re.I)).first
+        lbl = page.locator(_status_label_xpath(ctx.status)).first
         try:
-            await lbl.wait_for(state="visible", timeout=4000)
+            # .check()/.click() sudah auto-wait; cukup pastikan label ada.
+            await lbl.wait_for(state="attached", timeout=800)
             target_id = await lbl.get_attribute("for")
             if target_id:
                 await page.locator(f"#{target_id}").check()
@@ -157,105 +330,151 @@ async def _focus_identitas_section(page: Page) -> None:
         _form_log(f"Gagal memfokus bagian Identitas: {describe_exception(exc)}")
 
 
-async def _fill_phone(page: Page, phone: str) -> None:
+# Satu evaluate untuk membaca keberadaan/nilai/visibilitas semua input Identitas sekaligus.
+_IDENTITAS_PROBE_JS = """
+() => {
+    const q = (s) => document.querySelector(s);
+    const r = (el) => el
+        ? { exists: true, value: (el.value || '').trim(), visible: !!(el.offsetParent || el.getClientRects().length) }
+        : { exists: false, value: '', visible: false };
+    return {
+        phone: r(q("input#nomor_telepon, input[name='nomor_telepon'], input[name='no_telp'], input[name='telepon']")),
+        wa: r(q("input#whatsapp, input[name='whatsapp'], input[name='nomor_whatsapp'], input[name='no_whatsapp']")),
+        website: r(q("input#website, input[name='website']")),
+        email: r(q("input#email, input[name='email'], input[type='email']")),
+        email_check: r(q('#check-email')),
+        lat: r(q("input#latitude, input[name='latitude']")),
+        lon: r(q("input#longitude, input[name='longitude']")),
+    };
+}
+"""
+
+
+async def _probe_identitas(page: Page) -> dict[str, dict]:
+    try:
+        return (await page.evaluate(_IDENTITAS_PROBE_JS)) or {}
+    except Exception as exc:  # noqa: BLE001
+        _form_log(f"Probe Identitas gagal, memakai jalur lambat: {describe_exception(exc)}")
+        return {}
+
+
+async def _ensure_visible(target: Locator, snap: dict | None, timeout: int) -> None:
+    """Lewati wait_for jika probe sudah melihat field tampil."""
+    if snap and snap.get("visible"):
+        return
+    await target.wait_for(state="visible", timeout=timeout)
+
+
+async def _fill_phone(page: Page, phone: str, snap: dict | None = None) -> None:
     try:
-        tel_input = (
-            page.get_by_placeholder(re.compile(r"^Nomor\s*Telepon$", re.I))
+        tel_input = _cached_locator(
+            page,
+            "identitas:phone",
+            lambda: page.get_by_placeholder(_RE_TEL)
             .or_(page.locator("input#nomor_telepon, input[name='nomor_telepon'], input[name='no_telp'], input[name='telepon']"))
-        ).first
-        await tel_input.wait_for(state="visible", timeout=3000)
-        if nonempty(phone):
-            await tel_input.fill("")
-            await tel_input.fill(phone)
-            _form_log(f"Nomor telepon diisi: {phone}")
-        else:
+            .first,
+        )
+        if not nonempty(phone):
             _form_log("Nomor telepon dilewati (Excel kosong).")
+            return
+        if snap and snap.get("value") == phone:
+            _form_log(f"Nomor telepon sudah sesuai: {phone}")
+            return
+        await _ensure_visible(tel_input, snap, 3000)
+        await tel_input.fill(phone)
+        _form_log(f"Nomor telepon diisi: {phone}")
     except Exception as exc:  # noqa: BLE001
         _form_log(f"Pengisian nomor telepon bermasalah: {describe_exception(exc)}")
 
 
-async def _fill_whatsapp(page: Page, whatsapp: str) -> None:
-    def _normalize_wa(raw: str) -> tuple[str, str]:
-        """Return (+62-prefixed, subscriber-only)."""
-        digits = re.findall(r"\d", raw or "")
-        if not digits:
-            return "", ""
-        if digits[:2] == ["6", "2"]:
-            digits = digits[2:]
-        elif digits[:1] == ["0"]:
-            digits = digits[1:]
-        subscriber = "".join(digits)
-        formatted = f"+62-{subscriber}" if subscriber else ""
-        return formatted, subscriber
-
+async def _fill_whatsapp(page: Page, whatsapp: str, snap: dict | None = None) -> None:
     try:
-        wa_input = (
-            page.get_by_placeholder(re.compile(r"Whatsapp", re.I))
+        wa_input = _cached_locator(
+            page,
+            "identitas:wa",
+            lambda: page.get_by_placeholder(_RE_WA)
             .or_(page.locator("input#whatsapp, input[name='whatsapp'], input[name='nomor_whatsapp'], input[name='no_whatsapp']"))
-        ).first
-        await wa_input.wait_for(state="visible", timeout=3000)
-        if nonempty(whatsapp):
-            formatted, subscriber = _normalize_wa(whatsapp)
-            if not formatted:
-                _form_log("Nomor WhatsApp kosong setelah normalisasi; dilewati.")
-                return
+            .first,
+        )
+        if not nonempty(whatsapp):
+            _form_log("Nomor WhatsApp dilewati (Excel kosong).")
+            return
+        formatted, subscriber = _normalize_wa(whatsapp)
+        if not formatted:
+            _form_log("Nomor WhatsApp kosong setelah normalisasi; dilewati.")
+            return
+        await _ensure_visible(wa_input, snap, 3000)
+        if snap and snap.get("exists"):
+            existing = snap.get("value") or ""
+        else:
             try:
                 existing = (await wa_input.input_value()) or ""
             except Exception:
                 existing = ""
-            fill_value = formatted
-            # Jika input sudah menyediakan prefix +62- tetap, isi hanya nomor sisanya.
-            if existing.strip().startswith("+62-"):
-                fill_value = subscriber
-            await wa_input.fill("")
-            await wa_input.fill(fill_value)
-            _form_log(f"Nomor WhatsApp diisi: {formatted}")
-        else:
-            _form_log("Nomor WhatsApp dilewati (Excel kosong).")
+        existing = existing.strip()
+        if existing == formatted:
+            _form_log(f"Nomor WhatsApp sudah sesuai: {formatted}")
+            return
+        fill_value = formatted
+        # Jika input sudah menyediakan prefix +62- tetap, isi hanya nomor sisanya.
+        if existing.startswith("+62-"):
+            fill_value = subscriber
+        await wa_input.fill(fill_value)
+        _form_log(f"Nomor WhatsApp diisi: {formatted}")
     except Exception as exc:  # noqa: BLE001
         _form_log(f"Pengisian nomor WhatsApp bermasalah: {describe_exception(exc)}")
 
 
-async def _fill_website(page: Page, website: str) -> None:
+async def _fill_website(page: Page, website: str, snap: dict | None = None) -> None:
     try:
-        web_input = (
-            page.get_by_placeholder(re.compile(r"Website", re.I))
-            .or_(page.locator("input#website, input[name='website']"))
-        ).first
-        await web_input.wait_for(state="visible", timeout=3000)
-        if nonempty(website):
-            await web_input.fill("")
-            await web_input.fill(website)
-            _form_log(f"Website diisi: {website}")
-        else:
+        web_input = _cached_locator(
+            page,
+            "identitas:website",
+            lambda: page.get_by_placeholder(_RE_WEB).or_(page.locator("input#website, input[name='website']")).first,
+        )
+        if not nonempty(website):
             _form_log("Website dilewati (Excel kosong).")
+            return
+        if snap and snap.get("value") == website:
+            _form_log(f"Website sudah sesuai: {website}")
+            return
+        await _ensure_visible(web_input, snap, 3000)
+        await web_input.fill(website)
+        _form_log(f"Website diisi: {website}")
     except Exception as exc:  # noqa: BLE001
         _form_log(f"Pengisian website bermasalah: {describe_exception(exc)}")
 
 
-async def _fill_email(page: Page, ctx: RowContext) -> None:
+async def _fill_email(page: Page, ctx: RowContext, probe: dict[str, dict] | None = None) -> None:
     try:
-        cb_email = page.locator("#check-email").first
-        cb_exists = await cb_email.count() > 0
-        if cb_exists:
-            await cb_email.wait_for(state="attached", timeout=500)
-
-        email_input = (
-            page.locator("input#email, input[name='email'], input[type='email']")
-            .or_(page.get_by_placeholder(re.compile(r"^email$", re.I)))
-        ).first
-
-        web_state = await page.evaluate(
-            """
-            () => {
-                const inp = document.querySelector('input#email, input[name="email"], input[type="email"]');
-                return inp ? (inp.value || '').trim() : '';
-            }
-            """
+        cb_email = _loc(page, "#check-email")
+        cb_snap = (probe or {}).get("email_check")
+        if cb_snap is not None:
+            cb_exists = bool(cb_snap.get("exists"))
+        else:
+            cb_exists = await cb_email.count() > 0
+            if cb_exists:
+                await cb_email.wait_for(state="attached", timeout=500)
+
+        email_input = _cached_locator(
+            page,
+            "identitas:email",
+            lambda: page.locator("input#email, input[name='email'], input[type='email']")
+            .or_(page.get_by_placeholder(_RE_EMAIL))
+            .first,
         )
-        web_value = web_state.strip()
+
+        email_snap = (probe or {}).get("email")
+        if email_snap is not None:
+            web_value = email_snap.get("value") or ""
+        else:
+            web_state = await page.evaluate(_EMAIL_READ_JS)
+            web_value = web_state.strip()
 
         if nonempty(ctx.email):
+            if web_value == ctx.email:
+                _form_log(f"Email sudah sesuai: {ctx.email}")
+                return
             try:
                 if cb_exists:
                     try:
@@ -264,7 +483,6 @@ async def _fill_email(page: Page, ctx: RowContext) -> None:
                     except Exception:
                         await cb_email.click(force=True)
                 await email_input.wait_for(state="visible", timeout=400)
-                await email_input.fill("")
                 await email_input.fill(ctx.email)
                 _form_log(f"Email diisi: {ctx.email}")
             except Exception as exc:  # noqa: BLE001
@@ -292,32 +510,41 @@ async def _fill_email(page: Page, ctx: RowContext) -> None:
         _form_log(f"Pengelolaan email bermasalah: {describe_exception(exc)}")
 
 
-async def _fill_coordinates(page: Page, ctx: RowContext) -> None:
+async def _fill_coordinates(page: Page, ctx: RowContext, probe: dict[str, dict] | None = None) -> None:
+    probe = probe or {}
     if ctx.latitude:
+        lat_snap = probe.get("lat")
         try:
-            lat_input = (
-                page.locator("input#latitude, input[name='latitude']")
-                .or_(page.get_by_placeholder(re.compile(r"^latitude", re.I)))
-            ).first
-            await lat_input.wait_for(state="visible", timeout=1500)
-            await lat_input.fill("")
-            await lat_input.fill(ctx.latitude)
-            _form_log(f"Latitude diisi: {ctx.latitude}")
+            if lat_snap and lat_snap.get("value") == ctx.latitude:
+                _form_log(f"Latitude sudah sesuai: {ctx.latitude}")
+            else:
+                lat_input = _cached_locator(
+                    page,
+                    "identitas:lat",
+                    lambda: page.locator("input#latitude, input[name='latitude']").or_(page.get_by_placeholder(_RE_LAT)).first,
+                )
+                await _ensure_visible(lat_input, lat_snap, 1500)
+                await lat_input.fill(ctx.latitude)
+                _form_log(f"Latitude diisi: {ctx.latitude}")
         except Exception as exc:  # noqa: BLE001
             _form_log(f"Gagal mengisi latitude: {describe_exception(exc)}")
     else:
         _form_log("Latitude dilewati.")
 
     if ctx.longitude:
+        lon_snap = probe.get("lon")
         try:
-            lon_input = (
-                page.locator("input#longitude, input[name='longitude']")
-                .or_(page.get_by_placeholder(re.compile(r"^longitude", re.I)))
-            ).first
-            await lon_input.wait_for(state="visible", timeout=1500)
-            await lon_input.fill("")
-            await lon_input.fill(ctx.longitude)
-            _form_log(f"Longitude diisi: {ctx.longitude}")
+            if lon_snap and lon_snap.get("value") == ctx.longitude:
+                _form_log(f"Longitude sudah sesuai: {ctx.longitude}")
+            else:
+                lon_input = _cached_locator(
+                    page,
+                    "identitas:lon",
+                    lambda: page.locator("input#longitude, input[name='longitude']").or_(page.get_by_placeholder(_RE_LON)).first,
+                )
+                await _ensure_visible(lon_input, lon_snap, 1500)
+                await lon_input.fill(ctx.longitude)
+                _form_log(f"Longitude diisi: {ctx.longitude}")
         except Exception as exc:  # noqa: BLE001
             _form_log(f"Gagal mengisi longitude: {describe_exception(exc)}")
     else:
@@ -325,82 +552,153 @@ async def _fill_coordinates(page: Page, ctx: RowContext) -> None:
 
 
 async def _fill_identitas_section(page: Page, ctx: RowContext) -> None:
-    await _focus_identitas_section(page)
-    await _fill_phone(page, ctx.phone)
-    await _fill_whatsapp(page, ctx.whatsapp)
-    await _fill_website(page, ctx.website)
-    await _fill_email(page, ctx)
-    await _fill_coordinates(page, ctx)
+    # Scroll dan probe tidak saling bergantung, jadi dijalankan bersamaan. Pengisian tetap berurutan:
+    # Locator.fill memfokus elemen lalu mengetik ke elemen yang sedang fokus, sehingga fill paralel
+    # bisa salah sasaran.
+    _, probe = await asyncio.gather(_focus_identitas_section(page), _probe_identitas(page))
+    await _fill_phone(page, ctx.phone, probe.get("phone"))
+    await _fill_whatsapp(page, ctx.whatsapp, probe.get("wa"))
+    await _fill_website(page, ctx.website, probe.get("website"))
+    await _fill_email(page, ctx, probe)
+    await _fill_coordinates(page, ctx, probe)
+
+
+# Isi Sumber + Catatan sekaligus dalam satu round-trip; field yang tidak ketemu/tidak tampil
+# dikembalikan false dan diisi lewat jalur Locator biasa.
+_ADDITIONAL_SET_JS = """
+(payload) => {
+    const fields = {
+        sumber: "input[placeholder*='Sumber Profiling' i], textarea[placeholder*='Sumber Profiling' i]",
+        catatan: '#catatan_profiling',
+    };
+    const done = {};
+    for (const [key, sel] of Object.entries(fields)) {
+        const val = payload[key];
+        if (val == null) continue;
+        const el = document.querySelector(sel);
+        if (!el || el.disabled || el.readOnly || !(el.offsetParent || el.getClientRects().length)) {
+            done[key] = false;
+            continue;
+        }
+        el.value = val;
+        el.dispatchEvent(new Event('input', { bubbles: true }));
+        el.dispatchEvent(new Event('change', { bubbles: true }));
+        done[key] = true;
+    }
+    return done;
+}
+"""
 
 
 async def _fill_additional_fields(page: Page, ctx: RowContext, config: RuntimeConfig) -> dict[str, object]:
     updated = 0
     errors: list[str] = []
+    has_sumber = nonempty(ctx.sumber)
+    has_catatan = nonempty(ctx.catatan)
 
-    if nonempty(ctx.sumber):
+    done: dict = {}
+    if has_sumber or has_catatan:
         try:
-            await page.get_by_placeholder(re.compile("Sumber Profiling", re.I)).fill(ctx.sumber)
+            done = (
+                await page.evaluate(
+                    _ADDITIONAL_SET_JS,
+                    {"sumber": ctx.sumber if has_sumber else None, "catatan": ctx.catatan if has_catatan else None},
+                )
+            ) or {}
+        except Exception:
+            done = {}
+
+    if has_sumber and done.get("sumber"):
+        _form_log(f"Sumber Profiling diisi: {ctx.sumber}")
+        updated += 1
+    elif has_sumber:
+        try:
+            await page.get_by_placeholder(_RE_SUMBER).fill(ctx.sumber)
             _form_log(f"Sumber Profiling diisi: {ctx.sumber}")
             updated += 1
         except Exception as exc:  # noqa: BLE001
             errors.append(f"sumber_profiling: {describe_exception(exc)}")
             _form_log(f"Field Sumber Profiling tidak ditemukan: {describe_exception(exc)}")
-        await slow_pause(page, config)
     else:
         _form_log("Sumber Profiling dilewati (Excel kosong).")
 
-    if nonempty(ctx.catatan):
+    if has_catatan and done.get("catatan"):
+        _form_log(f"Catatan diisi ({len(ctx.catatan)} karakter).")
+        updated += 1
+    elif has_catatan:
         try:
             await page.wait_for_selector("#catatan_profiling", state="visible", timeout=3000)
             await page.fill("#catatan_profiling", ctx.catatan)
-            await page.evaluate(
-                """
-                () => {
-                    const el = document.querySelector('#catatan_profiling');
-                    if (el) {
-                        el.dispatchEvent(new Event('input', { bubbles: true }));
-                        el.dispatchEvent(new Event('change', { bubbles: true }));
-                    }
-                }
-                """
-            )
+            await page.evaluate(_DISPATCH_INPUT_CHANGE_JS, "#catatan_profiling")
             _form_log(f"Catatan diisi ({len(ctx.catatan)} karakter).")
             updated += 1
         except Exception as exc:  # noqa: BLE001
             errors.append(f"catatan_profiling: {describe_exception(exc)}")
             _form_log(f"Gagal mengisi catatan: {describe_exception(exc)}")
-        await slow_pause(page, config)
     else:
         _form_log("Catatan Profiling dilewati (Excel kosong).")
 
+    if updated or errors:
+        await slow_pause(page, config)
     return {"updated": updated, "errors": errors}
 
 
+_ERROR_HINT_SELECTORS = (
+    ".swal2-popup .swal2-html-container, .swal2-popup .swal2-title",
+    "div.modal.show .modal-body, div[role='dialog'].show .modal-body",
+    ".alert-danger, .alert-warning, .alert-error, .text-danger, .invalid-feedback, .help-block",
+    ".toast, .toast-body, .toast-message",
+)
+
+# Semua selector diperiksa dalam satu round-trip; dedup + trim dilakukan di browser.
+_ERROR_HINTS_JS = """
+(sels) => {
+    const out = [];
+    const seen = new Set();
+    for (const s of sels) {
+        let nodes = [];
+        try { nodes = document.querySelectorAll(s); } catch (e) { continue; }
+        for (const el of nodes) {
+            const t = (el.textContent || '').replace(/\\s+/g, ' ').trim();
+            if (t && !seen.has(t)) {
+                seen.add(t);
+                out.push(t);
+                if (out.length >= 5) return out;
+            }
+        }
+    }
+    return out;
+}
+"""
+
+
 async def collect_error_hints(page: Page) -> list[str]:
-    selectors = [
-        ".swal2-popup .swal2-html-container, .swal2-popup .swal2-title",
-        "div.modal.show .modal-body, div[role='dialog'].show .modal-body",
-        ".alert-danger, .alert-warning, .alert-error, .text-danger, .invalid-feedback, .help-block",
-        ".toast, .toast-body, .toast-message",
-    ]
-    hints: list[str] = []
-    for selector in selectors:
-        try:
-            texts = await page.locator(selector).all_text_contents()
-        except Exception:
-            continue
-        for text in texts:
-            cleaned = norm_space(text)
-            if cleaned and cleaned not in hints:
-                hints.append(cleaned)
-    return hints[:5]
+    try:
+        hints = await page.evaluate(_ERROR_HINTS_JS, list(_ERROR_HINT_SELECTORS))
+    except Exception:
+        return []
+    return [str(hint) for hint in hints or []][:5]
+
+
+# Berhenti menunggu begitu modal konfirmasi ATAU popup error muncul, bukan menunggu timeout penuh.
+_IDSBR_MODAL_OR_ERROR_JS = """
+() => {
+    const shown = (el) => !!el && !!(el.offsetParent || el.getClientRects().length);
+    const modal = document.querySelector(
+        "div.modal.show, div[role='dialog'].show, .modal.show, #container-check-idsbr-modal"
+    );
+    if (shown(modal) || shown(document.querySelector('#accept-idsbr'))) return 'modal';
+    if (shown(document.querySelector('.swal2-popup, .toast.show'))) return 'error popup';
+    return false;
+}
+"""
 
 
 async def _check_and_accept_idsbr_master(page: Page, config: RuntimeConfig) -> tuple[bool, str]:
     try:
         btn = (
             page.locator("#button-check-idsbr, button#button-check-idsbr")
-            .or_(page.get_by_role("button", name=re.compile("^check$", re.I)))
+            .or_(page.get_by_role("button", name=_RE_CHECK_BTN))
         ).first
         await btn.wait_for(state="visible", timeout=4000)
         await btn.click(force=True)
@@ -414,14 +712,14 @@ async def _check_and_accept_idsbr_master(page: Page, config: RuntimeConfig) -> t
         "div.modal.show, div[role='dialog'].show, .modal.show, #container-check-idsbr-modal"
     ).first
     try:
-        await modal.wait_for(state="visible", timeout=max(config.max_wait_ms, 3500))
+        outcome = await (
+            await page.wait_for_function(_IDSBR_MODAL_OR_ERROR_JS, timeout=max(config.max_wait_ms, 3500))
+        ).json_value()
     except Exception as exc:  # noqa: BLE001
-        try:
-            await page.wait_for_selector("#accept-idsbr", timeout=1800)
-        except Exception:
-            pass
+        outcome = f"timeout ({describe_exception(exc)})"
+    if outcome != "modal":
         hints = await collect_error_hints(page)
-        detail = f"Modal konfirmasi IDSBR tidak muncul: {describe_exception(exc)}"
+        detail = f"Modal konfirmasi IDSBR tidak muncul: {outcome}"
         if hints:
             detail += f" | Petunjuk: {', '.join(hints)}"
         return False, detail
@@ -429,7 +727,6 @@ async def _check_and_accept_idsbr_master(page: Page, config: RuntimeConfig) -> t
     try:
         accept_btn = modal.locator("#accept-idsbr, button#accept-idsbr, [data-bs-dismiss][id*='accept']").first
         await accept_btn.wait_for(state="visible", timeout=4000)
-        await accept_btn.scroll_into_view_if_needed(timeout=1500)
         await accept_btn.click(force=True)
         print("    [IDSBR] Konfirmasi Accept ditekan.")
     except Exception as exc:  # noqa: BLE001
@@ -451,6 +748,7 @@ async def _check_and_accept_idsbr_master(page: Page, config: RuntimeConfig) -> t
 async def _handle_idsbr_master(page: Page, ctx: RowContext, config: RuntimeConfig) -> dict[str, object]:
     updated = 0
     skipped = 0
+    unchanged = 0
     errors: list[str] = []
 
     idsbr_master = norm_space(ctx.profiling_payload.get("idsbr_master"))
@@ -472,11 +770,15 @@ async def _handle_idsbr_master(page: Page, ctx: RowContext, config: RuntimeConfi
         _form_log("[IDSBR] Selector idsbr_master tidak ditemukan di konfigurasi.")
         return {"updated": updated, "skipped": skipped, "errors": errors}
 
-    success, state = await update_field(page, selector, idsbr_master, "idsbr_master", None)
+    success, state = await update_field(
+        page, selector, idsbr_master, "idsbr_master", None, force_scroll=config.force_scroll
+    )
     if state == "skip":
         skipped += 1
         return {"updated": updated, "skipped": skipped, "errors": errors}
-    if success:
+    if state == "unchanged":
+        unchanged += 1
+    elif success:
         updated += 1
     else:
         errors.append("idsbr_master: gagal mengisi field.")
@@ -486,7 +788,7 @@ async def _handle_idsbr_master(page: Page, ctx: RowContext, config: RuntimeConfi
 
     if not status_duplikat:
         _form_log("[IDSBR] Status bukan Duplikat; konfirmasi IDSBR Master dilewati.")
-        return {"updated": updated, "skipped": skipped, "errors": errors}
+        return {"updated": updated, "skipped": skipped, "unchanged": unchanged, "errors": errors}
 
     ok, detail = await _check_and_accept_idsbr_master(page, config)
     if ok:
@@ -494,28 +796,59 @@ async def _handle_idsbr_master(page: Page, ctx: RowContext, config: RuntimeConfi
     else:
         errors.append(detail)
 
-    return {"updated": updated, "skipped": skipped, "errors": errors}
+    return {"updated": updated, "skipped": skipped, "unchanged": unchanged, "errors": errors}
+
+
+# Field identitas/tambahan diisi oleh helper khusus; keberadaan_usaha selalu dilewati (dihitung skip).
+_PROFILE_HANDLED_ELSEWHERE = frozenset(
+    {"nomor_telepon", "nomor_whatsapp", "website", "sumber_profiling", "catatan_profiling"}
+)
+_PROFILE_SKIPPED_KEYS = frozenset({"keberadaan_usaha"})
+_PROFILE_FILLABLE_KEYS: tuple[str, ...] = tuple(
+    key for key in PROFILE_FIELD_KEYS if key not in _PROFILE_HANDLED_ELSEWHERE and key not in _PROFILE_SKIPPED_KEYS
+)
+_PROFILE_ALWAYS_SKIPPED = sum(1 for key in PROFILE_FIELD_KEYS if key in _PROFILE_SKIPPED_KEYS)
 
 
 async def _fill_profile_payload_fields(page: Page, ctx: RowContext, config: RuntimeConfig) -> dict[str, object]:
     """Isi kolom-kolom baru Profiling berdasarkan payload Excel."""
     updated = 0
-    skipped = 0
+    skipped = _PROFILE_ALWAYS_SKIPPED
+    unchanged = 0
     errors: list[str] = []
-    profile_selectors: Dict[str, str] = config.profile_field_selectors
-    select2_selectors: Dict[str, str] = config.select2_field_selectors
-
-    for key in PROFILE_FIELD_KEYS:
-        if key in {"nomor_telepon", "nomor_whatsapp", "website", "sumber_profiling", "catatan_profiling"}:
-            continue
-        if key == "keberadaan_usaha":
-            skipped += 1
-            continue
-
+    profile_selectors: Mapping[str, str] = config.profile_field_selectors
+    select2_selectors: Mapping[str, str] = config.select2_field_selectors
+    # Locator dibangun sekali di awal bagian (dan di-cache per halaman), bukan di tiap pemanggilan.
+    locators = {
+        key: _loc(page, selector)
+        for key in _PROFILE_FILLABLE_KEYS
+        if (selector := select2_selectors.get(key) or profile_selectors.get(key))
+    }
+
+    # Field input biasa tidak saling bergantung dan _fast_set atomik di sisi browser, jadi jalur cepatnya
+    # dijalankan paralel. Select2 (kaskade provinsi->desa), idsbr_master, dan jalur lambat berbasis
+    # Locator.fill (bergantung fokus) tetap berurutan di loop bawah.
+    independent = [
+        key
+        for key in _PROFILE_FILLABLE_KEYS
+        if key != "idsbr_master"
+        and key not in select2_selectors
+        and key in profile_selectors
+        and nonempty(ctx.profiling_payload.get(key, ""))
+    ]
+    async with asyncio.TaskGroup() as group:
+        fast_tasks = {
+            key: group.create_task(_fast_set(page, profile_selectors[key], str(ctx.profiling_payload.get(key, ""))))
+            for key in independent
+        }
+    fast_results = {key: task.result() for key, task in fast_tasks.items()}
+
+    for key in _PROFILE_FILLABLE_KEYS:
         if key == "idsbr_master":
             result = await _handle_idsbr_master(page, ctx, config)
             updated += result.get("updated", 0)
             skipped += result.get("skipped", 0)
+            unchanged += result.get("unchanged", 0)
             errors.extend(result.get("errors", []))
             continue
 
@@ -526,6 +859,7 @@ async def _fill_profile_payload_fields(page: Page, ctx: RowContext, config: Runt
                 select_selector,
                 ctx.profiling_payload.get(key, ""),
                 key,
+                locator=locators.get(key),
             )
             if status == "skip":
                 skipped += 1
@@ -533,7 +867,6 @@ async def _fill_profile_payload_fields(page: Page, ctx: RowContext, config: Runt
                 updated += 1
             else:
                 errors.append(key)
-            await slow_pause(page, config)
             continue
 
         selector = profile_selectors.get(key)
@@ -541,21 +874,34 @@ async def _fill_profile_payload_fields(page: Page, ctx: RowContext, config: Runt
             skipped += 1
             continue
 
-        success, status = await update_field(page, selector, ctx.profiling_payload.get(key, ""), key, None)
+        success, status = await update_field(
+            page,
+            selector,
+            ctx.profiling_payload.get(key, ""),
+            key,
+            None,
+            force_scroll=config.force_scroll,
+            locator=locators.get(key),
+            kind="select" if key in NATIVE_SELECT_KEYS else None,
+            fast_result=fast_results.get(key),
+        )
         if status == "skip":
             skipped += 1
+        elif status == "unchanged":
+            unchanged += 1
         elif success:
             updated += 1
         else:
             errors.append(key)
-        await slow_pause(page, config)
 
-    return {"updated": updated, "skipped": skipped, "errors": errors}
+    # Satu jeda per bagian (slow-mode), bukan per field.
+    await slow_pause(page, config)
+    return {"updated": updated, "skipped": skipped, "unchanged": unchanged, "errors": errors}
 
 
 async def fill_form(page: Page, ctx: RowContext, config: RuntimeConfig) -> dict[str, object]:
     _form_log("Mengisi form...")
-    summary: dict[str, object] = {"updated": 0, "skipped": 0, "errors": []}
+    summary: dict[str, object] = {"updated": 0, "skipped": 0, "unchanged": 0, "errors": []}
     if config.skip_status:
         _form_log("Status usaha dilewati (skip-status aktif).")
         summary["skipped"] = 1
@@ -571,6 +917,7 @@ async def fill_form(page: Page, ctx: RowContext, config: RuntimeConfig) -> dict[
     payload_result = await _fill_profile_payload_fields(page, ctx, config)
     summary["updated"] += payload_result.get("updated", 0)
     summary["skipped"] += payload_result.get("skipped", 0)
+    summary["unchanged"] += payload_result.get("unchanged", 0)
     summary["errors"].extend(payload_result.get("errors", []))
 
     _form_log("Form selesai diisi.")
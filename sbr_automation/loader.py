@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-from typing import Dict, Iterable, Tuple
+import sys
+from collections.abc import Iterable, Mapping
+from functools import lru_cache
+from types import MappingProxyType
+
+import pandas as pd
 
 from .config import AutofillOptions, RuntimeConfig
 from .excel_loader import (
@@ -8,14 +13,14 @@ from .excel_loader import (
     REQUIRED_COLUMNS_AUTOFILL,
     ensure_profile_fields,
     ensure_required_with_aliases,
-    extract_profile_payload,
-    load_dataframe,
-    slice_rows,
+    extract_profile_payloads,
+    load_dataframe_window,
 )
 from .models import RowContext
-from .utils import norm_float, norm_phone, norm_space
+from .utils import digits_only, first_float, norm_space, norm_space_series
 
-PHONE_COLUMN_CANDIDATES = (
+# Alias di-intern sekali saat impor (termasuk yang berspasi, yang tidak di-intern otomatis oleh Python).
+PHONE_COLUMN_CANDIDATES = tuple(map(sys.intern, (
     "nomor_telepon",
     "Nomor Telepon",
     "No Telepon",
@@ -23,13 +28,13 @@ PHONE_COLUMN_CANDIDATES = (
     "Telepon",
     "Telepon/HP",
     "Phone",
-)
-WHATSAPP_COLUMN_CANDIDATES = (
+)))
+WHATSAPP_COLUMN_CANDIDATES = tuple(map(sys.intern, (
     "nomor_whatsapp",
     "whatsapp",
     "no_whatsapp",
     "no whatsapp",
-)
+)))
 
 STATUS_NORMALIZATION = {
     "aktif nonrespons": "Aktif Nonrespon",
@@ -48,74 +53,158 @@ STATUS_NUMERIC_MAP = {
     "10": "Salah Kode Wilayah",
     "11": "Salah Kode Wilayah",
 }
+# Satu tabel beku (kode angka + alias huruf kecil) sehingga normalisasi status cukup satu lookup.
+_STATUS_LOOKUP: Mapping[str, str] = MappingProxyType(
+    {**{key.lower(): value for key, value in STATUS_NORMALIZATION.items()}, **STATUS_NUMERIC_MAP}
+)
 
-MATCH_BY_REQUIRED_COLUMNS: Dict[str, Iterable[str]] = {
+# Field RowContext yang diisi dari frame staging hasil _vectorize_normalize. Diturunkan dari urutan
+# field RowContext sehingga satu baris staging bisa langsung di-unpack secara posisional.
+STAGED_FIELDS: tuple[str, ...] = tuple(
+    name for name in RowContext._fields if name not in ("table_index", "display_index", "profiling_payload")
+)
+
+# Urutan sumber kolom untuk field RowContext (nilai pertama yang terisi dipakai).
+ROW_SOURCE_COLUMNS: dict[str, tuple[str, ...]] = {
+    "idsbr": ("idsbr", "idsbr_master", "IDSBR"),
+    "nama": ("nama", "nama_usaha", "nama_usaha_pembetulan", "nama_komersial_usaha"),
+    "status": ("status", "keberadaan_usaha"),
+    "sumber": ("sumber_profiling", "sumber"),
+    "catatan": ("catatan_profiling", "catatan"),
+    "phone": PHONE_COLUMN_CANDIDATES,
+    "whatsapp": WHATSAPP_COLUMN_CANDIDATES,
+}
+
+MATCH_BY_REQUIRED_COLUMNS: dict[str, Iterable[str]] = {
     "idsbr": ("idsbr", "idsbr_master"),
     "name": ("nama", "nama_usaha", "nama_usaha_pembetulan"),
 }
 
 
-def _select_phone_value(df_row) -> object:
-    columns = getattr(df_row, "index", ())
-    for column in PHONE_COLUMN_CANDIDATES:
-        if column in columns:
-            value = df_row.get(column)
-            if norm_space(value):
-                return value
-    for column in PHONE_COLUMN_CANDIDATES:
-        if column in columns:
-            return df_row.get(column)
-    return df_row.get("Nomor Telepon")
-
-
-def _select_whatsapp_value(df_row) -> object:
-    columns = getattr(df_row, "index", ())
-    for column in WHATSAPP_COLUMN_CANDIDATES:
-        if column in columns:
-            value = df_row.get(column)
-            if norm_space(value):
-                return value
-    for column in WHATSAPP_COLUMN_CANDIDATES:
-        if column in columns:
-            return df_row.get(column)
-    return df_row.get("nomor_whatsapp") or df_row.get("whatsapp")
+def _resolve_sources(columns: Iterable[str]) -> dict[str, tuple[str, ...]]:
+    """Saring ROW_SOURCE_COLUMNS ke kolom yang benar-benar ada; dihitung sekali per DataFrame."""
+    # Label kolom ikut di-intern agar lookup alias (yang juga di-intern) cukup cek identitas.
+    present = frozenset(sys.intern(col) if type(col) is str else col for col in columns)
+    return {field: tuple(col for col in cands if col in present) for field, cands in ROW_SOURCE_COLUMNS.items()}
+
 
+_MISSING = object()
 
+
+def _first_nonblank_value(get, candidates: tuple[str, ...]) -> object:
+    """Nilai kandidat pertama yang tidak kosong; jika semua kosong, nilai kandidat pertama yang ada (atau _MISSING)."""
+    # Satu `.get` per kandidat (dict maupun Series) alih-alih `in` lalu `.get`; cukup satu putaran.
+    first = _MISSING
+    for column in candidates:
+        value = get(column, _MISSING)
+        if value is _MISSING:
+            continue
+        if norm_space(value):
+            return value
+        if first is _MISSING:
+            first = value
+    return first
+
+
+def _select_phone_value(df_row, candidates: tuple[str, ...] = PHONE_COLUMN_CANDIDATES) -> object:
+    value = _first_nonblank_value(df_row.get, candidates)
+    return df_row.get("Nomor Telepon") if value is _MISSING else value
+
+
+def _select_whatsapp_value(df_row, candidates: tuple[str, ...] = WHATSAPP_COLUMN_CANDIDATES) -> object:
+    value = _first_nonblank_value(df_row.get, candidates)
+    if value is _MISSING:
+        return df_row.get("nomor_whatsapp") or df_row.get("whatsapp")
+    return value
+
+
+@lru_cache(maxsize=512)
 def _normalize_status(status: str) -> str:
     if not status:
         return ""
-    if status.isdigit():
-        mapped = STATUS_NUMERIC_MAP.get(status.strip())
-        if mapped:
-            return mapped
-    return STATUS_NORMALIZATION.get(status.lower(), status)
-
-
-def _context_from_row(df_row, table_index: int, display_index: int) -> RowContext:
-    idsbr_value = norm_space(df_row.get("idsbr") or df_row.get("idsbr_master") or df_row.get("IDSBR"))
-    sumber = norm_space(df_row.get("sumber_profiling") or df_row.get("sumber"))
-    catatan = norm_space(df_row.get("catatan_profiling") or df_row.get("catatan"))
-    return RowContext(
-        table_index=table_index,
-        display_index=display_index,
-        idsbr=idsbr_value,
-        nama=norm_space(
-            df_row.get("nama")
-            or df_row.get("nama_usaha")
-            or df_row.get("nama_usaha_pembetulan")
-            or df_row.get("nama_komersial_usaha")
+    return _STATUS_LOOKUP.get(status.lower(), status)
+
+
+def _first_filled_series(df: pd.DataFrame, columns: tuple[str, ...]) -> pd.Series:
+    """Nilai kolom pertama yang truthy (setara rantai `a or b or c`) untuk seluruh baris."""
+    if not columns:
+        return pd.Series("", index=df.index, dtype=object)
+    merged = df[columns[0]]
+    for column in columns[1:]:
+        merged = merged.where(merged.astype(bool), df[column])
+    return merged
+
+
+def _normalize_status_series(statuses: pd.Series) -> pd.Series:
+    """Versi tervektor dari `_normalize_status` untuk status yang sudah di-norm_space."""
+    return statuses.str.lower().map(_STATUS_LOOKUP).fillna(statuses).astype(object)
+
+
+def _first_nonblank_series(df: pd.DataFrame, columns: tuple[str, ...]) -> pd.Series:
+    """Versi tervektor dari `_select_phone_value` + norm_space: kolom pertama yang tidak kosong."""
+    result = pd.Series("", index=df.index, dtype=object)
+    for column in reversed(columns):
+        normalized = norm_space_series(df[column])
+        result = normalized.where(normalized != "", result)
+    return result
+
+
+def _column_series(df: pd.DataFrame, column: str) -> pd.Series:
+    if column not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    return norm_space_series(df[column])
+
+
+def _digits_series(values: pd.Series) -> pd.Series:
+    """Versi tervektor dari `norm_phone` untuk nilai yang sudah di-norm_space (tanpa regex per sel)."""
+    return pd.Series([digits_only(value) for value in values], index=values.index, dtype=object)
+
+
+def _intern_series(values: pd.Series) -> pd.Series:
+    """Satukan string yang sama menjadi satu objek (sys.intern per nilai unik, bukan per baris)."""
+    codes, uniques = pd.factorize(values)
+    interned = pd.Series([sys.intern(value) for value in uniques], dtype=object)
+    return pd.Series(interned.to_numpy()[codes], index=values.index, dtype=object)
+
+
+def _float_series(values: pd.Series) -> pd.Series:
+    """Versi tervektor dari `norm_float` untuk nilai yang sudah di-norm_space.
+
+    Regex terkompilasi dipanggil langsung per sel (tanpa memo: koordinat hampir selalu unik), lebih
+    murah daripada str.extract yang membangun DataFrame perantara.
+    """
+    return pd.Series([first_float(value) if value else "" for value in values], index=values.index, dtype=object)
+
+
+def _vectorize_normalize(df: pd.DataFrame, sources: dict[str, tuple[str, ...]]) -> pd.DataFrame:
+    """Normalisasi semua field RowContext per kolom sekaligus; hasilnya frame staging berkolom STAGED_FIELDS."""
+    staged = {
+        "idsbr": norm_space_series(_first_filled_series(df, sources["idsbr"])),
+        "nama": norm_space_series(_first_filled_series(df, sources["nama"])),
+        "status": _intern_series(
+            _normalize_status_series(norm_space_series(_first_filled_series(df, sources["status"])))
         ),
-        status=_normalize_status(norm_space(df_row.get("status") or df_row.get("keberadaan_usaha"))),
-        phone=norm_phone(_select_phone_value(df_row)),
-        whatsapp=norm_phone(_select_whatsapp_value(df_row)),
-        email=norm_space(df_row.get("email")),
-        website=norm_space(df_row.get("website")),
-        latitude=norm_float(df_row.get("latitude")),
-        longitude=norm_float(df_row.get("longitude")),
-        sumber=sumber,
-        catatan=catatan,
-        profiling_payload=extract_profile_payload(df_row),
-    )
+        "phone": _digits_series(_first_nonblank_series(df, sources["phone"])),
+        "whatsapp": _digits_series(_first_nonblank_series(df, sources["whatsapp"])),
+        "email": _column_series(df, "email"),
+        "website": _column_series(df, "website"),
+        "latitude": _float_series(_column_series(df, "latitude")),
+        "longitude": _float_series(_column_series(df, "longitude")),
+        "sumber": _intern_series(norm_space_series(_first_filled_series(df, sources["sumber"]))),
+        "catatan": _intern_series(norm_space_series(_first_filled_series(df, sources["catatan"]))),
+    }
+    return pd.DataFrame(staged, index=df.index, columns=list(STAGED_FIELDS))
+
+
+def _context_from_row(
+    staged: tuple[str, ...],
+    payload: dict[str, str],
+    table_index: int,
+    display_index: int,
+) -> RowContext:
+    """Rangkai RowContext dari satu baris staging (urutan STAGED_FIELDS) dan payload yang sudah jadi."""
+    # Sumber kolom sudah dipilih sekali per DataFrame di _vectorize_normalize; di sini hanya unpack posisi.
+    return RowContext(table_index, display_index, *staged, payload)
 
 
 def _validate_columns(options: AutofillOptions, df) -> None:
@@ -127,11 +216,12 @@ def _validate_columns(options: AutofillOptions, df) -> None:
 def load_rows(
     options: AutofillOptions,
     config: RuntimeConfig,  # config disertakan untuk ekspansi mendatang (mis. dtype)
-) -> Tuple[list[RowContext], int, int]:
+) -> tuple[list[RowContext], int, int]:
     """
     Membaca Excel, memvalidasi kolom, dan mengembalikan list RowContext serta rentang display (start/end).
     """
-    df = load_dataframe(options.excel)
+    # Hanya rentang --start/--end yang dibaca; baris pertama df adalah baris ke-start_idx pada sheet.
+    df, start_idx = load_dataframe_window(options.excel, options.start_row, options.end_row)
     try:
         _validate_columns(options, df)
     except RuntimeError as exc:
@@ -145,12 +235,18 @@ def load_rows(
                 f"Kolom Excel untuk '--match-by {options.match_by}' wajib ada: {', '.join(missing_match)}."
             ) from exc
         raise
-    start_idx, end_idx = slice_rows(df, options.start_row, options.end_row)
     start_display = start_idx + 1
-    end_display = end_idx if end_idx else len(df)
-
-    contexts: list[RowContext] = []
-    for i in range(start_idx, end_idx):
-        contexts.append(_context_from_row(df.iloc[i], i, i + 1))
+    end_display = start_idx + len(df)
+
+    # Field RowContext dan payload dinormalisasi per kolom sekali jalan; sisa kerja per baris hanya
+    # membungkus tuple, jadi cukup satu list comprehension (proses paralel justru lebih mahal karena
+    # hasilnya harus di-pickle balik). itertuples(name=None) menghasilkan tuple biasa tanpa Series.
+    staged = _vectorize_normalize(df, _resolve_sources(df.columns))
+    payloads = extract_profile_payloads(df)
+    rows = zip(staged.itertuples(index=False, name=None), payloads, strict=True)
+    contexts = [
+        _context_from_row(staged_values, payload, i, i + 1)
+        for i, (staged_values, payload) in enumerate(rows, start=start_idx)
+    ]
 
     return contexts, start_display, end_display
@@ -1,21 +1,23 @@
 from __future__ import annotations
 
+from collections import Counter
 import csv
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
+import heapq
 from html import escape
 import os
 from pathlib import Path
-from typing import Iterable, Literal, Optional
-
-import pandas as pd
+from string import Template
+import time
+from typing import Any, Iterable, Literal, TextIO
 
 from .utils import signal_attention
 
 Level = Literal["OK", "WARN", "ERROR"]
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class LogEvent:
     ts: str
     row_index: int
@@ -28,36 +30,148 @@ class LogEvent:
     screenshot: str = ""
 
 
+LOG_FIELDS: tuple[str, ...] = tuple(f.name for f in fields(LogEvent))
+# Urutan prioritas untuk recent_issues (ERROR lebih dulu).
+_LEVEL_PRIORITY: dict[str, int] = {"ERROR": 0, "WARN": 1, "OK": 2}
+
+# Kerangka HTML laporan dirangkai sekali; save_html hanya mengisi placeholder lalu menulis baris tabel.
+_REPORT_HEAD = Template("""<!DOCTYPE html>
+<html lang="id">
+<head>
+    <meta charset="utf-8">
+    <title>Laporan SBR Automation</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 2rem; background: #f8f9fa; color: #212529; }
+        h1, h2 { color: #0b7285; }
+        .summary { background: #e3fafc; padding: 1rem; border-radius: 8px; margin-bottom: 1.5rem; }
+        table { border-collapse: collapse; width: 100%; background: #fff; }
+        th, td { border: 1px solid #dee2e6; padding: 0.5rem; text-align: left; font-size: 0.95rem; }
+        th { background: #0b7285; color: #fff; position: sticky; top: 0; }
+        tr:nth-child(even) { background: #f1f3f5; }
+        a { color: #0b7285; text-decoration: none; }
+        a:hover { text-decoration: underline; }
+    </style>
+</head>
+<body>
+    <h1>Laporan Otomatisasi Profiling SBR</h1>
+    <p>Dibuat pada: $timestamp</p>
+    <div class="summary">
+        <h2>Ringkasan Level</h2>
+        <ul>
+            $summary_items
+        </ul>
+        <p>CSV sumber: <code>$csv_source</code></p>
+    </div>
+    <h2>Detail Baris</h2>
+    <table border="1" class="dataframe">
+  <thead>
+    <tr style="text-align: right;">
+""" + "".join(f"      <th>{name}</th>\n" for name in LOG_FIELDS) + """    </tr>
+  </thead>
+  <tbody>
+""")
+_REPORT_TAIL = """  </tbody>
+</table>
+</body>
+</html>
+"""
+_SCREENSHOT_COLUMN = LOG_FIELDS.index("screenshot")
+
+
 @dataclass
 class LogBook:
     path: Path
-    report_path: Optional[Path] = None
-    attention_flag: Optional[Path] = None
+    report_path: Path | None = None
+    attention_flag: Path | None = None
+    flush_every: int = 64
+    flush_interval: float = 1.0
     _events: list[LogEvent] = field(default_factory=list)
+    _pending: list[LogEvent] = field(default_factory=list)
+    _handle: TextIO | None = field(default=None, repr=False)
+    _writer: Any = field(default=None, repr=False)
+    _csv_started: bool = False
+    _last_flush: float = field(default_factory=time.monotonic)
 
     def append(self, event: LogEvent) -> None:
         self._events.append(event)
+        self._pending.append(event)
         if event.level == "ERROR":
             signal_attention(self.attention_flag)
+        if len(self._pending) >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Tulis event yang masih tertahan ke CSV; file dibuka sekali dan dipakai ulang."""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            mode = "a" if self._csv_started else "w"
+            self._handle = self.path.open(mode, newline="", encoding="utf-8", buffering=1 << 16)
+            self._writer = csv.writer(self._handle, lineterminator="\n")
+            if not self._csv_started:
+                self._writer.writerow(LOG_FIELDS)
+                self._csv_started = True
+        self._writer.writerows([getattr(e, name) for name in LOG_FIELDS] for e in self._pending)
+        self._handle.flush()
+        self._pending.clear()
+
+    def close(self) -> None:
+        if self._handle is None:
+            return
+        try:
+            self._handle.close()
+        finally:
+            self._handle = None
+            self._writer = None
+
+    @property
+    def events(self) -> list[LogEvent]:
+        """Semua event run ini (tersimpan di memori, tidak dibaca ulang dari CSV)."""
+        return self._events
 
     def extend(self, events: Iterable[LogEvent]) -> None:
-        for event in events:
-            self.append(event)
+        batch = list(events)
+        if not batch:
+            return
+        self._events.extend(batch)
+        self._pending.extend(batch)
+        if any(event.level == "ERROR" for event in batch):
+            signal_attention(self.attention_flag)
+        if len(self._pending) >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
 
     def recent_issues(self, *, limit: int = 3, levels: tuple[Level, ...] = ("ERROR", "WARN")) -> list[LogEvent]:
-        priority = {"ERROR": 0, "WARN": 1, "OK": 2}
-        selected: list[LogEvent] = [e for e in self._events if e.level in levels]
-        selected.sort(key=lambda e: (priority.get(e.level, 99), e.row_index))
-        return selected[:limit]
+        return heapq.nsmallest(
+            limit,
+            (e for e in self._events if e.level in levels),
+            key=lambda e: (_LEVEL_PRIORITY.get(e.level, 99), e.row_index),
+        )
 
-    def _build_report(self, df: pd.DataFrame) -> str:
+    def _write_report(self, handle: TextIO) -> None:
+        """Tulis laporan HTML baris demi baris ke handle (tanpa DataFrame/to_html di memori)."""
         timestamp_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        level_counts = df["level"].value_counts().to_dict()
+        # Hitung level langsung dari event di memori (tanpa value_counts di DataFrame).
+        level_counts = Counter(event.level for event in self._events).most_common()
         summary_items = "".join(
-            f"<li><strong>{escape(level)}</strong>: {count}</li>" for level, count in level_counts.items()
+            [f"<li><strong>{escape(level)}</strong>: {count}</li>" for level, count in level_counts]
         )
 
         log_dir = self.path.parent.resolve()
+        # Isi folder dibaca sekali per folder (bukan stat() per screenshot) untuk cek keberadaan file.
+        listings: dict[str, frozenset[str]] = {}
+
+        def _exists(target: Path) -> bool:
+            parent = str(target.parent)
+            names = listings.get(parent)
+            if names is None:
+                try:
+                    names = frozenset(os.listdir(parent))
+                except OSError:
+                    names = frozenset()
+                listings[parent] = names
+            return target.name in names
 
         def _make_link(value: str) -> str:
             if not value:
@@ -69,9 +183,11 @@ class LogBook:
 
             href = value
             display = target.name
-            if target.exists():
+            if _exists(target):
+                # Screenshot biasanya berada di bawah folder log: cukup cek prefix path absolut
+                # tanpa resolve() (yang menelusuri symlink komponen demi komponen).
                 try:
-                    rel = target.resolve().relative_to(log_dir)
+                    rel = Path(os.path.abspath(target)).relative_to(log_dir)
                     href = rel.as_posix()
                 except ValueError:
                     href = os.path.relpath(target, log_dir).replace("\\", "/")
@@ -79,84 +195,100 @@ class LogBook:
                 href = target.as_posix()
             return f'<a href="{escape(href)}">{escape(display)}</a>'
 
-        df_display = df.copy()
-        df_display["screenshot"] = df_display["screenshot"].apply(_make_link)
-        table_html = df_display.to_html(index=False, escape=False)
         csv_source = escape(os.path.relpath(self.path, log_dir).replace("\\", "/"))
+        handle.write(
+            _REPORT_HEAD.substitute(
+                timestamp=escape(timestamp_str),
+                summary_items=summary_items or "<li>Belum ada data</li>",
+                csv_source=csv_source,
+            )
+        )
 
-        return f"""<!DOCTYPE html>
-<html lang="id">
-<head>
-    <meta charset="utf-8">
-    <title>Laporan SBR Automation</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 2rem; background: #f8f9fa; color: #212529; }}
-        h1, h2 {{ color: #0b7285; }}
-        .summary {{ background: #e3fafc; padding: 1rem; border-radius: 8px; margin-bottom: 1.5rem; }}
-        table {{ border-collapse: collapse; width: 100%; background: #fff; }}
-        th, td {{ border: 1px solid #dee2e6; padding: 0.5rem; text-align: left; font-size: 0.95rem; }}
-        th {{ background: #0b7285; color: #fff; position: sticky; top: 0; }}
-        tr:nth-child(even) {{ background: #f1f3f5; }}
-        a {{ color: #0b7285; text-decoration: none; }}
-        a:hover {{ text-decoration: underline; }}
-    </style>
-</head>
-<body>
-    <h1>Laporan Otomatisasi Profiling SBR</h1>
-    <p>Dibuat pada: {escape(timestamp_str)}</p>
-    <div class="summary">
-        <h2>Ringkasan Level</h2>
-        <ul>
-            {summary_items or "<li>Belum ada data</li>"}
-        </ul>
-        <p>CSV sumber: <code>{csv_source}</code></p>
-    </div>
-    <h2>Detail Baris</h2>
-    {table_html}
-</body>
-</html>
-"""
+        # Link dihitung sekali per path unik (banyak baris berbagi screenshot kosong/sama).
+        links: dict[str, str] = {}
+        for event in self._events:
+            cells = [escape(str(getattr(event, name))) for name in LOG_FIELDS]
+            shot = event.screenshot
+            link = links.get(shot)
+            if link is None:
+                link = links[shot] = _make_link(shot)
+            cells[_SCREENSHOT_COLUMN] = link
+            handle.write("    <tr>\n" + "".join([f"      <td>{cell}</td>\n" for cell in cells]) + "    </tr>\n")
+        handle.write(_REPORT_TAIL)
+
+    def save_csv(self) -> None:
+        """Pastikan semua event sudah tertulis ke CSV lalu tutup file."""
+        self.flush()
+        self.close()
+
+    def save_html(self) -> None:
+        """Tulis laporan HTML ke report_path secara streaming (tanpa membangun string penuh)."""
+        if not self.report_path or not self._events:
+            return
+        self.report_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.report_path.open("w", encoding="utf-8", buffering=1 << 16) as handle:
+            self._write_report(handle)
 
     def save(self) -> None:
         if not self._events:
             return
-        df = pd.DataFrame([asdict(e) for e in self._events])
-        df.to_csv(self.path, index=False)
-        if self.report_path:
-            report_html = self._build_report(df)
-            self.report_path.parent.mkdir(parents=True, exist_ok=True)
-            self.report_path.write_text(report_html, encoding="utf-8")
+        self.save_csv()
+        self.save_html()
 
 
-def update_run_index(index_path: Path, entry: dict) -> None:
-    fieldnames = [
-        "run_id",
-        "started_at",
-        "command",
-        "resume",
-        "dry_run",
-        "skip_status",
-        "ok_rows",
-        "error_rows",
-        "skipped_rows",
-        "log_csv",
-        "log_html",
-        "profile",
-    ]
+RUN_INDEX_FIELDS: tuple[str, ...] = (
+    "run_id",
+    "started_at",
+    "command",
+    "resume",
+    "dry_run",
+    "skip_status",
+    "ok_rows",
+    "error_rows",
+    "skipped_rows",
+    "log_csv",
+    "log_html",
+    "profile",
+)
+
+
+def _can_append_run(index_path: Path, run_id: str) -> bool:
+    """True bila index sudah berheader sama, diakhiri newline, dan belum memuat run_id ini."""
+    if not run_id or any(ch in run_id for ch in ',"\r\n'):
+        return False
+    try:
+        data = index_path.read_bytes()
+    except OSError:
+        return False
+    header = (",".join(RUN_INDEX_FIELDS) + "\r\n").encode("utf-8")
+    if not data.startswith(header) or not data.endswith(b"\n"):
+        return False
+    return f"\n{run_id},".encode() not in data
+
 
+def update_run_index(index_path: Path, entry: dict) -> None:
+    fieldnames = list(RUN_INDEX_FIELDS)
     index_path.parent.mkdir(parents=True, exist_ok=True)
+    row = {key: entry.get(key, "") for key in fieldnames}
+
+    # Kasus umum: run baru -> cukup tambahkan satu baris, tanpa membaca & menulis ulang seluruh index.
+    if _can_append_run(index_path, str(row["run_id"])):
+        with index_path.open("a", newline="", encoding="utf-8") as handle:
+            csv.DictWriter(handle, fieldnames=fieldnames).writerow(row)
+        return
+
     rows: list[dict] = []
     if index_path.exists():
         try:
             with index_path.open("r", newline="", encoding="utf-8") as handle:
                 reader = csv.DictReader(handle)
-                for row in reader:
-                    if row.get("run_id") != entry.get("run_id"):
-                        rows.append(row)
+                for existing in reader:
+                    if existing.get("run_id") != entry.get("run_id"):
+                        rows.append(existing)
         except Exception:
             rows = []
 
-    rows.append({key: entry.get(key, "") for key in fieldnames})
+    rows.append(row)
 
     with index_path.open("w", newline="", encoding="utf-8") as handle:
         writer = csv.DictWriter(handle, fieldnames=fieldnames)
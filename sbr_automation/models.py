@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from typing import NamedTuple
 
 
-@dataclass(slots=True)
-class RowContext:
+# NamedTuple: dibuat lewat konstruktor tuple (C) dan hanya dibaca setelah load_rows/submit_form.
+class RowContext(NamedTuple):
     table_index: int
     display_index: int
     idsbr: str
@@ -21,7 +21,6 @@ class RowContext:
     profiling_payload: dict[str, str]
 
 
-@dataclass(slots=True)
-class SubmitResult:
+class SubmitResult(NamedTuple):
     code: str
     detail: str = ""
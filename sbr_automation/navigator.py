@@ -7,26 +7,37 @@ from playwright.async_api import BrowserContext, Error as PlaywrightError, Page
 from .config import RuntimeConfig
 from .utils import describe_exception
 
+# Skrip evaluate disimpan sebagai konstanta modul agar tidak dirangkai ulang setiap panggilan.
+_FIND_EDIT_HREF_JS = """
+(target) => {
+    const table = document.querySelector('#table_direktori_usaha');
+    if (!table) return '';
+    for (const tr of table.querySelectorAll('tbody tr')) {
+        if (target && !(tr.innerText || '').toLowerCase().includes(target)) continue;
+        const link = tr.querySelector('a.btn-edit-perusahaan');
+        if (link && link.href) return link.href;
+    }
+    return '';
+}
+"""
+
+_OPEN_HREF_NEW_TAB_JS = """
+(url) => {
+    const a = document.createElement('a');
+    a.href = url;
+    a.target = '_blank';
+    a.rel = 'noopener';
+    document.body.appendChild(a);
+    a.click();
+    a.remove();
+}
+"""
+
 
 async def find_edit_href(page: Page, text: str) -> str:
-    text = (text or "").strip().lower()
-    return await page.evaluate(
-        """
-        (target) => {
-            const table = document.querySelector('#table_direktori_usaha');
-            if (!table) return '';
-            const rows = Array.from(table.querySelectorAll('tbody tr'));
-            for (const tr of rows) {
-                const content = (tr.innerText || '').toLowerCase();
-                if (target && !content.includes(target)) continue;
-                const link = tr.querySelector('a.btn-edit-perusahaan');
-                if (link && link.href) return link.href;
-            }
-            return '';
-        }
-        """,
-        text,
-    )
+    # Satu evaluate = satu roundtrip; locator.filter(has_text=...) butuh beberapa roundtrip dan
+    # get_attribute akan menunggu timeout bila tidak ada baris yang cocok.
+    return await page.evaluate(_FIND_EDIT_HREF_JS, (text or "").strip().lower())
 
 
 async def open_form_page(
@@ -75,20 +86,7 @@ async def open_form_page(
 
         if href:
             try:
-                await page.evaluate(
-                    """
-                    (url) => {
-                        const a = document.createElement('a');
-                        a.href = url;
-                        a.target = '_blank';
-                        a.rel = 'noopener';
-                        document.body.appendChild(a);
-                        a.click();
-                        a.remove();
-                    }
-                    """,
-                    href,
-                )
+                await page.evaluate(_OPEN_HREF_NEW_TAB_JS, href)
             except Exception as inner_exc:  # noqa: BLE001
                 href_detail = describe_exception(inner_exc)
             else:
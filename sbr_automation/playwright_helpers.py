@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import asyncio
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
+from functools import lru_cache
+from http.client import HTTPConnection, HTTPSConnection
 from typing import AsyncIterator, Optional
-from urllib.error import URLError
-from urllib.request import urlopen
+from urllib.parse import urlsplit
 
 from playwright.async_api import (
     Browser,
@@ -30,6 +31,19 @@ async def remove_overlays(page: Page) -> None:
     )
 
 
+async def close_page(page: Page) -> None:
+    with suppress(PlaywrightError):
+        await page.close()
+
+
+async def back_to_main(form_page: Page, main_page: Page) -> None:
+    """Tutup tab form (kecuali form dibuka di tab utama) lalu fokus kembali ke tab utama."""
+    if form_page is not main_page:
+        await close_page(form_page)
+    with suppress(PlaywrightError):
+        await main_page.bring_to_front()
+
+
 async def ensure_click(
     locator: Locator,
     *,
@@ -53,21 +67,34 @@ async def ensure_click(
     return False
 
 
+@lru_cache(maxsize=8)
+def _split_endpoint(endpoint: str) -> tuple[str, str, int | None, str]:
+    """Pecah endpoint CDP menjadi (scheme, host, port, base path) sekali saja."""
+    parts = urlsplit(endpoint)
+    return parts.scheme or "http", parts.hostname or "localhost", parts.port, parts.path.rstrip("/")
+
+
+def _cdp_get(endpoint: str, path: str, timeout: float) -> tuple[int, bytes]:
+    """GET ringan ke endpoint CDP lokal lewat http.client (tanpa lapisan opener urllib)."""
+    scheme, host, port, base = _split_endpoint(endpoint)
+    connection_cls = HTTPSConnection if scheme == "https" else HTTPConnection
+    connection = connection_cls(host, port, timeout=timeout)
+    try:
+        connection.request("GET", f"{base}{path}")
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+
 def ensure_cdp_ready(config: RuntimeConfig) -> None:
     endpoint = config.cdp_endpoint.rstrip("/")
     test_url = f"{endpoint}/json/version"
     timeout_seconds = max(config.max_wait_ms, 2000) / 1000
 
     try:
-        with urlopen(test_url, timeout=timeout_seconds) as response:
-            status = getattr(response, "status", 200)
-            if status >= 400:
-                raise RuntimeError(
-                    f"Chrome CDP merespons status {status} untuk {test_url}. "
-                    "Periksa apakah remote debugging telah diaktifkan."
-                )
-            payload = response.read()
-    except URLError as exc:
+        status, payload = _cdp_get(endpoint, "/json/version", timeout_seconds)
+    except OSError as exc:
         raise RuntimeError(
             f"Gagal menghubungi Chrome CDP di {test_url}. "
             "Pastikan Chrome dijalankan dengan remote debugging, misalnya:\n"
@@ -77,6 +104,11 @@ def ensure_cdp_ready(config: RuntimeConfig) -> None:
     except Exception as exc:  # noqa: BLE001
         raise RuntimeError(f"Gagal memverifikasi Chrome CDP: {exc}") from exc
 
+    if status >= 400:
+        raise RuntimeError(
+            f"Chrome CDP merespons status {status} untuk {test_url}. "
+            "Periksa apakah remote debugging telah diaktifkan."
+        )
     if b"webSocketDebuggerUrl" not in payload:
         raise RuntimeError(
             f"Endpoint {test_url} merespons, tetapi tidak ditemukan `webSocketDebuggerUrl`. "
@@ -1,13 +1,32 @@
 from __future__ import annotations
 
 import csv
+import os
+from collections.abc import Sequence
 from pathlib import Path
 from typing import Dict
 
+from .logbook import LOG_FIELDS
 from .utils import describe_exception
 
 RESUME_ELIGIBLE_LEVELS = {"OK"}
 _RESUME_PREFIX = "[Resume]"
+# Kolom yang dipakai pemanggil (catatan RESUME_SKIP); kolom lain tidak disimpan per baris.
+_RESUME_KEPT_COLUMNS = ("level", "stage", "note")
+
+_ColumnLayout = tuple[int, int, tuple[tuple[str, int], ...]]
+
+
+def _column_layout(header: Sequence[str]) -> _ColumnLayout | None:
+    """Indeks (row_index, level, kolom yang disimpan) untuk header log; None jika kolom wajib tidak ada."""
+    if "row_index" not in header or "level" not in header:
+        return None
+    kept = tuple((name, header.index(name)) for name in _RESUME_KEPT_COLUMNS if name in header)
+    return header.index("row_index"), header.index("level"), kept
+
+
+# Header log SBR sendiri sudah pasti; indeksnya dihitung sekali saat impor, header lain lewat jalur lambat.
+_LOG_LAYOUT = _column_layout(LOG_FIELDS)
 
 
 def load_resume_entries(
@@ -21,27 +40,60 @@ def load_resume_entries(
         print(f"{_RESUME_PREFIX} Log sebelumnya tidak ditemukan.")
         return {}
 
+    # csv.reader + indeks kolom; selama scan hanya tuple kolom yang dipakai yang disimpan, dict dibuat
+    # sekali per row_index di akhir (bukan per entri OK). Entri terakhir untuk row_index yang sama menentukan.
+    eligible: Dict[int, tuple[str, ...]] = {}
+    kept: tuple[tuple[str, int], ...] = ()
     try:
         with log_path.open(newline="", encoding="utf-8") as handle:
-            reader = csv.DictReader(handle)
-            entries = {int(row["row_index"]): row for row in reader if row.get("row_index", "").isdigit()}
+            reader = csv.reader(handle)
+            header = tuple(next(reader, None) or ())
+            layout = _LOG_LAYOUT if header == LOG_FIELDS else _column_layout(header)
+            if layout is not None:
+                idx_col, level_col, kept = layout
+                for row in reader:
+                    if len(row) <= idx_col or not row[idx_col].isdigit():
+                        continue
+                    idx = int(row[idx_col])
+                    if idx < start_display or idx > end_display:
+                        continue
+                    level = row[level_col] if len(row) > level_col else ""
+                    if level.upper() in RESUME_ELIGIBLE_LEVELS:
+                        eligible[idx] = tuple(row[col] if col < len(row) else "" for _, col in kept)
+                    else:
+                        eligible.pop(idx, None)
     except Exception as exc:  # noqa: BLE001
         print(f"{_RESUME_PREFIX} Gagal membaca log: {describe_exception(exc)}")
         return {}
 
-    eligible: Dict[int, dict] = {}
-    for idx, row in entries.items():
-        if idx < start_display or idx > end_display:
-            continue
-        level = (row.get("level") or "").upper()
-        if level in RESUME_ELIGIBLE_LEVELS:
-            eligible[idx] = row
-
     if not eligible:
         print(f"{_RESUME_PREFIX} Tidak ada baris OK pada rentang yang diminta.")
     else:
         print(f"{_RESUME_PREFIX} {len(eligible)} baris akan dilewati berdasarkan log sebelumnya.")
-    return eligible
+    names = [name for name, _ in kept]
+    return {idx: dict(zip(names, values, strict=True)) for idx, values in eligible.items()}
+
+
+_LOG_PREFIX = "log_sbr_autofill"
+
+
+def _latest_matching(directory: Path) -> Path | None:
+    """Log terbaru di satu folder."""
+    # Satu kali scandir + max(): tanpa sort, dan di Windows stat() entry sudah ikut dari listing.
+    try:
+        with os.scandir(directory) as entries:
+            candidates = [
+                entry
+                for entry in entries
+                if entry.name.startswith(f"{_LOG_PREFIX}_") and entry.name.endswith(".csv") and entry.is_file()
+            ]
+    except OSError:
+        return None
+    newest = max(candidates, key=lambda entry: entry.stat().st_mtime, default=None)
+    if newest is not None:
+        return Path(newest.path)
+    legacy = directory / f"{_LOG_PREFIX}.csv"
+    return legacy if legacy.exists() else None
 
 
 def resolve_resume_log_path(current_log: Path) -> Path:
@@ -51,16 +103,6 @@ def resolve_resume_log_path(current_log: Path) -> Path:
 
     run_dir = current_log.parent
     base_dir = run_dir.parent if run_dir.parent != run_dir else run_dir
-    prefix = "log_sbr_autofill"
-
-    def _latest_matching(directory: Path) -> Path | None:
-        if not directory.exists():
-            return None
-        candidates = sorted(directory.glob(f"{prefix}_*.csv"), key=lambda p: p.stat().st_mtime, reverse=True)
-        if candidates:
-            return candidates[0]
-        legacy = directory / f"{prefix}.csv"
-        return legacy if legacy.exists() else None
 
     if run_dir.exists():
         found = _latest_matching(run_dir)
@@ -68,10 +110,19 @@ def resolve_resume_log_path(current_log: Path) -> Path:
             return found
 
     if base_dir.exists():
-        for candidate_dir in sorted([p for p in base_dir.iterdir() if p.is_dir()], reverse=True):
-            found = _latest_matching(candidate_dir)
+        with os.scandir(base_dir) as entries:
+            subdirs = [entry.path for entry in entries if entry.is_dir()]
+        # Folder terbaru (nama terbesar) hampir selalu berisi log: cukup max() satu lintasan; sort penuh
+        # hanya dilakukan bila folder itu kosong.
+        newest_dir = max(subdirs, default=None)
+        if newest_dir is not None:
+            found = _latest_matching(Path(newest_dir))
             if found:
                 return found
+            for candidate_dir in sorted(subdirs, reverse=True)[1:]:
+                found = _latest_matching(Path(candidate_dir))
+                if found:
+                    return found
 
         legacy = base_dir / current_log.name
         if base_dir != run_dir and legacy.exists():
@@ -1,71 +1,97 @@
 from __future__ import annotations
 
+import asyncio
 import re
 
 from playwright.async_api import Locator, Page
 
+try:  # belum diekspor publik oleh playwright.async_api
+    from playwright._impl._errors import TargetClosedError
+except ImportError:  # pragma: no cover - versi playwright lama
+    class TargetClosedError(Exception):  # type: ignore[no-redef]
+        pass
+
 from .config import RuntimeConfig
 from .form_filler import collect_error_hints
 from .models import RowContext, SubmitResult
-from .utils import norm_space, with_retry
+from .utils import BUTTON_CSS, VisibilityProbe, norm_space, probe_visibility, with_retry
+
+_SUBMIT_FINAL_RE = re.compile("Submit Final", re.I)
+_CANCEL_SUBMIT_RE = re.compile("Cancel Submit", re.I)
+_ERROR_FILL_RE = re.compile("Masih terdapat isian yang harus diperbaiki", re.I)
+_OK_RE = re.compile("^OK$", re.I)
+# Halaman/browser tertutup: percuma di-retry.
+_GIVE_UP_ON = (TargetClosedError,)
+_IGNORE_RE = re.compile("^Ignore$", re.I)
+
+# Semua probe di bawah dicek dalam satu page.evaluate per panggilan (bukan satu roundtrip per locator).
+_LOCK_PROBES = {
+    "edit_blocked": VisibilityProbe(text="tidak bisa melakukan edit"),
+    "edited_by_other": VisibilityProbe(text="sedang diedit oleh user lain"),
+    "back_home": VisibilityProbe(BUTTON_CSS, "Back to Home"),
+}
+_CANCEL_PROBES = {
+    "cancel": VisibilityProbe("button#cancel-submit-final, #cancel-submit-final"),
+    "cancel_role": VisibilityProbe(BUTTON_CSS, "Cancel Submit"),
+}
+_SUBMIT_PROBES = {
+    "submit_role": VisibilityProbe(BUTTON_CSS, "Submit Final"),
+    "submit_text": VisibilityProbe(text="Submit Final"),
+}
+_CONFIRM_CSS = (
+    "div.modal.show button, div.modal.show a, div[role='dialog'] button, div[role='dialog'] a"
+)
+_CONFIRM_PROBES = {"confirm": VisibilityProbe(_CONFIRM_CSS, "Ya, Submit")}
+_KONSISTENSI_PROBES = {"konsistensi": VisibilityProbe(text="Cek Konsistensi")}
+_AFTER_SUBMIT_PROBES = {
+    "error_fill": VisibilityProbe(text="Masih terdapat isian yang harus diperbaiki"),
+    **_KONSISTENSI_PROBES,
+    **_CONFIRM_PROBES,
+}
+_CLICK_MODAL_FIRST_BUTTON_JS = """
+() => {
+    const modal = document.querySelector('.modal.show,[role="dialog"]');
+    if (!modal) return;
+    const yes = modal.querySelector('button, a');
+    if (yes) yes.click();
+}
+"""
+_OK_PROBES = {"ok_button": VisibilityProbe(BUTTON_CSS, "OK", exact=True)}
+_TOAST_PROBES = {"toast": VisibilityProbe(".toast, .alert-success, .swal2-popup")}
+_AFTER_CONFIRM_PROBES = {**_CONFIRM_PROBES, **_TOAST_PROBES}
+_SUCCESS_PROBES = {**_OK_PROBES, **_TOAST_PROBES, **_SUBMIT_PROBES}
 
 
 async def is_locked_page(page: Page) -> bool:
-    patterns = [
-        re.compile("tidak bisa melakukan edit", re.I),
-        re.compile("sedang diedit oleh user lain", re.I),
-    ]
-    for pattern in patterns:
-        try:
-            locator = page.get_by_text(pattern)
-            await locator.wait_for(state="visible", timeout=1500)
-            return True
-        except Exception:  # noqa: BLE001
-            continue
-
     try:
-        back_btn = page.get_by_role("button", name=re.compile("Back to Home", re.I))
-        await back_btn.wait_for(state="visible", timeout=1500)
-        return True
+        found = await probe_visibility(page, _LOCK_PROBES, timeout_ms=1500)
     except Exception:  # noqa: BLE001
-        pass
-    return False
+        return False
+    return any(found.values())
 
 
 async def is_finalized_form(page: Page) -> bool:
-    cancel_btn = (
-        page.locator("button#cancel-submit-final, #cancel-submit-final")
-        .or_(page.get_by_role("button", name=re.compile("Cancel Submit", re.I)))
-        .first
-    )
-    submit_candidates = [
-        page.get_by_role("button", name=re.compile("Submit Final", re.I)).first,
-        page.locator("text=Submit Final").first,
-    ]
-
     try:
-        visible_cancel = await cancel_btn.is_visible(timeout=1500)
-    except Exception:
-        visible_cancel = False
-    if not visible_cancel:
+        found = await probe_visibility(
+            page, {**_CANCEL_PROBES, **_SUBMIT_PROBES}, wait_for=_CANCEL_PROBES, timeout_ms=1500
+        )
+    except Exception:  # noqa: BLE001
         return False
+    if not (found["cancel"] or found["cancel_role"]):
+        return False
+    return not (found["submit_role"] or found["submit_text"])
 
-    for candidate in submit_candidates:
-        try:
-            if await candidate.is_visible(timeout=800):
-                return False
-        except Exception:
-            continue
 
-    return True
+def _submit_final_locator(page: Page) -> Locator:
+    """Tombol Submit Final lewat role ATAU teks, digabung jadi satu locator."""
+    return page.get_by_role("button", name=_SUBMIT_FINAL_RE).or_(page.locator("text=Submit Final")).first
 
 
 async def submit_form(page: Page, ctx: RowContext, config: RuntimeConfig) -> SubmitResult:
-    btn_role = page.get_by_role("button", name=re.compile("Submit Final", re.I))
-    btn_text = page.locator("text=Submit Final").first
+    submit_btn = _submit_final_locator(page)
     cancel_btn = (
         page.locator("button#cancel-submit-final, #cancel-submit-final")
-        .or_(page.get_by_role("button", name=re.compile("Cancel Submit", re.I)))
+        .or_(page.get_by_role("button", name=_CANCEL_SUBMIT_RE))
         .first
     )
 
@@ -74,6 +100,8 @@ async def submit_form(page: Page, ctx: RowContext, config: RuntimeConfig) -> Sub
             if await locator.is_visible(timeout=800):
                 await locator.click()
                 return True
+        except TargetClosedError:
+            raise
         except Exception:
             return False
         return False
@@ -86,12 +114,12 @@ async def submit_form(page: Page, ctx: RowContext, config: RuntimeConfig) -> Sub
             return True
 
         try:
-            await with_retry(_op, attempts=3, delay_ms=150, backoff=1.4)
+            await with_retry(_op, attempts=3, delay_ms=150, backoff=1.4, give_up_on=_GIVE_UP_ON)
             return True
         except Exception:
             return False
 
-    if not (await click_with_retry(btn_role) or await click_with_retry(btn_text)):
+    if not await click_with_retry(submit_btn):
         try:
             if await cancel_btn.is_visible(timeout=800):
                 return SubmitResult("OK", "Lewati submit: form sudah final (hanya ada tombol Cancel Submit).")
@@ -103,97 +131,109 @@ async def submit_form(page: Page, ctx: RowContext, config: RuntimeConfig) -> Sub
             detail += f" | Petunjuk: {', '.join(hints)}"
         return SubmitResult("NO_SUBMIT_BUTTON", detail)
 
-    await page.wait_for_timeout(config.pause_after_submit_ms)
-
+    # Satu probe menunggu pesan error, dialog Cek Konsistensi, atau langsung dialog konfirmasi; jeda
+    # pause_after_submit_ms ikut menjadi batas tunggu sehingga selesai begitu salah satunya muncul.
     try:
-        err = page.get_by_text(re.compile("Masih terdapat isian yang harus diperbaiki", re.I))
-        await err.wait_for(state="visible", timeout=1000)
-        err_text = ""
+        after_submit = await probe_visibility(
+            page, _AFTER_SUBMIT_PROBES, timeout_ms=config.pause_after_submit_ms + 1800
+        )
+    except Exception:  # noqa: BLE001
+        after_submit = {}
+
+    if after_submit.get("error_fill"):
+        # Pesan error dan petunjuk field saling lepas; baca bersamaan sebelum popup ditutup.
+        err_text, hints = await asyncio.gather(
+            page.get_by_text(_ERROR_FILL_RE).first.text_content(timeout=1000),
+            collect_error_hints(page),
+            return_exceptions=True,
+        )
+        for outcome in (err_text, hints):
+            if isinstance(outcome, BaseException) and not isinstance(outcome, Exception):
+                raise outcome
+        err_text = "" if isinstance(err_text, Exception) else norm_space(err_text)
+        if isinstance(hints, Exception):
+            hints = []
+        ok = page.get_by_role("button", name=_OK_RE)
         try:
-            err_text = norm_space(await err.text_content())
+            if await ok.is_visible():
+                await ok.click()
         except Exception:
-            err_text = ""
-        ok = page.get_by_role("button", name=re.compile("^OK$", re.I))
-        if await ok.is_visible():
-            await ok.click()
-        hints = await collect_error_hints(page)
+            pass
         detail_parts = ["CODE:SUBMIT_ERROR_FILL Form menolak submit karena ada isian yang perlu diperbaiki."]
         if err_text:
             detail_parts.append(f"Pesan: {err_text}")
         if hints:
             detail_parts.append(f"Petunjuk: {', '.join(hints)}")
         return SubmitResult("ERROR_FILL", " | ".join(detail_parts))
-    except Exception:
-        pass
 
-    try:
-        kons = page.get_by_text(re.compile("Cek Konsistensi", re.I))
-        await kons.wait_for(state="visible", timeout=800)
-        ign = page.get_by_role("button", name=re.compile("^Ignore$", re.I))
-        if await ign.is_visible():
-            await ign.click(force=True)
-            await page.wait_for_timeout(250)
-    except Exception:
-        pass
+    if after_submit.get("konsistensi"):
+        try:
+            ign = page.get_by_role("button", name=_IGNORE_RE)
+            if await ign.is_visible():
+                await ign.click(force=True)
+                await probe_visibility(
+                    page, _KONSISTENSI_PROBES, wait_for_hidden=_KONSISTENSI_PROBES, timeout_ms=1500
+                )
+        except Exception:
+            pass
 
+    # Dialog konfirmasi ditunggu di browser (event-driven) alih-alih polling 10x200 ms dari Python;
+    # bila probe setelah submit sudah melihatnya (tanpa dialog konsistensi), tidak perlu probe lagi.
     clicked_confirm = False
-    for _ in range(10):
+    confirm_visible = bool(after_submit.get("confirm")) and not after_submit.get("konsistensi")
+    if not confirm_visible:
+        try:
+            confirm_visible = (await probe_visibility(page, _CONFIRM_PROBES, timeout_ms=2000))["confirm"]
+        except Exception:  # noqa: BLE001
+            confirm_visible = False
+    if confirm_visible:
         ya = page.locator("div.modal.show, div[role='dialog']").locator(
             "button:has-text('Ya, Submit'), a:has-text('Ya, Submit'), button:has-text('Ya, Submit!'), a:has-text('Ya, Submit!')"
         ).first
-        if await ya.count() > 0 and await ya.is_visible():
-            async def _click_confirm():
-                try:
-                    await ya.click(force=True)
-                except Exception:
-                    await page.evaluate(
-                        """
-                        () => {
-                            const modal = document.querySelector('.modal.show,[role="dialog"]');
-                            if (!modal) return;
-                            const yes = modal.querySelector('button, a');
-                            if (yes) yes.click();
-                        }
-                        """
-                    )
 
+        async def _click_confirm():
             try:
-                await with_retry(_click_confirm, attempts=3, delay_ms=120, backoff=1.3)
-                clicked_confirm = True
-                await page.wait_for_timeout(400)
-                break
+                await ya.click(force=True)
+            except TargetClosedError:
+                raise
             except Exception:
-                pass
-        await page.wait_for_timeout(200)
+                await page.evaluate(_CLICK_MODAL_FIRST_BUTTON_JS)
 
-    success_seen = False
-    for _ in range(20):
         try:
-            okb = page.get_by_role("button", name=re.compile("^OK$", re.I))
-            if await okb.is_visible():
-                try:
-                    await with_retry(lambda: okb.click(force=True), attempts=2, delay_ms=100, backoff=1.2)
-                    await page.wait_for_timeout(150)
-                    success_seen = True
-                    break
-                except Exception:
-                    pass
+            await with_retry(_click_confirm, attempts=3, delay_ms=120, backoff=1.3, give_up_on=_GIVE_UP_ON)
+            clicked_confirm = True
+            await probe_visibility(
+                page, _AFTER_CONFIRM_PROBES, wait_for=("toast",), wait_for_hidden=_CONFIRM_PROBES, timeout_ms=800
+            )
         except Exception:
             pass
 
-        toast = page.locator(".toast, .alert-success, .swal2-popup").first
+    # Sinyal sukses: tombol OK, toast, atau tombol Submit Final hilang; satu evaluate menunggu yang
+    # pertama muncul (pengganti loop 20x pengecekan).
+    try:
+        signals = await probe_visibility(
+            page,
+            _SUCCESS_PROBES,
+            wait_for=("ok_button", "toast"),
+            wait_for_hidden=_SUBMIT_PROBES,
+            timeout_ms=4000,
+        )
+    except Exception:  # noqa: BLE001
+        signals = {"submit_role": True}
+
+    success_seen = False
+    if signals.get("ok_button"):
+        okb = page.get_by_role("button", name=_OK_RE)
         try:
-            if await toast.is_visible(timeout=120):
-                success_seen = True
-                break
+            await with_retry(
+                lambda: okb.click(force=True), attempts=2, delay_ms=100, backoff=1.2, give_up_on=_GIVE_UP_ON
+            )
+            success_seen = True
+            await probe_visibility(page, _OK_PROBES, wait_for_hidden=_OK_PROBES, timeout_ms=600)
         except Exception:
             pass
-
-        if not await submit_still_visible(page):
-            success_seen = True
-            break
-
-        await page.wait_for_timeout(200)
+    if signals.get("toast") or not (signals.get("submit_role") or signals.get("submit_text")):
+        success_seen = True
 
     if success_seen:
         return SubmitResult("OK", "Submit final sukses")
@@ -207,9 +247,8 @@ async def submit_form(page: Page, ctx: RowContext, config: RuntimeConfig) -> Sub
 
 
 async def submit_still_visible(page: Page) -> bool:
-    btn_role = page.get_by_role("button", name=re.compile("Submit Final", re.I))
-    btn_text = page.locator("text=Submit Final").first
     try:
-        return await btn_role.is_visible(timeout=120) or await btn_text.is_visible(timeout=120)
-    except Exception:
+        found = await probe_visibility(page, _SUBMIT_PROBES)
+    except Exception:  # noqa: BLE001
         return True
+    return found["submit_role"] or found["submit_text"]
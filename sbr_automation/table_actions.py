@@ -1,8 +1,7 @@
 from __future__ import annotations
 
 import re
-import time
-from typing import Optional
+import weakref
 
 from playwright.async_api import (
     Error as PlaywrightError,
@@ -15,6 +14,7 @@ from .playwright_helpers import ensure_click
 
 
 TABLE_SELECTOR = "#table_direktori_usaha"
+_NUM_RE = re.compile(r"-?\d+(?:\.\d+)?")
 TABLE_WRAPPER_SELECTOR = "#table_direktori_usaha_wrapper"
 SEARCH_INPUT_SELECTORS = (
     "#table_direktori_usaha_filter input[type='search']",
@@ -26,8 +26,31 @@ PROCESSING_SELECTORS = (
     ".blockUI.blockOverlay",
 )
 
+# Kotak pencarian hasil penelusuran terakhir per Page; tetap sama selama tabel tidak dirender ulang.
+_SEARCH_BOX_CACHE: weakref.WeakKeyDictionary[Page, Locator] = weakref.WeakKeyDictionary()
 
-async def _locate_search_box(page: Page) -> Optional[Locator]:
+
+async def _locate_search_box(page: Page) -> Locator | None:
+    cached = _SEARCH_BOX_CACHE.get(page)
+    if cached is not None:
+        if await cached.count() > 0:
+            return cached
+        _SEARCH_BOX_CACHE.pop(page, None)
+
+    found = await _discover_search_box(page)
+    if found is not None:
+        _SEARCH_BOX_CACHE[page] = found
+    return found
+
+
+_CANDIDATE_LABELS_JS = """
+els => els.map((el) => ['placeholder', 'aria-label', 'name']
+    .map((attr) => (el.getAttribute(attr) || '').toLowerCase())
+    .join(' '))
+"""
+
+
+async def _discover_search_box(page: Page) -> Locator | None:
     for selector in SEARCH_INPUT_SELECTORS:
         candidate = page.locator(selector)
         if await candidate.count() > 0:
@@ -39,80 +62,79 @@ async def _locate_search_box(page: Page) -> Optional[Locator]:
     except PlaywrightTimeoutError:
         return None
 
-    candidates: list[Locator] = []
-
-    header_inputs = table.locator("thead input")
-    header_count = await header_inputs.count()
-    for idx in range(header_count):
-        candidates.append(header_inputs.nth(idx))
-
-    fallback_inputs = table.locator("tfoot input")
-    fallback_count = await fallback_inputs.count()
-    for idx in range(fallback_count):
-        candidates.append(fallback_inputs.nth(idx))
+    # Atribut semua input thead/tfoot dibaca sekaligus dalam satu panggilan.
+    candidates = table.locator("thead input, tfoot input")
+    try:
+        labels = await candidates.evaluate_all(_CANDIDATE_LABELS_JS)
+    except PlaywrightError:
+        return None
 
-    for locator in candidates:
-        placeholder = (await locator.get_attribute("placeholder") or "").lower()
-        aria = (await locator.get_attribute("aria-label") or "").lower()
-        name_attr = (await locator.get_attribute("name") or "").lower()
-        label = f"{placeholder} {aria} {name_attr}"
+    for idx, label in enumerate(labels):
         if "idsbr" in label or "id sbr" in label:
-            return locator
+            return candidates.nth(idx)
 
-    if candidates:
-        return candidates[0]
+    if labels:
+        return candidates.first
     return None
 
 
-async def _is_selector_visible(page: Page, selector: str) -> bool:
-    try:
-        return await page.evaluate(
-            """
-            sel => {
-                const el = document.querySelector(sel);
-                if (!el) return false;
-                const style = window.getComputedStyle(el);
-                if (style.visibility === 'hidden' || style.display === 'none') return false;
-                const opacity = parseFloat(style.opacity || '1');
-                if (opacity === 0) return false;
-                const rect = el.getBoundingClientRect();
-                return rect.width > 0 && rect.height > 0;
-            }
-            """,
-            selector,
-        )
-    except Exception:  # noqa: BLE001
-        return False
+# Tunggu overlay proses DataTables hilang (tenang >= quiet ms) dalam satu evaluate, tanpa polling dari Python.
+_WAIT_TABLE_IDLE_JS = """
+({sels, timeout, quiet}) => new Promise((resolve) => {
+    const visible = () => sels.some((sel) => {
+        const el = document.querySelector(sel);
+        if (!el) return false;
+        const style = window.getComputedStyle(el);
+        if (style.visibility === 'hidden' || style.display === 'none') return false;
+        if (parseFloat(style.opacity || '1') === 0) return false;
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    });
+    const start = performance.now();
+    let lastSeen = start;
+    let seen = false;
+    let observer = null;
+    let timer = null;
+    const finish = (state) => {
+        if (observer) observer.disconnect();
+        clearInterval(timer);
+        resolve({state, seen});
+    };
+    const tick = () => {
+        const now = performance.now();
+        if (visible()) {
+            lastSeen = now;
+            seen = true;
+        } else if (now - lastSeen >= quiet) {
+            return finish('idle');
+        }
+        if (now - start >= timeout) finish('timeout');
+    };
+    observer = new MutationObserver(tick);
+    observer.observe(document.body || document.documentElement, {
+        subtree: true, childList: true, attributes: true, attributeFilter: ['style', 'class'],
+    });
+    timer = setInterval(tick, 60);
+    tick();
+})
+"""
 
 
 async def _wait_table_idle(page: Page, timeout: int) -> None:
-    deadline = time.monotonic() + timeout / 1000
-    idle_confirmations = 0
-    announced_wait = False
-
-    while time.monotonic() < deadline:
-        if page.is_closed():
-            return
-
-        overlay_visible = False
-        for selector in PROCESSING_SELECTORS:
-            if await _is_selector_visible(page, selector):
-                overlay_visible = True
-                break
-
-        if not overlay_visible:
-            idle_confirmations += 1
-            if announced_wait:
-                print("    [Tabel] Selesai memuat.")
-                announced_wait = False
-            if idle_confirmations >= 2:
-                return
+    if page.is_closed():
+        return
+    try:
+        result = await page.evaluate(
+            _WAIT_TABLE_IDLE_JS,
+            {"sels": list(PROCESSING_SELECTORS), "timeout": timeout, "quiet": 240},
+        )
+    except PlaywrightError:
+        return
+    if result.get("seen"):
+        if result.get("state") == "idle":
+            print("    [Tabel] Selesai memuat.")
         else:
-            idle_confirmations = 0
-            if not announced_wait:
-                print("    [Tabel] Menunggu tabel selesai memuat...")
-                announced_wait = True
-        await page.wait_for_timeout(120)
+            print("    [Tabel] Tabel masih memuat, lanjutkan.")
 
 
 async def _set_input_value(locator: Locator, value: str) -> None:
@@ -127,16 +149,58 @@ async def _set_input_value(locator: Locator, value: str) -> None:
     )
 
 
-async def _apply_table_search(page: Page, text: str, timeout: int) -> bool:
-    search_box = await _locate_search_box(page)
-    if not search_box:
-        return False
+# Jalur utama: API DataTables (search().draw()) lalu tunggu event draw.dt, semuanya dalam satu evaluate.
+_DT_SEARCH_JS = """
+async ({tableSel, inputSel, value, timeoutMs}) => {
+    const $ = window.jQuery;
+    const table = document.querySelector(tableSel);
+    if (!$ || !table || !$.fn || !$.fn.dataTable || !$.fn.dataTable.isDataTable(table)) return 'none';
+    const api = $(table).DataTable();
+    if (api.search() === value) return 'same';
+    const drawn = new Promise((resolve) => {
+        const timer = setTimeout(() => resolve('timeout'), timeoutMs);
+        $(table).one('draw.dt', () => { clearTimeout(timer); resolve('dt'); });
+    });
+    for (const input of document.querySelectorAll(inputSel)) input.value = value;
+    api.search(value).draw();
+    return await drawn;
+}
+"""
+
+
+async def _datatables_search(page: Page, text: str, timeout: int) -> str:
+    """Filter tabel lewat API DataTables; hasil 'dt'/'same'/'timeout', atau 'none' bila API tidak tersedia."""
+    try:
+        return await page.evaluate(
+            _DT_SEARCH_JS,
+            {
+                "tableSel": TABLE_SELECTOR,
+                "inputSel": ", ".join(SEARCH_INPUT_SELECTORS),
+                "value": text,
+                "timeoutMs": timeout,
+            },
+        )
+    except PlaywrightError:
+        return "none"
+
 
+async def _apply_table_search(page: Page, text: str, timeout: int) -> bool:
     if text:
         print(f"    [Cari] Terapkan filter: {text}")
     else:
         print("    [Cari] Hapus filter tabel")
 
+    via_api = await _datatables_search(page, text, min(timeout, 4000))
+    if via_api in ("dt", "same"):
+        return True
+    if via_api == "timeout":
+        await _wait_table_idle(page, min(timeout, 4000))
+        return True
+
+    search_box = await _locate_search_box(page)
+    if not search_box:
+        return False
+
     try:
         await search_box.wait_for(state="visible", timeout=timeout)
     except PlaywrightTimeoutError:
@@ -157,16 +221,62 @@ async def _apply_table_search(page: Page, text: str, timeout: int) -> bool:
     return True
 
 
-async def _await_row(table: Locator, row: Locator, timeout: int) -> Optional[Locator]:
+# Balapan di browser: baris yang memuat teks muncul ('row') vs tabel kosong ('empty') vs 'timeout'.
+_AWAIT_ROW_JS = """
+({tableSel, text, timeoutMs}) => new Promise((resolve) => {
+    const needle = text.toLowerCase();
+    const shown = (el) => !!(el.offsetParent || el.getClientRects().length);
+    const check = () => {
+        const table = document.querySelector(tableSel);
+        if (!table) return null;
+        for (const tr of table.querySelectorAll('tbody tr')) {
+            if (tr.querySelector('td.dataTables_empty')) {
+                if (shown(tr)) return 'empty';
+                continue;
+            }
+            const content = (tr.textContent || '').replace(/\\s+/g, ' ').toLowerCase();
+            if (content.includes(needle) && shown(tr)) return 'row';
+        }
+        return null;
+    };
+    let observer = null;
+    let timer = null;
+    const finish = (state) => {
+        if (observer) observer.disconnect();
+        clearTimeout(timer);
+        resolve(state);
+    };
+    const first = check();
+    if (first) return resolve(first);
+    observer = new MutationObserver(() => {
+        const state = check();
+        if (state) finish(state);
+    });
+    observer.observe(document.body || document.documentElement, {
+        subtree: true, childList: true, attributes: true, characterData: true,
+    });
+    timer = setTimeout(() => finish(check() || 'timeout'), timeoutMs);
+})
+"""
+
+
+async def _await_row(page: Page, row: Locator, text: str, timeout: int) -> Locator | None:
+    """Tunggu baris hasil filter; berhenti lebih awal bila DataTables menampilkan tabel kosong."""
     try:
-        await row.wait_for(state="visible", timeout=timeout)
+        state = await page.evaluate(
+            _AWAIT_ROW_JS, {"tableSel": TABLE_SELECTOR, "text": text, "timeoutMs": timeout}
+        )
+    except PlaywrightError:
+        state = "timeout"
+    if state == "row":
+        return row
+    if state == "empty":
+        return None
+    # Cadangan bila pencocokan teks di JS berbeda dari has_text Playwright.
+    try:
+        await row.wait_for(state="visible", timeout=500)
         return row
     except PlaywrightTimeoutError:
-        empty = table.locator("tbody tr td.dataTables_empty").first
-        try:
-            await empty.wait_for(state="visible", timeout=500)
-        except PlaywrightTimeoutError:
-            pass
         return None
 
 
@@ -175,34 +285,74 @@ def _text_variants(raw_text: str) -> list[str]:
     if not base:
         return []
 
-    variants = [base]
+    if base.isdecimal():
+        # Jalur cepat IDSBR (angka bulat): cukup base, plus varian tanpa nol di depan bila ada.
+        trimmed = base.lstrip("0") or "0"
+        return [base] if trimmed == base else [base, trimmed]
 
+    # dict menjaga urutan sekaligus membuang duplikat dalam satu lintasan.
     decimal_variant = base.replace(",", ".")
-    if decimal_variant not in variants:
-        variants.append(decimal_variant)
+    variants = dict.fromkeys((base, decimal_variant))
 
-    if re.fullmatch(r"-?\d+(?:\.\d+)?", decimal_variant):
+    if _NUM_RE.fullmatch(decimal_variant) and "." in decimal_variant:
         stripped = decimal_variant.rstrip("0").rstrip(".")
-        if stripped and stripped not in variants:
-            variants.append(stripped)
+        if stripped:
+            variants.setdefault(stripped)
         try:
             numeric = float(decimal_variant)
         except ValueError:
             pass
         else:
             if numeric.is_integer():
-                integer_form = str(int(numeric))
-                if integer_form not in variants:
-                    variants.append(integer_form)
-
-    # Preserve order while dropping duplicates
-    seen = set()
-    ordered = []
-    for variant in variants:
-        if variant not in seen:
-            ordered.append(variant)
-            seen.add(variant)
-    return ordered
+                variants.setdefault(str(int(numeric)))
+
+    return list(variants)
+
+
+# Cari baris + tombol edit lalu klik dalam satu evaluate; hasil 'clicked' / 'no_btn' / 'no_row'.
+_CLICK_EDIT_IN_ROW_JS = """
+({tableSel, needle}) => {
+    const table = document.querySelector(tableSel);
+    if (!table) return 'no_row';
+    const n = needle.toLowerCase();
+    for (const tr of table.querySelectorAll('tbody tr')) {
+        const content = (tr.textContent || '').replace(/\\s+/g, ' ').toLowerCase();
+        if (!content.includes(n)) continue;
+        const btn = tr.querySelector('td div.d-flex.align-items-center.col-actions a.btn-edit-perusahaan')
+            || tr.querySelector('td div.col-actions a');
+        if (!btn) return 'no_btn';
+        btn.scrollIntoView({block: 'center'});
+        btn.click();
+        return 'clicked';
+    }
+    return 'no_row';
+}
+"""
+
+
+async def _click_edit_in_row(page: Page, needle: str) -> str:
+    try:
+        return await page.evaluate(_CLICK_EDIT_IN_ROW_JS, {"tableSel": TABLE_SELECTOR, "needle": needle})
+    except PlaywrightError:
+        return "no_row"
+
+
+# Link Edit dari satu-satunya baris yang punya sel (atau elemen di dalam sel) dengan teks persis sama dengan target.
+# Lebih dari satu baris cocok dianggap ambigu sehingga hasilnya kosong.
+_EXACT_ROW_EDIT_HREF_JS = """
+({tableSel, needle}) => {
+    const table = document.querySelector(tableSel);
+    if (!table) return '';
+    const norm = (s) => (s || '').replace(/\\s+/g, ' ').trim().toLowerCase();
+    const n = norm(needle);
+    const matches = Array.from(table.querySelectorAll('tbody tr')).filter((tr) =>
+        Array.from(tr.querySelectorAll('td, td *')).some((el) => norm(el.textContent) === n));
+    if (matches.length !== 1) return '';
+    const link = matches[0].querySelector('a.btn-edit-perusahaan')
+        || matches[0].querySelector('td div.col-actions a');
+    return link && link.href ? link.href : '';
+}
+"""
 
 
 async def click_edit_by_index(page: Page, index0: int, *, timeout: int, perform_click: bool = True) -> bool:
@@ -231,6 +381,41 @@ async def click_edit_by_index(page: Page, index0: int, *, timeout: int, perform_
     return bool(ok)
 
 
+async def find_edit_href_by_text(page: Page, text: str, *, timeout: int) -> str:
+    """Ambil link Edit baris target selagi filter tabel masih aktif; kosong bila tidak ada/ambigu.
+
+    Baris harus cocok persis (per sel) dengan IDSBR/nama, bukan sekadar memuat teksnya, agar tab form
+    yang dipakai ulang tidak diarahkan ke usaha lain.
+    """
+    text = text.strip()
+    if not text:
+        return ""
+
+    table = page.locator(TABLE_SELECTOR)
+    await table.wait_for(state="visible", timeout=timeout)
+    await _wait_table_idle(page, timeout)
+
+    filtered = False
+    try:
+        for candidate in _text_variants(text):
+            used_filter = await _apply_table_search(page, candidate, timeout)
+            filtered = filtered or used_filter
+            if used_filter:
+                row_locator = table.locator("tbody tr").filter(has_text=re.compile(re.escape(candidate), re.I)).first
+                if await _await_row(page, row_locator, candidate, timeout) is None:
+                    continue
+            try:
+                href = await page.evaluate(_EXACT_ROW_EDIT_HREF_JS, {"tableSel": TABLE_SELECTOR, "needle": candidate})
+            except PlaywrightError:
+                href = ""
+            if href:
+                return href
+        return ""
+    finally:
+        if filtered:
+            await _apply_table_search(page, "", timeout)
+
+
 async def click_edit_by_text(page: Page, text: str, *, timeout: int, perform_click: bool = True) -> bool:
     text = text.strip()
     if not text:
@@ -242,58 +427,57 @@ async def click_edit_by_text(page: Page, text: str, *, timeout: int, perform_cli
     await table.wait_for(state="visible", timeout=timeout)
     await _wait_table_idle(page, timeout)
 
-    for candidate in _text_variants(text):
-        pattern = re.compile(re.escape(candidate), re.I)
-        used_filter = await _apply_table_search(page, candidate, timeout)
-        row_locator = table.locator("tbody tr").filter(has_text=pattern).first
-
-        if used_filter:
-            await _wait_table_idle(page, timeout)
-
-        row: Optional[Locator]
-        if used_filter:
-            row = await _await_row(table, row_locator, timeout)
-        else:
-            try:
-                await row_locator.wait_for(state="visible", timeout=timeout)
-                row = row_locator
-            except PlaywrightTimeoutError:
-                row = None
-
-        if not row:
-            print(f"    [Cari] Tidak menemukan baris untuk '{candidate}'.")
+    # Filter berikutnya langsung menggantikan filter sebelumnya; filter hanya dihapus sekali di akhir.
+    filtered = False
+    try:
+        for candidate in _text_variants(text):
+            pattern = re.compile(re.escape(candidate), re.I)
+            used_filter = await _apply_table_search(page, candidate, timeout)
+            filtered = filtered or used_filter
+            row_locator = table.locator("tbody tr").filter(has_text=pattern).first
+
+            # _apply_table_search sudah menunggu draw.dt (jalur API) atau tabel idle (jalur input/timeout).
+            row: Locator | None
             if used_filter:
-                await _apply_table_search(page, "", timeout)
-            continue
-
-        btn = row.locator("css=td >> div.d-flex.align-items-center.col-actions >> a.btn-edit-perusahaan").first
-        if await btn.count() > 0:
-            print("    [Klik] Tombol edit ditemukan (primary selector).")
-            if perform_click:
-                ok = await ensure_click(btn, name="Edit by text", timeout=timeout, attempts=1)
-                if used_filter:
-                    await _apply_table_search(page, "", timeout)
-                if ok:
-                    return True
+                row = await _await_row(page, row_locator, candidate, timeout)
+            else:
+                try:
+                    await row_locator.wait_for(state="visible", timeout=timeout)
+                    row = row_locator
+                except PlaywrightTimeoutError:
+                    row = None
+
+            if not row:
+                print(f"    [Cari] Tidak menemukan baris untuk '{candidate}'.")
                 continue
-            if used_filter:
-                await _apply_table_search(page, "", timeout)
-            return True
 
-        fallback = row.locator("xpath=.//td[div[contains(@class,'col-actions')]]//a[1]")
-        if await fallback.count() > 0:
-            print("    [Klik] Tombol edit ditemukan (fallback selector).")
-            if perform_click:
-                ok = await ensure_click(fallback, name="Edit by text (fallback)", timeout=timeout, attempts=1)
-                if used_filter:
-                    await _apply_table_search(page, "", timeout)
-                if ok:
-                    return True
-                continue
-            if used_filter:
-                await _apply_table_search(page, "", timeout)
-            return True
+            # Jalur cepat: temukan dan klik tombol edit dalam satu round-trip; jalur locator di bawah
+            # tetap menjadi cadangan bila JS tidak menemukan baris/tombol.
+            if perform_click and await _click_edit_in_row(page, candidate) == "clicked":
+                print("    [Klik] Tombol edit diklik (JS).")
+                return True
+
+            btn = row.locator("css=td >> div.d-flex.align-items-center.col-actions >> a.btn-edit-perusahaan").first
+            if await btn.count() > 0:
+                print("    [Klik] Tombol edit ditemukan (primary selector).")
+                if perform_click:
+                    if await ensure_click(btn, name="Edit by text", timeout=timeout, attempts=1):
+                        return True
+                    continue
+                return True
+
+            fallback = row.locator("xpath=.//td[div[contains(@class,'col-actions')]]//a[1]")
+            if await fallback.count() > 0:
+                print("    [Klik] Tombol edit ditemukan (fallback selector).")
+                if perform_click:
+                    if await ensure_click(fallback, name="Edit by text (fallback)", timeout=timeout, attempts=1):
+                        return True
+                    continue
+                return True
+
+            print("    [Klik] Tombol edit tidak tersedia pada baris yang ditemukan.")
 
-        print("    [Klik] Tombol edit tidak tersedia pada baris yang ditemukan.")
-
-    return False
+        return False
+    finally:
+        if filtered:
+            await _apply_table_search(page, "", timeout)
@@ -1,17 +1,27 @@
 from __future__ import annotations
 
 import asyncio
+import random
 import re
+import sys
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import TYPE_CHECKING
 
-import pandas as pd
-from playwright.async_api import Page
+if TYPE_CHECKING:  # hanya untuk anotasi; config/CLI tidak perlu memuat pandas/playwright
+    import pandas as pd
+    from playwright.async_api import Page
 
 
 TIMESTAMP_FMT = "%Y%m%d_%H%M%S"
+_WS_RE = re.compile(r"\s+")
+_FLOAT_RE = re.compile(r"-?\d+(?:\.\d+)?")
+_SAFE_LABEL_RE = re.compile(r"[^a-zA-Z0-9_-]+")
+# Tabel translate yang membuang semua karakter ASCII selain 0-9 (loop di C, bukan per karakter di Python).
+_NON_DIGIT_TABLE = str.maketrans("", "", "".join(chr(code) for code in range(128) if not chr(code).isdecimal()))
 
 
 def timestamp() -> str:
@@ -19,38 +29,82 @@ def timestamp() -> str:
     return datetime.now().strftime(TIMESTAMP_FMT)
 
 
+# Nilai sel Excel banyak berulang (status, sumber, kode wilayah): hasil normalisasi di-memo per teks.
+# split()/join dan filter(str.isdecimal) setara dengan regex \s+ / \d tetapi jauh lebih murah pada
+# string pendek.
+@lru_cache(maxsize=8192)
+def _norm_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+def digits_only(text: str) -> str:
+    """Sisakan digit saja; ASCII lewat tabel translate, selain itu lewat str.isdecimal."""
+    if text.isascii():
+        return text.translate(_NON_DIGIT_TABLE)
+    return "".join(filter(str.isdecimal, text))
+
+
+_phone_digits = lru_cache(maxsize=8192)(digits_only)
+
+
+def first_float(text: str) -> str:
+    """Token angka pertama (koma dibaca sebagai titik desimal), atau "" bila tidak ada."""
+    match = _FLOAT_RE.search(text.replace(",", "."))
+    return match.group(0) if match else ""
+
+
+_first_float = lru_cache(maxsize=8192)(first_float)
+
+
 def norm_space(value: object) -> str:
-    """Normalize whitespace and coerce NaN/None to empty string."""
+    """Normalize whitespace and coerce NaN/None/pd.NA to empty string."""
+    if isinstance(value, str):
+        return _norm_text(value) if value else ""
     if value is None:
         return ""
-    if isinstance(value, float) and pd.isna(value):
+    if isinstance(value, float) and value != value:  # NaN (termasuk numpy.float64)
+        return ""
+    # pd.NA hanya mungkin muncul bila pandas sudah dimuat; modul ini sendiri tidak mengimpornya.
+    pandas = sys.modules.get("pandas")
+    if pandas is not None and value is pandas.NA:
         return ""
-    if isinstance(value, str):
-        return re.sub(r"\s+", " ", value).strip()
     # pandas may give numpy scalars; cast to string first
-    return re.sub(r"\s+", " ", str(value)).strip()
+    return _norm_text(str(value))
+
+
+def norm_space_series(values: pd.Series) -> pd.Series:
+    """Versi tervektor dari `norm_space` untuk satu kolom."""
+    return values.astype("string").str.replace(_WS_RE, " ", regex=True).str.strip().fillna("").astype(object)
 
 
 def nonempty(value: object) -> bool:
     """Return True when a value is not null/empty/whitespace-only."""
+    if isinstance(value, str):
+        # Jalur cepat: string tidak perlu normalisasi penuh untuk tahu kosong/tidak.
+        return bool(value) and not value.isspace()
+    if value is None:
+        return False
     return bool(norm_space(value))
 
 
 def norm_phone(value: object) -> str:
     """Keep only digits of telephone input."""
-    digits = re.findall(r"\d", norm_space(value))
-    return "".join(digits)
+    return _phone_digits(norm_space(value))
 
 
 def norm_float(value: object) -> str:
     """Extract first float-compatible token from text."""
-    text = norm_space(value).replace(",", ".")
-    match = re.search(r"-?\d+(?:\.\d+)?", text)
-    return match.group(0) if match else ""
+    return _first_float(norm_space(value))
+
+
+# Folder yang sudah dipastikan ada; mkdir hanya sekali per folder, bukan per screenshot/baris.
+_KNOWN_DIRS: set[Path] = set()
 
 
 def ensure_directory(path: Path) -> Path:
-    path.mkdir(parents=True, exist_ok=True)
+    if path not in _KNOWN_DIRS:
+        path.mkdir(parents=True, exist_ok=True)
+        _KNOWN_DIRS.add(path)
     return path
 
 
@@ -69,7 +123,7 @@ def signal_attention(flag_path: Path | None) -> None:
     if not flag_path:
         return
     try:
-        flag_path.parent.mkdir(parents=True, exist_ok=True)
+        ensure_directory(flag_path.parent)
         flag_path.touch(exist_ok=True)
     except Exception:
         pass
@@ -77,17 +131,35 @@ def signal_attention(flag_path: Path | None) -> None:
 
 @dataclass(slots=True)
 class ScreenshotResult:
-    path: Optional[Path]
+    path: Path | None
     reason: str | None = None
 
 
-async def take_screenshot(page: Page, dest_dir: Path, label: str) -> ScreenshotResult:
-    """Capture screenshot with sanitized filename."""
-    safe_label = re.sub(r"[^a-zA-Z0-9_-]+", "-", label).strip("-") or "capture"
+async def take_screenshot(
+    page: Page,
+    dest_dir: Path,
+    label: str,
+    *,
+    full_page: bool = False,
+    pending_writes: list[asyncio.Future] | None = None,
+) -> ScreenshotResult:
+    """Capture screenshot with sanitized filename.
+
+    Default hanya viewport; ``full_page=True`` (layout ulang seluruh dokumen, PNG besar) dipakai
+    bila konteks di luar layar memang dibutuhkan. File selalu ditulis di thread terpisah. Jika
+    ``pending_writes`` diberikan, penulisan tidak ditunggu: future-nya ditambahkan ke daftar
+    tersebut; tunggu daftar itu sebelum log disimpan.
+    """
+    safe_label = _SAFE_LABEL_RE.sub("-", label).strip("-") or "capture"
     filename = f"{timestamp()}_{safe_label[:40]}.png"
     target = ensure_directory(dest_dir) / filename
     try:
-        await page.screenshot(path=str(target), full_page=True)
+        data = await page.screenshot(full_page=full_page, type="png")
+        write = asyncio.to_thread(target.write_bytes, data)
+        if pending_writes is None:
+            await write
+        else:
+            pending_writes.append(asyncio.ensure_future(write))
         return ScreenshotResult(target)
     except Exception as exc:  # noqa: BLE001
         return ScreenshotResult(None, reason=str(exc))
@@ -113,18 +185,136 @@ async def with_retry(
     attempts: int = 3,
     delay_ms: int = 150,
     backoff: float = 1.5,
+    max_delay_ms: int = 30_000,
+    jitter: str = "full",
+    retry_on: tuple[type[BaseException], ...] = (Exception,),
+    give_up_on: tuple[type[BaseException], ...] = (),
 ) -> object:
-    """Jalankan coroutine dengan retry dan backoff sederhana."""
+    """Jalankan coroutine dengan retry, backoff eksponensial dan full jitter.
+
+    Exception di ``give_up_on`` (atau di luar ``retry_on``) langsung diteruskan tanpa retry.
+    """
     last_exc: Exception | None = None
-    wait = delay_ms / 1000
+    max_delay = max_delay_ms / 1000
+    delay = min(max_delay, delay_ms / 1000)
     for i in range(attempts):
         try:
             return await fn()
         except Exception as exc:  # noqa: BLE001
+            if isinstance(exc, give_up_on) or not isinstance(exc, retry_on):
+                raise
             last_exc = exc
             if i == attempts - 1:
                 break
-            await asyncio.sleep(wait)
-            wait *= backoff
+            # Jeda berjalan (delay *= backoff) menggantikan pangkat per percobaan; jeda 0 tidak menjadwalkan sleep.
+            wait = random.uniform(0, delay) if jitter == "full" else delay
+            if backoff != 1.0:
+                delay = min(max_delay, delay * backoff)
+            if wait > 0:
+                await asyncio.sleep(wait)
     if last_exc:
         raise last_exc
+
+
+# Padanan CSS untuk get_by_role("button") pada probe_visibility.
+BUTTON_CSS = "button, [role='button'], input[type='button'], input[type='submit']"
+
+
+@dataclass(slots=True, frozen=True)
+class VisibilityProbe:
+    """Target probe_visibility: elemen `css` (opsional disaring label/teksnya) atau, tanpa css, teks yang tampil."""
+
+    css: str = ""
+    text: str = ""
+    exact: bool = False
+
+
+_PROBE_VISIBILITY_JS = """
+async ({probes, until, hidden, timeoutMs}) => {
+    const isVisible = (el) => {
+        const style = window.getComputedStyle(el);
+        if (style.visibility === 'hidden' || style.display === 'none') return false;
+        if (parseFloat(style.opacity || '1') === 0) return false;
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    };
+    const label = (el) => (el.innerText || el.value || el.getAttribute('aria-label') || '').trim().toLowerCase();
+    const scan = () => {
+        let bodyText = null;
+        const out = {};
+        for (const p of probes) {
+            if (!p.css) {
+                // innerText hanya memuat teks yang dirender, jadi teks tersembunyi tidak ikut.
+                if (bodyText === null) bodyText = (document.body ? document.body.innerText : '').toLowerCase();
+                out[p.key] = !!p.text && bodyText.includes(p.text);
+                continue;
+            }
+            let hit = false;
+            for (const el of document.querySelectorAll(p.css)) {
+                if (p.text) {
+                    const name = label(el);
+                    if (p.exact ? name !== p.text : !name.includes(p.text)) continue;
+                }
+                if (isVisible(el)) { hit = true; break; }
+            }
+            out[p.key] = hit;
+        }
+        return out;
+    };
+    const done = (out) => until.some((key) => out[key]) || (hidden.length > 0 && hidden.every((key) => !out[key]));
+    let out = scan();
+    if (done(out) || timeoutMs <= 0) return out;
+    // Tunggu berbasis event: MutationObserver memicu scan ulang begitu DOM berubah. Interval cadangan
+    // menangkap perubahan yang tidak memicu mutasi (mis. akhir transisi CSS).
+    return await new Promise((resolve) => {
+        let finished = false;
+        let observer = null;
+        let timer = null;
+        let deadline = null;
+        const finish = () => {
+            if (finished) return;
+            finished = true;
+            observer.disconnect();
+            clearInterval(timer);
+            clearTimeout(deadline);
+            resolve(out);
+        };
+        const check = () => {
+            if (finished) return;
+            out = scan();
+            if (done(out)) finish();
+        };
+        observer = new MutationObserver(check);
+        observer.observe(document.documentElement, {subtree: true, childList: true, attributes: true, characterData: true});
+        timer = setInterval(check, 250);
+        deadline = setTimeout(() => { out = scan(); finish(); }, timeoutMs);
+    });
+}
+"""
+
+
+async def probe_visibility(
+    page: Page,
+    probes: Mapping[str, VisibilityProbe],
+    *,
+    wait_for: Iterable[str] = (),
+    wait_for_hidden: Iterable[str] = (),
+    timeout_ms: int = 0,
+) -> dict[str, bool]:
+    """Cek visibilitas banyak target sekaligus dalam satu page.evaluate, hasil {key: bool}.
+
+    Dengan ``timeout_ms`` > 0 skrip menunggu di browser (MutationObserver) sampai salah satu key
+    ``wait_for`` terlihat, atau semua key ``wait_for_hidden`` hilang, atau waktu habis; lalu mengembalikan
+    hasil scan terakhir. Tanpa keduanya, yang ditunggu adalah salah satu key mana pun terlihat.
+    """
+    payload = [
+        {"key": key, "css": probe.css, "text": probe.text.lower(), "exact": probe.exact}
+        for key, probe in probes.items()
+    ]
+    until = list(wait_for)
+    hidden = list(wait_for_hidden)
+    if not until and not hidden:
+        until = list(probes)
+    return await page.evaluate(
+        _PROBE_VISIBILITY_JS, {"probes": payload, "until": until, "hidden": hidden, "timeoutMs": timeout_ms}
+    )
@@ -5,10 +5,13 @@ Sends completion notifications via WhatsApp Web using pywhatkit.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import TYPE_CHECKING
 
+from sbr_automation.utils import norm_phone
+
 if TYPE_CHECKING:
     from sbr_automation.autofill import AutofillStats
 
@@ -27,32 +30,31 @@ def format_notification_message(stats: AutofillStats, run_id: str, log_filename:
     Returns:
         Formatted message string
     """
-    total = stats.success_count + stats.error_count + stats.skip_count
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    message = f"""🤖 SBR Autofill Selesai
+    parts = [f"""🤖 SBR Autofill Selesai
 
 📊 Ringkasan:
-Total: {total} baris
+Total: {stats.total} baris
 ✅ Sukses: {stats.success_count}
 ❌ Error: {stats.error_count}
 ⏭️ Dilewati: {stats.skip_count}
 
 🔖 Run ID: {run_id}
-📝 Log: {log_filename}"""
+📝 Log: {log_filename}"""]
 
     # Add error details if there are errors
     if stats.error_count > 0 and stats.recent_errors:
-        message += "\n\n⚠️ Error Terakhir:"
-        # Show up to 3-5 most recent errors
-        for idx, error in enumerate(stats.recent_errors[:5], 1):
+        parts.append("\n\n⚠️ Error Terakhir:")
+        # recent_errors is already capped to the most recent few
+        for idx, error in enumerate(stats.recent_errors, 1):
             # Truncate long error messages
             error_msg = error if len(error) <= 60 else error[:57] + "..."
-            message += f"\n{idx}. {error_msg}"
+            parts.append(f"\n{idx}. {error_msg}")
     
-    message += f"\n\n🕐 Selesai: {timestamp}"
+    parts.append(f"\n\n🕐 Selesai: {timestamp}")
     
-    return message
+    return "".join(parts)
 
 
 def send_whatsapp_notification(
@@ -60,10 +62,28 @@ def send_whatsapp_notification(
     stats: AutofillStats,
     run_id: str,
     log_filename: str,
+) -> bool:
+    """
+    Sync wrapper around send_whatsapp_notification_async for callers without an event loop.
+    
+    Returns:
+        True if notification was scheduled successfully, False otherwise
+    """
+    return asyncio.run(send_whatsapp_notification_async(phone_number, stats, run_id, log_filename))
+
+
+async def send_whatsapp_notification_async(
+    phone_number: str,
+    stats: AutofillStats,
+    run_id: str,
+    log_filename: str,
 ) -> bool:
     """
     Send WhatsApp notification with autofill completion summary.
     
+    pywhatkit opens a browser and sleeps for ~18 seconds, so it runs in a worker
+    thread to keep the event loop (and any in-flight Playwright I/O) responsive.
+    
     Args:
         phone_number: Target WhatsApp number (format: 081234567890 or +6281234567890)
         stats: AutofillStats object containing success/error/skip counts
@@ -109,8 +129,9 @@ def send_whatsapp_notification(
             if hour >= 24:
                 hour = 0
         
-        # Send via pywhatkit
-        pywhatkit.sendwhatmsg(
+        # Send via pywhatkit (blocking) in a worker thread
+        await asyncio.to_thread(
+            pywhatkit.sendwhatmsg,
             normalized_phone,
             message,
             hour,
@@ -142,11 +163,8 @@ def _normalize_phone_number(phone: str) -> str:
     Returns:
         Normalized phone number with country code (+62...)
     """
-    if not phone:
-        return ""
-    
-    # Remove all non-digit characters
-    digits = "".join(c for c in phone if c.isdigit())
+    # Remove all non-digit characters (None/empty -> "")
+    digits = norm_phone(phone)
     
     if not digits:
         return ""
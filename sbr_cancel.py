@@ -2,9 +2,9 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import sys
 from pathlib import Path
 
-from sbr_automation.cancel import process_cancel
 from sbr_automation.config import (
     DEFAULT_KEEP_RUNS,
     CancelOptions,
@@ -12,40 +12,47 @@ from sbr_automation.config import (
     RuntimeConfig,
     create_run_directories,
     load_profile_defaults,
+    peek_profile_arg,
 )
-from sbr_automation.excel_loader import resolve_excel
 
-
-def parse_args() -> argparse.Namespace:
-    base = argparse.ArgumentParser(add_help=False)
-    base.add_argument("--profile", help="Path file profil JSON berisi default argumen CLI")
-    initial, remaining = base.parse_known_args()
-
-    allowed_profile_keys = {
+# Kunci yang boleh diisi lewat --profile; statis sehingga dibangun sekali saat impor.
+PROFILE_KEYS = frozenset(
+    {
         "excel",
         "sheet",
         "match_by",
         "start",
         "end",
         "stop_on_error",
+        "reuse_form_tab",
         "cdp_endpoint",
         "pause_after_edit",
         "max_wait",
         "run_id",
         "keep_runs",
     }
-    profile_defaults = load_profile_defaults(initial.profile, allowed_profile_keys)
+)
+
+
+def parse_args() -> argparse.Namespace:
+    argv = sys.argv[1:]
+    profile = peek_profile_arg(argv)
 
-    parser = argparse.ArgumentParser(description="SBR Cancel Submit (attach via CDP)", parents=[base])
-    if profile_defaults:
-        parser.set_defaults(**profile_defaults)
-    parser.set_defaults(profile=initial.profile)
+    profile_defaults = load_profile_defaults(profile, PROFILE_KEYS)
+
+    parser = argparse.ArgumentParser(description="SBR Cancel Submit (attach via CDP)")
+    parser.add_argument("--profile", help="Path file profil JSON berisi default argumen CLI")
     parser.add_argument("--excel", help="Path ke file Excel (auto-scan folder kerja bila tidak diisi)")
     parser.add_argument("--sheet", type=int, default=0, help="Index sheet Excel (default: 0)")
     parser.add_argument("--match-by", choices=["index", "idsbr", "name"], default="index", help="Metode mencari tombol Edit")
     parser.add_argument("--start", type=int, help="Mulai dari baris ke- (1-indexed)")
     parser.add_argument("--end", type=int, help="Sampai baris ke- (inklusif)")
     parser.add_argument("--stop-on-error", action="store_true", help="Berhenti saat menemukan error pertama")
+    parser.add_argument(
+        "--reuse-form-tab",
+        action="store_true",
+        help="Pakai ulang tab form antar baris lewat link Edit (hanya --match-by idsbr/name)",
+    )
     parser.add_argument(
         "--cdp-endpoint",
         default="http://localhost:9222",
@@ -55,10 +62,20 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--max-wait", type=int, default=6000, help="Timeout tunggu elemen/tab (ms)")
     parser.add_argument("--run-id", help="Gunakan run ID khusus (huruf/angka/-/_) untuk folder artefak")
     parser.add_argument("--keep-runs", type=int, help="Batasi jumlah folder run yang dipertahankan (default 10)")
-    return parser.parse_args(remaining)
+    # Default profil dipasang setelah semua argumen terdaftar agar mengalahkan default= bawaan argumen.
+    parser.set_defaults(**profile_defaults)
+    args = parser.parse_args(argv)
+    if args.profile != profile:
+        # --profile ditulis dalam bentuk singkatan (mis. --prof); muat default-nya lalu parse ulang.
+        parser.set_defaults(**load_profile_defaults(args.profile, PROFILE_KEYS))
+        args = parser.parse_args(argv)
+    return args
 
 
 def build_options(args: argparse.Namespace, working_dir: Path) -> tuple[CancelOptions, RuntimeConfig]:
+    # Impor berat (pandas/playwright) ditunda sampai benar-benar dipakai agar --help dan error argumen cepat.
+    from sbr_automation.excel_loader import resolve_excel
+
     excel_selection: ExcelSelection = resolve_excel(args.excel, working_dir, args.sheet)
     keep_runs = args.keep_runs if args.keep_runs is not None else DEFAULT_KEEP_RUNS
     run_id, log_dir, screenshot_dir, cancel_dir, started_at = create_run_directories(args.run_id, keep_runs)
@@ -68,6 +85,7 @@ def build_options(args: argparse.Namespace, working_dir: Path) -> tuple[CancelOp
         start_row=args.start,
         end_row=args.end,
         stop_on_error=args.stop_on_error,
+        reuse_form_tab=args.reuse_form_tab,
     )
 
     config = RuntimeConfig(
@@ -89,6 +107,9 @@ def build_options(args: argparse.Namespace, working_dir: Path) -> tuple[CancelOp
 def main() -> None:
     args = parse_args()
     options, config = build_options(args, Path.cwd())
+
+    from sbr_automation.cancel import process_cancel
+
     asyncio.run(process_cancel(options, config))
 
 
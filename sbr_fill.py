@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from sbr_automation.autofill import process_autofill
 from sbr_automation.config import (
     DEFAULT_KEEP_RUNS,
     AutofillOptions,
@@ -14,17 +15,13 @@ from sbr_automation.config import (
     create_run_directories,
     load_profile_defaults,
     load_status_map,
+    peek_profile_arg,
 )
-from sbr_automation.excel_loader import resolve_excel
 from sbr_automation.field_selectors import load_field_selectors
 
-
-def parse_args() -> argparse.Namespace:
-    base = argparse.ArgumentParser(add_help=False)
-    base.add_argument("--profile", help="Path file profil JSON berisi default argumen CLI")
-    initial, remaining = base.parse_known_args()
-
-    allowed_profile_keys = {
+# Kunci yang boleh diisi lewat --profile; statis sehingga dibangun sekali saat impor.
+PROFILE_KEYS = frozenset(
+    {
         "excel",
         "sheet",
         "match_by",
@@ -36,10 +33,12 @@ def parse_args() -> argparse.Namespace:
         "step_delay",
         "pause_after_edit",
         "pause_after_submit",
+        "post_row_settle",
         "max_wait",
         "resume",
         "dry_run",
         "skip_status",
+        "force_scroll",
         "status_map",
         "selectors",
         "run_id",
@@ -47,12 +46,17 @@ def parse_args() -> argparse.Namespace:
         "wa_phone",
         "no_wa_notify",
     }
-    profile_defaults = load_profile_defaults(initial.profile, allowed_profile_keys)
+)
+
 
-    parser = argparse.ArgumentParser(description="SBR Autofill (Chrome attach via CDP)", parents=[base])
-    if profile_defaults:
-        parser.set_defaults(**profile_defaults)
-    parser.set_defaults(profile=initial.profile)
+def parse_args() -> argparse.Namespace:
+    argv = sys.argv[1:]
+    profile = peek_profile_arg(argv)
+
+    profile_defaults = load_profile_defaults(profile, PROFILE_KEYS)
+
+    parser = argparse.ArgumentParser(description="SBR Autofill (Chrome attach via CDP)")
+    parser.add_argument("--profile", help="Path file profil JSON berisi default argumen CLI")
     parser.add_argument("--excel", help="Path ke file Excel (jika tidak diisi akan auto-scan folder kerja)")
     parser.add_argument("--sheet", type=int, default=0, help="Index sheet Excel (default: 0)")
     parser.add_argument("--match-by", choices=["index", "idsbr", "name"], default="index", help="Metode mencari tombol Edit")
@@ -68,12 +72,23 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--step-delay", type=int, default=700, help="Lama jeda slow mode (ms)")
     parser.add_argument("--pause-after-edit", type=int, default=1000, help="Jeda setelah klik Edit (ms)")
     parser.add_argument("--pause-after-submit", type=int, default=300, help="Jeda setelah klik Submit (ms)")
+    parser.add_argument(
+        "--post-row-settle",
+        type=int,
+        default=0,
+        help="Jeda tambahan setelah tabel siap kembali di akhir tiap baris (ms, default: 0)",
+    )
     parser.add_argument("--max-wait", type=int, default=6000, help="Timeout tunggu elemen/tab (ms)")
     parser.add_argument(
         "--skip-status",
         action="store_true",
         help="Lewati pengisian status usaha (gunakan jika hanya ingin memperbarui field lain)",
     )
+    parser.add_argument(
+        "--force-scroll",
+        action="store_true",
+        help="Paksa scroll ke field sebelum mengisi (untuk halaman yang bermasalah dengan auto-scroll)",
+    )
     parser.add_argument(
         "--status-map",
         help="Path JSON berisi pemetaan Status -> ID radio pada MATCHAPRO",
@@ -92,13 +107,33 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--keep-runs", type=int, help="Batasi jumlah folder run yang dipertahankan (default 10)")
     parser.add_argument("--wa-phone", help="Nomor WhatsApp penerima notifikasi (format: 081234567890)")
     parser.add_argument("--no-wa-notify", action="store_true", help="Nonaktifkan notifikasi WhatsApp")
-    return parser.parse_args(remaining)
+    # Default profil dipasang setelah semua argumen terdaftar agar mengalahkan default= bawaan argumen.
+    parser.set_defaults(**profile_defaults)
+    args = parser.parse_args(argv)
+    if args.profile != profile:
+        # --profile ditulis dalam bentuk singkatan (mis. --prof); muat default-nya lalu parse ulang.
+        parser.set_defaults(**load_profile_defaults(args.profile, PROFILE_KEYS))
+        args = parser.parse_args(argv)
+    return args
+
+
+def _resolve_excel(path_arg: str | None, search_dir: Path, sheet_index: int) -> ExcelSelection:
+    # Impor berat (pandas/playwright) ditunda sampai benar-benar dipakai agar --help dan error argumen cepat.
+    from sbr_automation.excel_loader import resolve_excel
+
+    return resolve_excel(path_arg, search_dir, sheet_index)
 
 
 def build_options(args: argparse.Namespace, working_dir: Path) -> tuple[AutofillOptions, RuntimeConfig]:
-    excel_selection: ExcelSelection = resolve_excel(args.excel, working_dir, args.sheet)
-    status_map = load_status_map(args.status_map)
-    profile_selectors, select2_selectors = load_field_selectors(args.selectors)
+    # Impor excel_loader (pandas) + pencarian Excel, status map, dan selector saling lepas: jalankan
+    # bersamaan. Folder run baru dibuat setelah semuanya valid.
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        excel_future = pool.submit(_resolve_excel, args.excel, working_dir, args.sheet)
+        status_future = pool.submit(load_status_map, args.status_map)
+        selectors_future = pool.submit(load_field_selectors, args.selectors)
+        excel_selection = excel_future.result()
+        status_map = status_future.result()
+        profile_selectors, select2_selectors = selectors_future.result()
     keep_runs = args.keep_runs if args.keep_runs is not None else DEFAULT_KEEP_RUNS
     run_id, log_dir, screenshot_dir, cancel_dir, started_at = create_run_directories(args.run_id, keep_runs)
     options = AutofillOptions(
@@ -116,10 +151,12 @@ def build_options(args: argparse.Namespace, working_dir: Path) -> tuple[Autofill
         sheet_index=args.sheet,
         pause_after_edit_ms=args.pause_after_edit,
         pause_after_submit_ms=args.pause_after_submit,
+        post_row_settle_ms=args.post_row_settle,
         max_wait_ms=args.max_wait,
         slow_mode=not args.no_slow_mode,
         step_delay_ms=args.step_delay,
         skip_status=args.skip_status,
+        force_scroll=args.force_scroll,
         status_id_map=status_map,
         profile_field_selectors=profile_selectors,
         select2_field_selectors=select2_selectors,
@@ -137,6 +174,9 @@ def build_options(args: argparse.Namespace, working_dir: Path) -> tuple[Autofill
 def main() -> None:
     args = parse_args()
     options, config = build_options(args, Path.cwd())
+
+    from sbr_automation.autofill import process_autofill
+
     stats = asyncio.run(process_autofill(options, config))
     
     # Send WhatsApp notification if enabled
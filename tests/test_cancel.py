@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from sbr_automation.cancel import _MATCH_VALUE_FNS, CANCEL_COLUMN_ALIASES, _row_contexts
+from sbr_automation.excel_loader import _canonicalize_columns, _normalize_text_columns, ensure_required_with_aliases
+
+
+def _load(columns: dict) -> pd.DataFrame:
+    return _normalize_text_columns(_canonicalize_columns(pd.DataFrame(columns)))
+
+
+def test_blank_idsbr_does_not_fall_back_to_master():
+    df = _load({"idsbr": ["", " B2 "], "idsbr_master": ["M1", "M2"], "nama": ["Toko A", "Toko B"]})
+    contexts = _row_contexts(df, 4)
+    assert [ctx.idsbr for ctx in contexts] == ["", "B2"]
+    assert [_MATCH_VALUE_FNS["idsbr"](ctx) for ctx in contexts] == ["", "B2"]
+    assert [ctx.display_index for ctx in contexts] == [5, 6]
+
+
+def test_match_by_idsbr_requires_raw_idsbr_column():
+    df = _load({"idsbr_master": ["M1"], "nama": ["Toko A"]})
+    with pytest.raises(RuntimeError):
+        ensure_required_with_aliases(df, ("idsbr",), CANCEL_COLUMN_ALIASES)
+    assert [ctx.idsbr for ctx in _row_contexts(df, 0)] == [""]
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import importlib
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.mark.parametrize("module", ["sbr_fill", "sbr_cancel"])
+def test_cli_import_does_not_load_heavy_dependencies(module):
+    code = f"import sys, {module}; print(','.join(m for m in ('pandas', 'playwright') if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+
+@pytest.mark.parametrize("module", ["sbr_fill", "sbr_cancel"])
+@pytest.mark.parametrize("flag", ["--profile", "--prof"])
+def test_profile_values_override_argument_defaults(module, flag, tmp_path, monkeypatch):
+    profile = tmp_path / "prof.json"
+    profile.write_text(json.dumps({"match_by": "idsbr", "sheet": 2}), encoding="utf-8")
+    monkeypatch.setattr(sys, "argv", [module, flag, str(profile)])
+
+    args = importlib.import_module(module).parse_args()
+
+    assert (args.match_by, args.sheet) == ("idsbr", 2)
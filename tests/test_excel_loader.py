@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from sbr_automation import excel_loader
+from sbr_automation.config import ExcelSelection
+from sbr_automation.excel_loader import (
+    PROFILE_FIELD_KEYS,
+    _canonicalize_columns,
+    _normalize_text_columns,
+    extract_profile_payload,
+    extract_profile_payloads,
+    load_dataframe,
+)
+
+
+def test_canonicalize_columns_coalesces_aliases_and_keeps_sources():
+    df = pd.DataFrame(
+        {
+            "idsbr": ["", "B2"],
+            "idsbr_master": ["111", "222"],
+            "nama_usaha": [None, "Toko B"],
+            "nama_komersial_usaha": ["Warung A", "Komersial B"],
+        }
+    )
+    out = _canonicalize_columns(df)
+    # idsbr_master bukan pengganti idsbr: baris dengan idsbr kosong tetap kosong.
+    assert out["idsbr"].tolist() == ["", "B2"]
+    assert out["nama"].tolist() == ["Warung A", "Toko B"]
+    assert "nama_komersial_usaha" in out.columns
+    assert "status" not in out.columns
+
+
+def test_normalize_text_columns_matches_norm_space():
+    df = pd.DataFrame({"nama": ["  Toko \n  A ", None], "alamat": ["  x  ", None]})
+    out = _normalize_text_columns(df)
+    assert out["nama"].tolist() == ["Toko A", ""]
+    assert out["alamat"].iloc[0] == "  x  "
+
+
+def test_extract_profile_payloads_matches_row_version():
+    df = pd.DataFrame({key: ["  a \t b ", None] for key in PROFILE_FIELD_KEYS})
+    df["kodepos"] = ["12345", float("nan")]
+    expected = [extract_profile_payload(row) for _, row in df.iterrows()]
+    assert extract_profile_payloads(df) == expected
+    assert extract_profile_payloads(df)[0]["nama_sls"] == "a b"
+
+
+def test_load_dataframe_cache_hits_and_invalidates_on_change(tmp_path: Path, monkeypatch):
+    workbook = tmp_path / "data.xlsx"
+    workbook.write_bytes(b"v1")
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(excel_loader, "CACHE_DIR", cache_dir)
+    reads = []
+
+    def fake_read_excel(selection, dtype, **kwargs):
+        reads.append(kwargs)
+        return pd.DataFrame({"IDSBR": ["001", None], "Nama": ["  Toko  A ", "NA"]}, dtype=str)
+
+    monkeypatch.setattr(excel_loader, "_read_excel", fake_read_excel)
+    selection = ExcelSelection(path=workbook, sheet_index=0)
+
+    first = load_dataframe(selection)
+    assert len(reads) == 1
+    assert [p.suffix for p in cache_dir.iterdir()] == [".json"]
+
+    cached = load_dataframe(selection)
+    assert len(reads) == 1
+    pd.testing.assert_frame_equal(cached, first)
+
+    # Workbook diganti salinan dengan mtime lebih lama: tetap dianggap berubah.
+    stat = workbook.stat()
+    workbook.write_bytes(b"v2 longer")
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10**9))
+    load_dataframe(selection)
+    assert len(reads) == 2
+    assert len(list(cache_dir.iterdir())) == 1
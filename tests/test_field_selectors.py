@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from sbr_automation.field_selectors import DEFAULT_PROFILE_FIELD_SELECTORS, load_field_selectors, split_selectors
+
+
+def test_split_selectors_respects_brackets_and_quotes():
+    assert split_selectors("input#a, input[name='a']") == ("input#a", "input[name='a']")
+    assert split_selectors("a[x='1,2'], :is(b, c)") == ("a[x='1,2']", ":is(b, c)")
+
+
+def test_split_selectors_keeps_non_css_engines_whole():
+    xpath = "xpath=//a[contains(., 'x, y')]"
+    assert split_selectors(xpath) == (xpath,)
+
+
+def test_load_field_selectors_merges_into_read_only_views(tmp_path):
+    path = tmp_path / "selectors.json"
+    path.write_text(json.dumps({"fields": {"kodepos": "input#zip"}, "select2": {"kdkec": "#kec"}}), encoding="utf-8")
+
+    profile, select2 = load_field_selectors(path)
+    assert profile["kodepos"] == "input#zip"
+    assert profile["nama_sls"] == DEFAULT_PROFILE_FIELD_SELECTORS["nama_sls"]
+    assert select2["kdkec"] == "#kec"
+
+    with pytest.raises(TypeError):
+        profile["kodepos"] = "mutated"  # type: ignore[index]
+    again, _ = load_field_selectors(path)
+    assert again["kodepos"] == "input#zip"
+
+
+def test_load_field_selectors_rejects_invalid_json(tmp_path):
+    path = tmp_path / "selectors.json"
+    path.write_text("{not json", encoding="utf-8")
+    with pytest.raises(RuntimeError):
+        load_field_selectors(path)
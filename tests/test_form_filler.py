@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from sbr_automation import form_filler
+
+
+def test_normalize_wa_strips_prefix_and_punctuation():
+    assert form_filler._normalize_wa("0812-3456 789") == ("+62-8123456789", "8123456789")
+    assert form_filler._normalize_wa("+62 812 345") == ("+62-812345", "812345")
+    assert form_filler._normalize_wa("62") == ("", "")
+    assert form_filler._normalize_wa("") == ("", "")
+    assert form_filler._normalize_wa(None) == ("", "")
+
+
+class _FakeLocator:
+    @property
+    def first(self):
+        return self
+
+
+class _FakePage:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.handlers: dict[str, object] = {}
+
+    def once(self, event: str, handler) -> None:
+        self.handlers[event] = handler
+
+    def locator(self, selector: str) -> _FakeLocator:
+        self.calls += 1
+        return _FakeLocator()
+
+
+def test_loc_is_cached_per_page():
+    page, other = _FakePage(), _FakePage()
+    first = form_filler._loc(page, "input#a")
+    assert form_filler._loc(page, "input#a") is first
+    assert page.calls == 1
+    assert form_filler._loc(other, "input#a") is not first
+
+
+def test_loc_cache_is_dropped_when_page_closes():
+    page = _FakePage()
+    form_filler._loc(page, "input#a")
+    assert page in form_filler._LOC_CACHE
+    page.handlers["close"](page)
+    assert page not in form_filler._LOC_CACHE
+
+
+def test_status_label_xpath_quotes_and_lowercases():
+    assert form_filler._xpath_literal("a'b") == "\"a'b\""
+    assert form_filler._xpath_literal("a'b\"c") == "concat('a', \"'\", 'b\"c')"
+    xpath = form_filler._status_label_xpath("  Aktif   Pindah ")
+    assert xpath.startswith("xpath=//label[")
+    assert xpath.endswith("'aktif pindah')]")
@@ -2,7 +2,14 @@ from __future__ import annotations
 
 import pandas as pd
 
-from sbr_automation.loader import _normalize_status, _select_phone_value
+from sbr_automation.loader import (
+    _normalize_status,
+    _normalize_status_series,
+    _resolve_sources,
+    _select_phone_value,
+    _vectorize_normalize,
+)
+from sbr_automation.utils import norm_float, norm_phone
 
 
 def test_normalize_status_handles_numeric_and_alias():
@@ -12,14 +19,50 @@ def test_normalize_status_handles_numeric_and_alias():
     assert _normalize_status("Custom") == "Custom"
 
 
+def test_normalize_status_series_matches_scalar_version():
+    values = ["1", "8", "12", "belum berproduksi", "Aktif Nonrespons", "Custom", ""]
+    result = _normalize_status_series(pd.Series(values, dtype=object)).tolist()
+    assert result == [_normalize_status(value) for value in values]
+
+
+def test_vectorize_normalize_matches_scalar_helpers():
+    df = pd.DataFrame(
+        {
+            "idsbr": ["  A1 ", None],
+            "nomor_telepon": ["", "(021) 555-01"],
+            "Phone": ["0812 3456", None],
+            "latitude": ["-7,25 LS", "abc"],
+            "longitude": [" 110.4 ", None],
+        }
+    )
+    staged = _vectorize_normalize(df, _resolve_sources(df.columns))
+    assert staged["idsbr"].tolist() == ["A1", ""]
+    assert staged["phone"].tolist() == [norm_phone("0812 3456"), norm_phone("(021) 555-01")]
+    assert staged["latitude"].tolist() == [norm_float(value) for value in df["latitude"]]
+    assert staged["longitude"].tolist() == [norm_float(value) for value in df["longitude"]]
+    assert staged["email"].tolist() == ["", ""]
+
+
 def test_select_phone_value_prefers_filled_alias():
     df_row = pd.Series(
         {
-            "nomor_whatsapp": "  0812 0000 1111 ",
             "nomor_telepon": "",
+            "Telepon": "  0812 0000 1111 ",
+            "nomor_whatsapp": "0899",
         }
     )
     assert _select_phone_value(df_row).strip() == "0812 0000 1111"
 
     df_row2 = pd.Series({"Phone": "123", "nomor_whatsapp": ""})
     assert _select_phone_value(df_row2) == "123"
+
+    # Baris dict biasa memakai jalur yang sama; kolom kosong tetap dikembalikan bila tak ada yang terisi.
+    # Nomor WhatsApp tidak pernah dipakai sebagai telepon: keduanya field terpisah di form.
+    assert _select_phone_value({"nomor_telepon": "", "whatsapp": "0813"}) == ""
+    assert _select_phone_value({"nomor_telepon": "", "whatsapp": None}) == ""
+    assert _select_phone_value({}) is None
+
+    df = pd.DataFrame({"nomor_telepon": ["", "021 55"], "nomor_whatsapp": ["0813", "0899"]})
+    staged = _vectorize_normalize(df, _resolve_sources(df.columns))
+    assert staged["phone"].tolist() == ["", norm_phone("021 55")]
+    assert staged["whatsapp"].tolist() == [norm_phone("0813"), norm_phone("0899")]
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from sbr_automation.logbook import LogBook, LogEvent, update_run_index
+from sbr_automation.resume import load_resume_entries
+
+
+def _event(row_index: int, level: str = "OK") -> LogEvent:
+    return LogEvent(ts="2025-01-01 00:00:00", row_index=row_index, level=level, stage="DONE", idsbr="1", nama="A")
+
+
+def test_logbook_flushes_in_batches_and_resume_reads_partial_log(tmp_path: Path):
+    log_path = tmp_path / "log.csv"
+    book = LogBook(log_path, flush_every=2, flush_interval=3600)
+    book.append(_event(1))
+    assert not log_path.exists()
+    book.append(_event(2))
+    assert set(load_resume_entries(log_path, start_display=1, end_display=10)) == {1, 2}
+
+    book.append(_event(3))
+    book.save()
+    assert set(load_resume_entries(log_path, start_display=1, end_display=10)) == {1, 2, 3}
+    lines = log_path.read_text(encoding="utf-8").splitlines()
+    assert lines[0].startswith("ts,row_index,level")
+    assert len(lines) == 4
+
+
+def test_report_links_screenshots_relative_to_log_dir(tmp_path: Path):
+    shot = tmp_path / "screenshots" / "row1.png"
+    shot.parent.mkdir()
+    shot.write_bytes(b"")
+    book = LogBook(tmp_path / "log.csv", report_path=tmp_path / "report.html", flush_interval=3600)
+    book.extend(
+        [
+            LogEvent(ts="t", row_index=1, level="ERROR", stage="FILL", screenshot=str(shot)),
+            LogEvent(ts="t", row_index=2, level="ERROR", stage="FILL", screenshot=str(shot)),
+            _event(3),
+        ]
+    )
+    book.save()
+    html = (tmp_path / "report.html").read_text(encoding="utf-8")
+    assert html.count('<a href="screenshots/row1.png">row1.png</a>') == 2
+
+
+def test_update_run_index_appends_new_runs_and_replaces_existing(tmp_path: Path):
+    index_path = tmp_path / "index.csv"
+    update_run_index(index_path, {"run_id": "r1", "ok_rows": "1"})
+    update_run_index(index_path, {"run_id": "r2", "ok_rows": "2"})
+    update_run_index(index_path, {"run_id": "r1", "ok_rows": "5"})
+    lines = index_path.read_text(encoding="utf-8").splitlines()
+    assert lines[0].startswith("run_id,started_at")
+    assert [line.split(",")[0] for line in lines[1:]] == ["r2", "r1"]
+    assert lines[2].split(",")[6] == "5"
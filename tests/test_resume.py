@@ -28,6 +28,22 @@ def test_load_resume_entries_filters_range_and_level(tmp_path: Path):
     assert set(entries.keys()) == {1}
 
 
+def test_load_resume_entries_uses_last_entry_per_row(tmp_path: Path):
+    log_path = tmp_path / "log_sbr_autofill.csv"
+    _write_log(
+        log_path,
+        [
+            {"row_index": "1", "level": "OK", "note": "first"},
+            {"row_index": "2", "level": "ERROR", "note": "err"},
+            {"row_index": "1", "level": "ERROR", "note": "retry failed"},
+            {"row_index": "2", "level": "ok", "note": "fixed"},
+        ],
+    )
+    entries = load_resume_entries(log_path, start_display=1, end_display=3)
+    assert set(entries.keys()) == {2}
+    assert entries[2]["note"] == "fixed"
+
+
 def test_load_resume_entries_handles_missing_file(tmp_path: Path):
     log_path = tmp_path / "missing.csv"
     entries = load_resume_entries(log_path, start_display=1, end_display=10)
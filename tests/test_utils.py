@@ -45,3 +45,20 @@ async def test_with_retry_eventually_succeeds():
     result = await utils.with_retry(flaky, attempts=3, delay_ms=10, backoff=1.0)
     assert result == "ok"
     assert calls["n"] == 2
+
+
+@pytest.mark.asyncio
+async def test_with_retry_gives_up_on_unrecoverable_errors():
+    calls = {"n": 0}
+
+    async def broken():
+        calls["n"] += 1
+        raise KeyError("fatal")
+
+    with pytest.raises(KeyError):
+        await utils.with_retry(broken, attempts=3, delay_ms=10, give_up_on=(KeyError,))
+    assert calls["n"] == 1
+
+    with pytest.raises(KeyError):
+        await utils.with_retry(broken, attempts=3, delay_ms=10, retry_on=(RuntimeError,))
+    assert calls["n"] == 2